@@ -0,0 +1,66 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import random
+from scrabb.lexicon import Lexicon
+from scrabb.movegen import MoveGenerator
+from scrabb.scrabb import Game, Turn
+from scrabb.selfplay import SCORELESS_TURNS, greedy
+from scrabb.tilebag import DISTRIBUTION
+
+# Benchmark positions are made by seeded greedy self-play, so the same
+# seed and lexicon always give the same boards. Without a lexicon file
+# the words are made up from the tile distribution, which is enough to
+# fill a board the way real games do.
+SEED = 1
+NUM_WORDS = 20000
+# letters weighted as in a full bag
+LETTERS = "".join(letter * count for letter, count in DISTRIBUTION.items()
+                  if letter != ' ')
+# turns played before each position is taken; congested plays until the
+# bag is empty, or the game would end on scoreless turns
+FIXTURES = {"empty": 0, "opening": 1, "mid-game": 8, "congested": None}
+# candidate plays timed per position
+CANDIDATES = 50
+
+
+def synthetic_lexicon(seed=SEED, num_words=NUM_WORDS):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < num_words:
+        words.add("".join(rng.choice(LETTERS)
+                          for _ in range(rng.randint(2, 8))))
+    return Lexicon.from_words(words)
+
+
+def position(lexicon, turns, seed=SEED):
+    # a two player game after turns greedy turns, or once the bag is
+    # empty if turns is None. Either way it stops early where a game
+    # would end, so a seed where the bots only exchange can't hang.
+    game = Game(lexicon, seed)
+    game.add_player("one")
+    game.add_player("two")
+    scoreless = 0
+    while turns is None or game.turn < turns:
+        if turns is None and not len(game.tile_bag):
+            break
+        if scoreless >= SCORELESS_TURNS:
+            break
+        turn, payload = greedy(game, None)
+        if turn == Turn.PLAY:
+            scoreless = 0 if game.play(list(payload)) else scoreless + 1
+        elif turn == Turn.EXCHANGE:
+            game.exchange(payload)
+            scoreless += 1
+        else:
+            break
+    return game
+
+
+def candidates(game, count=CANDIDATES):
+    # the best plays for the player on turn, ready for Game.play_tiles
+    moves = MoveGenerator(game).generate(game.current_player.rack)
+    return [tile_positions for _, tile_positions in moves[:count]]
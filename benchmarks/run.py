@@ -0,0 +1,216 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from itertools import islice
+from scrabb.lexicon import Lexicon
+from scrabb.movegen import MoveGenerator
+from scrabb.scrabb import InvalidPlayException
+from scrabb.selfplay import greedy, play_game
+from scrabb.tilebag import TileBag
+from .fixtures import FIXTURES, SEED, candidates, position
+from .fixtures import synthetic_lexicon
+
+# Times the engine's hot paths on seeded positions and writes the results
+# as JSON:
+#   python -m benchmarks.run --output baseline.json
+#   python -m benchmarks.run --compare baseline.json
+# Every benchmark is run REPEATS times; each run loops until it has taken
+# at least MIN_SECONDS, and the per call time of the fastest run, the one
+# least disturbed by anything else on the machine, is what gets compared.
+REPEATS = 5
+MIN_SECONDS = 0.05
+# slower than the baseline by more than this is a regression
+THRESHOLD = 0.10
+PLAYOUTS = 2
+# plays taken from iter_moves, as a bot looking at its best few would
+TOP_MOVES = 10
+FORMAT = 1
+
+
+def measure(function, repeats=REPEATS, min_seconds=MIN_SECONDS):
+    # seconds per call of function for each run
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            break
+        calls *= 2
+    runs = [elapsed / calls]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        runs.append((time.perf_counter() - start) / calls)
+    return runs
+
+
+def _each(function, items):
+    # one call that goes through every item
+    def run():
+        for item in items:
+            function(item)
+    return run
+
+
+def position_benchmarks(game):
+    # {name: function} for one position; each function times a call per
+    # candidate play, or per draw
+    plays = candidates(game)
+    oriented = [(play, game.get_orientation(play)) for play in plays]
+    board = game.board
+
+    def play_tiles(play):
+        try:
+            game.play_tiles(play)
+        except InvalidPlayException:
+            return
+        board.undo()
+
+    def place_tiles(play):
+        board.place_tiles(play)
+        board.undo()
+
+    benchmarks = {}
+    if plays:
+        benchmarks.update({
+            "play_tiles": _each(play_tiles, plays),
+            "is_valid_play": _each(
+                lambda item: game.is_valid_play(*item), oriented),
+            "find_words": _each(
+                lambda item: game.find_words(item[1], item[0]), oriented),
+            "calculate_score": _each(game.calculate_score, plays),
+            "place_tiles": _each(place_tiles, plays),
+        })
+        # every function loops over the candidates
+        benchmarks = {name: (function, len(plays))
+                      for name, function in benchmarks.items()}
+
+    generator = MoveGenerator(game)
+    moves_rack = list(game.current_player.rack)
+    benchmarks["generate"] = (lambda: generator.generate(moves_rack), 1)
+    benchmarks["iter_moves_top"] = (lambda: list(islice(
+        generator.iter_moves(moves_rack), TOP_MOVES)), 1)
+
+    bag = TileBag(SEED)
+    bag.restore(*game.tile_bag.state())
+    if len(bag) >= 7:
+        def draw():
+            bag.return_tiles(bag.draw_tiles(7))
+
+        rack = list(game.current_player.rack)
+
+        def exchange():
+            rack[:] = bag.exchange_tiles(rack)
+
+        benchmarks["draw_tiles"] = (draw, 1)
+        benchmarks["exchange_tiles"] = (exchange, 1)
+    return benchmarks
+
+
+def run(lexicon, lexicon_name, repeats=REPEATS, playouts=PLAYOUTS):
+    results = {}
+    for fixture, turns in FIXTURES.items():
+        game = position(lexicon, turns)
+        for name, (function, calls) in position_benchmarks(game).items():
+            runs = [seconds / calls for seconds in
+                    measure(function, repeats)]
+            results[f"{name}/{fixture}"] = _summary(runs)
+
+    # whole games are timed once each, with fresh seeds
+    runs = []
+    for number in range(playouts):
+        record = play_game([greedy, greedy], f"{SEED}:{number}", lexicon)
+        runs.append(record["seconds"])
+    results["playout/greedy"] = _summary(runs)
+
+    return {
+        "format": FORMAT,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "lexicon": lexicon_name,
+        "seed": SEED,
+        "results": results,
+    }
+
+
+def _summary(runs):
+    return {"runs": len(runs), "median": statistics.median(runs),
+            "best": min(runs)}
+
+
+def compare(baseline, current, threshold=THRESHOLD):
+    # (name, baseline time, current time, change) for every benchmark
+    # in both, and the names of those that got slower by more than
+    # threshold
+    rows = []
+    regressions = []
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        change = result["best"] / old["best"] - 1
+        rows.append((name, old["best"], result["best"], change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="time the engine's hot paths")
+    parser.add_argument("--lexicon", help="compiled lexicon file, "
+                        "otherwise a seeded synthetic one")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--playouts", type=int, default=PLAYOUTS)
+    parser.add_argument("--output", help="write the results here")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="flag regressions against these results")
+    parser.add_argument("--results",
+                        help="compare these results instead of running")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.results:
+        with open(args.results) as f:
+            current = json.load(f)
+    else:
+        if args.lexicon:
+            lexicon = Lexicon.load(args.lexicon)
+            lexicon_name = args.lexicon
+        else:
+            lexicon = synthetic_lexicon()
+            lexicon_name = "synthetic"
+        current = run(lexicon, lexicon_name, args.repeats, args.playouts)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+
+    if not args.compare:
+        for name, result in current["results"].items():
+            print(f"{name:<32} {result['best'] * 1e6:>12.1f}us")
+        return 0
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    rows, regressions = compare(baseline, current, args.threshold)
+    for name, old, new, change in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<32} {old * 1e6:>12.1f}us {new * 1e6:>12.1f}us "
+              f"{change:>+8.1%}{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
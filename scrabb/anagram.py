@@ -0,0 +1,157 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+from itertools import combinations_with_replacement
+from .lexicon import Lexicon
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# how a blank is written in a rack string or a pattern
+BLANKS = " ?"
+
+
+def alphagram(word):
+    # a word's letters in alphabetical order
+    return "".join(sorted(word))
+
+
+def _rack_counts(rack):
+    # letter counts and the number of blanks in a rack, given as tiles or
+    # as a string. Anything that isn't a letter is counted last, where no
+    # word can use it.
+    counts = [0] * (len(LETTERS) + 1)
+    blanks = 0
+    for tile in rack:
+        letter = tile if isinstance(tile, str) else tile.letter
+        if letter in BLANKS:
+            blanks += 1
+        elif letter.upper() in LETTERS:
+            counts[ord(letter.upper()) - 65] += 1
+        else:
+            counts[-1] += 1
+    return counts, blanks
+
+
+class AnagramIndex:
+    # Words are indexed by alphagram, along with every prefix of every
+    # alphagram. A rack is searched by building alphagrams one letter at a
+    # time in alphabetical order, dropping any that no word starts with, so
+    # only letter combinations that lead somewhere are ever looked at.
+    # Alphagrams are also listed under each letter they hold, for finding
+    # words that contain given letters. Patterns are matched by walking
+    # the lexicon itself.
+
+    def __init__(self, lexicon):
+        self.lexicon = lexicon
+        self._words = {}
+        self._prefixes = {""}
+        # the alphagrams holding each letter
+        self._by_letter = {letter: [] for letter in LETTERS}
+        for word in lexicon:
+            key = alphagram(word)
+            words = self._words.get(key)
+            if words is None:
+                self._words[key] = [word]
+                for i in range(1, len(key)):
+                    self._prefixes.add(key[:i])
+                for letter in set(key):
+                    self._by_letter[letter].append(key)
+            else:
+                words.append(word)
+
+    @classmethod
+    def from_words(cls, words):
+        return cls(Lexicon.from_words(words))
+
+    def __len__(self):
+        return sum(len(words) for words in self._words.values())
+
+    def anagrams(self, rack):
+        # words using every tile on the rack: one lookup for each letter
+        # the blanks could stand for
+        counts, blanks = _rack_counts(rack)
+        if counts[-1]:
+            return []
+        letters = "".join(letter * count
+                          for letter, count in zip(LETTERS, counts))
+        found = set()
+        for fill in combinations_with_replacement(LETTERS, blanks):
+            found.update(self._words.get(alphagram(letters + "".join(fill)),
+                                         ()))
+        return sorted(found)
+
+    def subanagrams(self, rack, min_length=2):
+        # words using any of the tiles on the rack, longest first
+        counts, blanks = _rack_counts(rack)
+        return sorted((word for word in self._search(counts, blanks)
+                       if len(word) >= min_length),
+                      key=lambda word: (-len(word), word))
+
+    def _search(self, counts, blanks):
+        found = []
+        words = self._words
+        prefixes = self._prefixes
+
+        def extend(prefix, start, blanks):
+            if prefix in words:
+                found.extend(words[prefix])
+            for i in range(start, len(LETTERS)):
+                # the same word comes from a real tile or a blank, so only
+                # use a blank once the real tiles have run out
+                if counts[i]:
+                    counts[i] -= 1
+                    used_blank = 0
+                elif blanks:
+                    used_blank = 1
+                else:
+                    continue
+                key = prefix + LETTERS[i]
+                if key in prefixes or key in words:
+                    extend(key, i, blanks - used_blank)
+                if not used_blank:
+                    counts[i] += 1
+
+        extend("", 0, blanks)
+        return found
+
+    def containing(self, letters):
+        # words holding at least the given letters, found by checking the
+        # alphagrams that hold the rarest of them
+        needed, _ = _rack_counts(letters)
+        if needed[-1]:
+            return []
+        wanted = [(LETTERS[i], count) for i, count in enumerate(needed)
+                  if count]
+        if not wanted:
+            return sorted(word for words in self._words.values()
+                          for word in words)
+        rarest = min(wanted, key=lambda pair: len(self._by_letter[pair[0]]))
+        found = []
+        for key in self._by_letter[rarest[0]]:
+            if all(key.count(letter) >= count for letter, count in wanted):
+                found.extend(self._words[key])
+        return sorted(found)
+
+    def pattern(self, pattern):
+        # words matching a pattern, where ? or a space is any letter
+        lexicon = self.lexicon
+        found = []
+
+        def walk(node, i, word):
+            if i == len(pattern):
+                if lexicon.is_word(node):
+                    found.append(word)
+                return
+            letter = pattern[i]
+            if letter in BLANKS:
+                for letter, child in lexicon.edges(node):
+                    walk(child, i + 1, word + letter)
+            else:
+                child = lexicon.child(node, letter.upper())
+                if child is not None:
+                    walk(child, i + 1, word + letter.upper())
+
+        walk(lexicon.root, 0, "")
+        return found
@@ -5,18 +5,29 @@
 # Contact: chris@cplyon.ca
 
 import math
+from array import array
+from enum import IntEnum
+from .tile import code_tile, tile_code
+from .zobrist import square_keys
 
+ACROSS = 0
+DOWN = 1
+ANY_LETTER = (1 << 26) - 1
+FULL_LINE = (1 << 15) - 1
+NO_CROSS_WORD = -1
 
-class Board:
-    SIZE = 15
-    MIDDLE = (math.floor(SIZE/2), math.floor(SIZE/2))
 
-    def __init__(self):
-        self._board = [[None for _ in range(Board.SIZE)]
-                       for _ in range(Board.SIZE)]
-        self.is_empty = True
+class Premium(IntEnum):
+    NONE = 0
+    DOUBLE_LETTER = 1
+    TRIPLE_LETTER = 2
+    DOUBLE_WORD = 3
+    TRIPLE_WORD = 4
 
-        self.double_letter_cells = {
+
+def _premium_table(size):
+    premiums = {
+        Premium.DOUBLE_LETTER: {
             (0, 3), (0, 11),
             (2, 6), (2, 8),
             (3, 0), (3, 7), (3, 14),
@@ -26,16 +37,14 @@ class Board:
             (11, 0), (11, 7), (11, 14),
             (12, 6), (12, 8),
             (14, 3), (14, 11)
-        }
-
-        self.triple_letter_cells = {
+        },
+        Premium.TRIPLE_LETTER: {
             (1, 5), (1, 9),
             (5, 1), (5, 5), (5, 9), (5, 13),
             (9, 1), (9, 5), (9, 9), (9, 13),
             (13, 5), (13, 9)
-        }
-
-        self.double_word_cells = {
+        },
+        Premium.DOUBLE_WORD: {
             (1, 1), (1, 13),
             (2, 3), (2, 12),
             (3, 3), (3, 11),
@@ -45,35 +54,328 @@ class Board:
             (11, 3), (11, 11),
             (12, 2), (12, 12),
             (13, 1), (13, 13)
-        }
-        self.triple_word_cells = {
+        },
+        Premium.TRIPLE_WORD: {
             (0, 0), (0, 7), (0, 14),
             (7, 0), (7, 14),
             (14, 0), (14, 7), (14, 14)
         }
+    }
+    table = bytearray(size * size)
+    for premium, cells in premiums.items():
+        for row, col in cells:
+            table[row * size + col] = premium
+    return bytes(table)
+
+
+def _check_square(row, col):
+    # negative indices would otherwise wrap round to the far side
+    if not (0 <= row < Board.SIZE and 0 <= col < Board.SIZE):
+        raise IndexError(f"no square at {row}, {col}")
+
+
+class _Row:
+    # a view of one row of the board, so tiles can be read and set with
+    # board[row][col]
+
+    def __init__(self, board, row):
+        self.board = board
+        self.row = row
+
+    def __getitem__(self, col):
+        return code_tile(self.board._squares[self.row * Board.SIZE + col])
+
+    def __setitem__(self, col, tile):
+        self.board.set_tile(self.row, col, tile)
+
+    def __len__(self):
+        return Board.SIZE
+
+    def __iter__(self):
+        start = self.row * Board.SIZE
+        return (code_tile(code)
+                for code in self.board._squares[start:start + Board.SIZE])
+
+
+class Board:
+    SIZE = 15
+    MIDDLE = (math.floor(SIZE/2), math.floor(SIZE/2))
+
+    # the premium of every square, indexed by row * SIZE + col. A premium
+    # only counts while its square is empty.
+    PREMIUMS = _premium_table(SIZE)
+    # what the premium of every square multiplies a tile played there,
+    # and the word it is in, by
+    LETTER_MULTIPLIERS = bytes(2 if p == Premium.DOUBLE_LETTER else
+                               3 if p == Premium.TRIPLE_LETTER else 1
+                               for p in PREMIUMS)
+    WORD_MULTIPLIERS = bytes(2 if p == Premium.DOUBLE_WORD else
+                             3 if p == Premium.TRIPLE_WORD else 1
+                             for p in PREMIUMS)
+
+    def __init__(self, lexicon=None):
+        # without a lexicon, any sequence of letters is a word
+        self.lexicon = lexicon
+        # the tile code of every square, indexed by row * SIZE + col
+        self._squares = bytearray(Board.SIZE ** 2)
+        self.is_empty = True
+        # Zobrist hash of the tiles on the board, kept up to date as tiles
+        # are set and cleared
+        self.hash = 0
+        # the multipliers of every square, 1 once it holds a tile, so
+        # scoring can index them without checking what is on the board
+        self.letter_multipliers = bytearray(Board.LETTER_MULTIPLIERS)
+        self.word_multipliers = bytearray(Board.WORD_MULTIPLIERS)
+
+        # For every empty square and for plays ACROSS and DOWN: the
+        # letters that may be played there without forming an invalid
+        # perpendicular word, as a bit mask (bit 0 is A), and the score of
+        # the tiles already in that perpendicular word, or NO_CROSS_WORD
+        # if there aren't any.
+        self.cross_checks = (array('I', [ANY_LETTER]) * Board.SIZE ** 2,
+                             array('I', [ANY_LETTER]) * Board.SIZE ** 2)
+        self.cross_scores = (array('h', [NO_CROSS_WORD]) * Board.SIZE ** 2,
+                             array('h', [NO_CROSS_WORD]) * Board.SIZE ** 2)
+
+        # occupancy bit boards, one int per row (bit n is column n) and
+        # one per column (bit n is row n)
+        self.row_bits = array('H', bytes(2 * Board.SIZE))
+        self.col_bits = array('H', bytes(2 * Board.SIZE))
+
+        # what each place_tiles call did, so it can be undone
+        self._history = []
 
     def __str__(self):
         printable_board = ""
         for row in range(Board.SIZE):
             for col in range(Board.SIZE):
-                if self._board[row][col] is not None:
-                    printable_board += f"{self._board[row][col].value} "
+                tile = self.tile(row, col)
+                if tile is not None:
+                    printable_board += f"{tile.letter} "
                 else:
                     printable_board += "0 "
             printable_board += "\n"
         return printable_board
 
     def __getitem__(self, key):
-        return self._board[key]
+        return _Row(self, key)
+
+    def copy(self):
+        board = Board.__new__(Board)
+        board.lexicon = self.lexicon
+        board._squares = bytearray(self._squares)
+        board.is_empty = self.is_empty
+        board.hash = self.hash
+        board.letter_multipliers = bytearray(self.letter_multipliers)
+        board.word_multipliers = bytearray(self.word_multipliers)
+        board.cross_checks = (array('I', self.cross_checks[ACROSS]),
+                              array('I', self.cross_checks[DOWN]))
+        board.cross_scores = (array('h', self.cross_scores[ACROSS]),
+                              array('h', self.cross_scores[DOWN]))
+        board.row_bits = array('H', self.row_bits)
+        board.col_bits = array('H', self.col_bits)
+        # a copy can only undo its own placements
+        board._history = []
+        return board
+
+    def squares(self):
+        # the tile code of every square, indexed by row * SIZE + col
+        return bytes(self._squares)
+
+    @classmethod
+    def from_squares(cls, squares, lexicon=None):
+        # a board holding the tiles with the given codes, with the caches
+        # built in one pass rather than a refresh per tile
+        board = cls(lexicon)
+        board._squares[:] = squares
+        for index, code in enumerate(board._squares):
+            if code:
+                board.hash ^= square_keys(code)[index]
+                board.letter_multipliers[index] = 1
+                board.word_multipliers[index] = 1
+                board.is_empty = False
+                row, col = divmod(index, Board.SIZE)
+                board.row_bits[row] |= 1 << col
+                board.col_bits[col] |= 1 << row
+        # only squares next to a tile have anything to cache
+        for row in range(Board.SIZE):
+            anchors = board.anchor_bits(ACROSS, row)
+            while anchors:
+                col = (anchors & -anchors).bit_length() - 1
+                board._refresh_square(row, col)
+                anchors &= anchors - 1
+        return board
+
+    def tile(self, row, col):
+        return code_tile(self._squares[row * Board.SIZE + col])
+
+    def set_tile(self, row, col, tile):
+        code = tile_code(tile)
+        _check_square(row, col)
+        self._set_code(row, col, code)
+
+    def _set_code(self, row, col, code):
+        index = row * Board.SIZE + col
+        old = self._squares[index]
+        if old:
+            self.hash ^= square_keys(old)[index]
+        if code:
+            self.hash ^= square_keys(code)[index]
+            self.letter_multipliers[index] = 1
+            self.word_multipliers[index] = 1
+        else:
+            self.letter_multipliers[index] = Board.LETTER_MULTIPLIERS[index]
+            self.word_multipliers[index] = Board.WORD_MULTIPLIERS[index]
+        self._squares[index] = code
+        self.refresh(row, col)
+
+    def premium(self, row, col):
+        # the premium still available on a square
+        index = row * Board.SIZE + col
+        if self._squares[index]:
+            return Premium.NONE
+        return Board.PREMIUMS[index]
+
+    def _premium_cells(self, premium):
+        return frozenset(divmod(index, Board.SIZE)
+                         for index, p in enumerate(Board.PREMIUMS)
+                         if p == premium and not self._squares[index])
+
+    @property
+    def double_letter_cells(self):
+        return self._premium_cells(Premium.DOUBLE_LETTER)
+
+    @property
+    def triple_letter_cells(self):
+        return self._premium_cells(Premium.TRIPLE_LETTER)
+
+    @property
+    def double_word_cells(self):
+        return self._premium_cells(Premium.DOUBLE_WORD)
+
+    @property
+    def triple_word_cells(self):
+        return self._premium_cells(Premium.TRIPLE_WORD)
 
     def place_tiles(self, tile_positions):
+        # every tile and square is checked before anything changes, so a
+        # bad one leaves the board and its history as they were
+        tile_positions = tuple(tile_positions)
+        codes = [tile_code(pos[2]) for pos in tile_positions]
         for pos in tile_positions:
-            position = (pos[0], pos[1])
-            # remove any square bonuses
-            self.double_letter_cells.discard(position)
-            self.triple_letter_cells.discard(position)
-            self.double_word_cells.discard(position)
-            self.triple_word_cells.discard(position)
-            # place tile
-            self._board[pos[0]][pos[1]] = pos[2]
+            _check_square(pos[0], pos[1])
+        self._history.append((tile_positions, self.is_empty))
+        for pos, code in zip(tile_positions, codes):
+            self._set_code(pos[0], pos[1], code)
         self.is_empty = False
+
+    def undo(self):
+        # take back the tiles of the last place_tiles, returning them
+        tile_positions, self.is_empty = self._history.pop()
+        for pos in tile_positions:
+            self._set_code(pos[0], pos[1], 0)
+        return list(tile_positions)
+
+    def line_bits(self, axis, line):
+        # occupancy of the row (ACROSS) or column (DOWN) numbered line
+        if axis == ACROSS:
+            return self.row_bits[line]
+        return self.col_bits[line]
+
+    def anchor_bits(self, axis, line):
+        # the empty squares of a row or column that are next to a tile
+        lines = self.row_bits if axis == ACROSS else self.col_bits
+        occupied = lines[line]
+        neighbours = (occupied << 1) | (occupied >> 1)
+        if line > 0:
+            neighbours |= lines[line-1]
+        if line < Board.SIZE-1:
+            neighbours |= lines[line+1]
+        return neighbours & ~occupied & FULL_LINE
+
+    def allows(self, axis, row, col, letter):
+        # whether letter can be played at row, col without forming an
+        # invalid perpendicular word
+        index = row * Board.SIZE + col
+        code = ord(letter.upper()) - 65
+        if code < 0 or code >= 26:
+            return self.cross_scores[axis][index] == NO_CROSS_WORD
+        return self.cross_checks[axis][index] >> code & 1 == 1
+
+    def refresh(self, row, col):
+        # update the caches after the square at row, col has changed.
+        # Only the square itself and the empty squares at either end of
+        # the runs of tiles through it can be affected.
+        self._refresh_square(row, col)
+        for d_row, d_col in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            r = row + d_row
+            c = col + d_col
+            while (0 <= r < Board.SIZE and 0 <= c < Board.SIZE and
+                   self._squares[r * Board.SIZE + c]):
+                r += d_row
+                c += d_col
+            if 0 <= r < Board.SIZE and 0 <= c < Board.SIZE:
+                self._refresh_square(r, c)
+
+    def _refresh_square(self, row, col):
+        index = row * Board.SIZE + col
+        if self._squares[index]:
+            self.row_bits[row] |= 1 << col
+            self.col_bits[col] |= 1 << row
+            for axis in (ACROSS, DOWN):
+                self.cross_checks[axis][index] = ANY_LETTER
+                self.cross_scores[axis][index] = NO_CROSS_WORD
+            return
+
+        self.row_bits[row] &= ~(1 << col)
+        self.col_bits[col] &= ~(1 << row)
+        # plays across are checked against the tiles above and below
+        self._refresh_cross(ACROSS, index,
+                            self._run(row, col, -1, 0),
+                            self._run(row, col, 1, 0))
+        self._refresh_cross(DOWN, index,
+                            self._run(row, col, 0, -1),
+                            self._run(row, col, 0, 1))
+
+    def _run(self, row, col, d_row, d_col):
+        # the tiles next to row, col in one direction, in reading order
+        tiles = []
+        row += d_row
+        col += d_col
+        while (0 <= row < Board.SIZE and 0 <= col < Board.SIZE and
+               self._squares[row * Board.SIZE + col]):
+            tiles.append(self.tile(row, col))
+            row += d_row
+            col += d_col
+        if d_row < 0 or d_col < 0:
+            tiles.reverse()
+        return tiles
+
+    def _refresh_cross(self, axis, index, before, after):
+        if not before and not after:
+            self.cross_checks[axis][index] = ANY_LETTER
+            self.cross_scores[axis][index] = NO_CROSS_WORD
+            return
+
+        self.cross_scores[axis][index] = sum(
+            t.score for t in before) + sum(t.score for t in after)
+        if self.lexicon is None:
+            self.cross_checks[axis][index] = ANY_LETTER
+            return
+
+        lexicon = self.lexicon
+        allowed = 0
+        node = self._walk(lexicon.root, before)
+        if node is not None:
+            for letter, child in lexicon.edges(node):
+                end = self._walk(child, after)
+                if end is not None and lexicon.is_word(end):
+                    allowed |= 1 << (ord(letter) - 65)
+        self.cross_checks[axis][index] = allowed
+
+    def _walk(self, node, tiles):
+        for tile in tiles:
+            node = self.lexicon.child(node, tile.letter.upper())
+            if node is None:
+                break
+        return node
@@ -0,0 +1,214 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import time
+from dataclasses import dataclass, field
+from .movegen import MoveGenerator
+from .scrabb import Game
+from .tile import rack_tile
+from .transposition import TranspositionTable
+from .zobrist import MASK, RACK, tiles_hash
+
+# bounds stored in the transposition table
+EXACT = 0
+LOWER = 1
+UPPER = 2
+# the depth stored for results that searched every line to the end of
+# the game, so they are good for any depth
+SOLVED = 1 << 30
+
+
+class NotEndgameException(Exception):
+    def __init__(self, tiles_in_bag, num_players):
+        super().__init__()
+        self.tiles_in_bag = tiles_in_bag
+        self.num_players = num_players
+        self.message = f"{tiles_in_bag} {num_players}"
+
+
+class _Timeout(Exception):
+    pass
+
+
+@dataclass
+class EndgameResult:
+    # the best line found for the player on turn, one tile_positions list
+    # per turn, with None for a pass
+    moves: list = field(default_factory=list)
+    # points the player on turn gains over the opponent from here on, and
+    # the spread once the game is over
+    value: int = 0
+    spread: int = 0
+    depth: int = 0
+    # whether every line was searched to the end of the game
+    solved: bool = False
+    nodes: int = 0
+
+
+def rack_value(rack):
+    return sum(tile.score for tile in rack)
+
+
+class EndgameSolver:
+    # Negamax search with alpha-beta pruning for two player games with an
+    # empty bag, where both racks are known. Iterative deepening orders
+    # each pass by the best moves of the one before, through the
+    # transposition table, and leaves a usable answer when time runs out.
+    # A player going out gains the value of the other rack twice over;
+    # two passes in a row end the game with each rack counting against
+    # its owner.
+
+    def __init__(self, game, table_size=1 << 16):
+        if len(game.tile_bag) > 0 or len(game.players) != 2:
+            raise NotEndgameException(len(game.tile_bag), len(game.players))
+        self.game = game
+        self.table = TranspositionTable(table_size)
+        self.nodes = 0
+        self._deadline = None
+
+    def solve(self, time_limit=None, max_depth=None):
+        game = self.game
+        player = game.current_player
+        opponent = game.players[(game.turn + 1) % 2]
+        spread = player.score - opponent.score
+
+        # search on a copy, so the game is untouched if time runs out
+        self._search_game = Game(game.lexicon)
+        self._search_game.board = game.board.copy()
+        self._generator = MoveGenerator(self._search_game)
+        racks = [list(player.rack), list(opponent.rack)]
+        if time_limit is not None:
+            self._deadline = time.monotonic() + time_limit
+        else:
+            self._deadline = None
+
+        result = EndgameResult()
+        self.nodes = 0
+        depth = 0
+        while max_depth is None or depth < max_depth:
+            depth += 1
+            try:
+                value, solved, line = self._negamax(
+                    racks, 0, depth, -SOLVED, SOLVED)
+            except _Timeout:
+                break
+            result = EndgameResult(line, value, spread + value, depth,
+                                   solved, self.nodes)
+            if solved:
+                break
+
+        if not result.depth:
+            # out of time before the first pass finished: play greedily
+            moves = self._generator.generate(racks[0])
+            if moves:
+                result.moves = [moves[0][1]]
+                result.value = moves[0][0]
+            result.spread = spread + result.value
+        result.nodes = self.nodes
+        return result
+
+    def _key(self, racks, passes):
+        key = (self._search_game.board.hash ^
+               tiles_hash(racks[0], RACK, 0) ^ tiles_hash(racks[1], RACK, 1))
+        if passes:
+            key ^= MASK
+        return key
+
+    def _negamax(self, racks, passes, depth, alpha, beta):
+        # returns the value for the player whose rack is racks[0], whether
+        # it was searched to the end of the game, and the best line
+        self.nodes += 1
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise _Timeout()
+
+        key = self._key(racks, passes)
+        entry = self.table.get(key, depth)
+        best_move = None
+        if entry is not None:
+            value, bound, best_move, line, solved = entry
+            if (bound == EXACT or
+                    (bound == LOWER and value >= beta) or
+                    (bound == UPPER and value <= alpha)):
+                return value, solved, line
+        elif depth > 0:
+            # a shallower search still knows the best move to try first
+            shallow = self.table.get(key)
+            if shallow is not None:
+                best_move = shallow[2]
+        if depth == 0:
+            # out of depth: guess that the racks will count as if the game
+            # ended now
+            return rack_value(racks[1]) - rack_value(racks[0]), False, []
+
+        rack, other = racks
+        moves = self._ordered_moves(rack, best_move)
+        alpha_start = alpha
+        best_value = -SOLVED
+        best_line = []
+        solved = True
+        board = self._search_game.board
+
+        for score, tile_positions in moves:
+            if tile_positions is None:
+                if passes:
+                    # both players passed: the game is over
+                    value = rack_value(other) - rack_value(rack)
+                    child_solved = True
+                    child_line = []
+                else:
+                    child_value, child_solved, child_line = self._negamax(
+                        [other, rack], 1, depth - 1, -beta, -alpha)
+                    value = -child_value
+            else:
+                remaining = list(rack)
+                for pos in tile_positions:
+                    remaining.remove(rack_tile(pos[2]))
+                if not remaining:
+                    # going out ends the game
+                    value = score + 2 * rack_value(other)
+                    child_solved = True
+                    child_line = []
+                else:
+                    board.place_tiles(tile_positions)
+                    try:
+                        # the child's value is ours less the score, so
+                        # the window shifts by it
+                        child_value, child_solved, child_line = \
+                            self._negamax([other, remaining], 0, depth - 1,
+                                          score - beta, score - alpha)
+                    finally:
+                        board.undo()
+                    value = score - child_value
+
+            solved = solved and child_solved
+            if value > best_value:
+                best_value = value
+                best_move = tile_positions
+                best_line = [tile_positions] + child_line
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        if best_value <= alpha_start:
+            bound = UPPER
+        elif best_value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.store(key, (best_value, bound, best_move, best_line,
+                               solved), SOLVED if solved else depth)
+        return best_value, solved, best_line
+
+    def _ordered_moves(self, rack, first):
+        # going out first, then the best move of an earlier search, then
+        # by score; passing comes last
+        moves = self._generator.generate(rack)
+        moves.sort(key=lambda move: (len(move[1]) == len(rack),
+                                     move[1] == first, move[0]),
+                   reverse=True)
+        moves.append((0, None))
+        return moves
@@ -0,0 +1,88 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import random
+from dataclasses import dataclass
+from itertools import combinations
+from .movegen import MoveGenerator
+from .tile import tile_code
+from .tracker import TileTracker
+
+
+@dataclass
+class ExchangeResult:
+    # tiles to pass to Game.exchange, and the tiles kept
+    tiles: list
+    leave: list
+    leave_value: float
+    # mean score of the best play with the rack after the exchange, on
+    # the board as it is now, or None if it wasn't sampled
+    next_score: float
+    equity: float
+
+
+def evaluate_exchanges(game, leaves, top=None, samples=0, seed=0):
+    # Every distinct exchange the current player could make, best first:
+    # up to 127 subsets of a full rack, fewer with repeated tiles. An
+    # exchange is worth the value of the leave it keeps and, with
+    # samples, the mean score of the best play after drawing. Like
+    # TileBag.exchange_tiles, the new tiles are drawn before the old ones
+    # go back, so they come from the tiles the player hasn't seen, and no
+    # more tiles can be exchanged than are in the bag.
+    rack = sorted(game.current_player.rack, key=tile_code)
+    most = min(len(rack), len(game.tile_bag))
+
+    draws = []
+    if samples:
+        # every exchange is scored against the same draws, so the
+        # differences between them aren't noise
+        rng = random.Random(seed)
+        unseen = TileTracker.from_game(game).tiles()
+        for _ in range(samples):
+            rng.shuffle(unseen)
+            draws.append(unseen[:most])
+    generator = MoveGenerator(game)
+    best_scores = {}
+
+    results = []
+    seen = set()
+    for size in range(1, most + 1):
+        for kept in combinations(range(len(rack)), len(rack) - size):
+            leave = [rack[i] for i in kept]
+            key = tuple(leave)
+            if key in seen:
+                continue
+            seen.add(key)
+            tiles = list(rack)
+            for tile in leave:
+                tiles.remove(tile)
+
+            leave_value = leaves.value(leave)
+            next_score = None
+            equity = leave_value
+            if draws:
+                total = 0
+                for drawn in draws:
+                    total += _best_score(generator, best_scores,
+                                         leave + drawn[:size])
+                next_score = total / len(draws)
+                equity += next_score
+            results.append(ExchangeResult(tiles, leave, leave_value,
+                                          next_score, equity))
+
+    results.sort(key=lambda result: result.equity, reverse=True)
+    return results[:top] if top is not None else results
+
+
+def _best_score(generator, best_scores, rack):
+    # the best play's score for rack, worked out once per distinct rack
+    key = tuple(sorted(map(tile_code, rack)))
+    score = best_scores.get(key)
+    if score is None:
+        best = next(generator.iter_moves(rack), None)
+        score = best[0] if best is not None else 0
+        best_scores[key] = score
+    return score
@@ -0,0 +1,426 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum, auto
+from .board import Board
+from .lexicon import Lexicon
+from .scrabb import Game, InvalidPlayException, Orientation
+from .tile import LETTER_SCORES, letter_tile
+
+# GCG is the annotated game format used by most Scrabble software. A game
+# is a block of pragmas, such as
+#   #player1 ann Ann Smith
+#   #player2 bob Bob Jones
+# followed by one line per turn:
+#   >ann: AEINRST 8D RETAINS +76 76     a play; 8D is across from row 8
+#                                       column D, D8 would be down. '.'
+#                                       or (X) marks a tile played through
+#                                       and lower case letters are blanks
+#   >bob: ?ABCDEF -ABC +0 0             exchange (or -3, just the count)
+#   >bob: ?ABCDEF - +0 0                pass
+#   >bob: ?ABCDEF -- -76 0              the previous play, withdrawn
+#   >ann: AEINRST (challenge) +5 81     bonus for a failed challenge
+#   >ann: (ABC) +14 95                  twice the rack left by the
+#                                       player who didn't go out
+#   >bob: ABC (ABC) -7 -7               own rack at the end, otherwise
+#   >bob: ABC (time) -10 -17            overtime penalty
+# Files may hold any number of games one after another. A header pragma
+# after a game's turns starts the next game.
+HEADER_PRAGMAS = {"character-encoding", "player1", "player2", "title",
+                  "description", "id", "lexicon", "tile-set",
+                  "board-layout", "tile-distribution"}
+COLUMNS = "ABCDEFGHIJKLMNO"
+# files bigger than this are split between workers
+CHUNK_BYTES = 1 << 24
+
+
+class MoveKind(Enum):
+    PLAY = auto()
+    EXCHANGE = auto()
+    PASS = auto()
+    WITHDRAWN = auto()
+    CHALLENGE_BONUS = auto()
+    END_RACK_POINTS = auto()
+    END_RACK_PENALTY = auto()
+    TIME_PENALTY = auto()
+
+
+@dataclass
+class GcgMove:
+    line: int
+    player: str
+    rack: str
+    kind: MoveKind
+    score: int
+    total: int
+    position: str = ""
+    # the word played, the tiles exchanged or the rack counted at the end
+    tiles: str = ""
+
+
+@dataclass
+class GcgRecord:
+    line: int
+    players: list = field(default_factory=list)
+    pragmas: dict = field(default_factory=dict)
+    moves: list = field(default_factory=list)
+    # (line, message) for each line that couldn't be read
+    errors: list = field(default_factory=list)
+
+
+@dataclass
+class ReplayResult:
+    record: GcgRecord
+    scores: list
+    # (line, message) for each problem found
+    errors: list
+
+
+@dataclass
+class BulkResult:
+    games: int = 0
+    moves: int = 0
+    # (path, line, message) for each problem found
+    errors: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def games_per_second(self):
+        return self.games / self.seconds if self.seconds else 0.0
+
+
+def _pragma(line):
+    # the name of a pragma line
+    return line[1:].split(None, 1)[0] if len(line) > 1 else ""
+
+
+def read_gcg(lines, first_line=1):
+    # yield each game in an iterable of lines, one at a time
+    record = None
+    for number, line in enumerate(lines, first_line):
+        line = line.rstrip("\r\n")
+        if line.startswith("#"):
+            name = _pragma(line)
+            if name in HEADER_PRAGMAS and (record is None or record.moves):
+                if record is not None:
+                    yield record
+                record = GcgRecord(number)
+            elif record is None:
+                record = GcgRecord(number)
+            value = line[len(name) + 1:].strip()
+            if name in ("player1", "player2"):
+                record.players.append(value.split(None, 1)[0]
+                                      if value else "")
+            if name == "note" and "note" in record.pragmas:
+                record.pragmas["note"] += "\n" + value
+            else:
+                record.pragmas[name] = value
+        elif line.startswith(">"):
+            if record is None:
+                record = GcgRecord(number)
+            try:
+                record.moves.append(parse_move(number, line))
+            except ValueError as e:
+                record.errors.append((number, str(e)))
+    if record is not None:
+        yield record
+
+
+def parse_move(number, line):
+    player, sep, rest = line[1:].partition(":")
+    tokens = rest.split()
+    if not sep or len(tokens) < 3:
+        raise ValueError(f"bad move {line!r}")
+    player = player.strip()
+
+    if tokens[0].startswith("(") and len(tokens) == 3:
+        # points for the rack left by the player who didn't go out
+        return GcgMove(number, player, "", MoveKind.END_RACK_POINTS,
+                       int(tokens[1]), int(tokens[2]),
+                       tiles=tokens[0].strip("()"))
+    rack, action = tokens[0], tokens[1]
+    if action == "-" and len(tokens) == 4:
+        return GcgMove(number, player, rack, MoveKind.PASS,
+                       int(tokens[2]), int(tokens[3]))
+    if action == "--" and len(tokens) == 4:
+        return GcgMove(number, player, rack, MoveKind.WITHDRAWN,
+                       int(tokens[2]), int(tokens[3]))
+    if action.startswith("-") and len(tokens) == 4:
+        return GcgMove(number, player, rack, MoveKind.EXCHANGE,
+                       int(tokens[2]), int(tokens[3]), tiles=action[1:])
+    if action == "(challenge)" and len(tokens) == 4:
+        return GcgMove(number, player, rack, MoveKind.CHALLENGE_BONUS,
+                       int(tokens[2]), int(tokens[3]))
+    if action == "(time)" and len(tokens) == 4:
+        return GcgMove(number, player, rack, MoveKind.TIME_PENALTY,
+                       int(tokens[2]), int(tokens[3]))
+    if action.startswith("(") and len(tokens) == 4:
+        kind = (MoveKind.END_RACK_POINTS if int(tokens[2]) > 0
+                else MoveKind.END_RACK_PENALTY)
+        return GcgMove(number, player, rack, kind, int(tokens[2]),
+                       int(tokens[3]), tiles=action.strip("()"))
+    if len(tokens) == 5:
+        return GcgMove(number, player, rack, MoveKind.PLAY, int(tokens[3]),
+                       int(tokens[4]), position=action, tiles=tokens[2])
+    raise ValueError(f"bad move {line!r}")
+
+
+def tile_positions(board, position, word):
+    # the tiles a play puts on the board. Raises ValueError if it doesn't
+    # fit the board.
+    if not position or not word:
+        raise ValueError("missing position or word")
+    if position[0].isdigit():
+        row, col = int(position[:-1]) - 1, COLUMNS.index(position[-1])
+        d_row, d_col = 0, 1
+    else:
+        row, col = int(position[1:]) - 1, COLUMNS.index(position[0])
+        d_row, d_col = 1, 0
+
+    positions = []
+    through = False
+    for letter in word:
+        if letter in "()":
+            through = letter == "("
+            continue
+        if not (0 <= row < Board.SIZE and 0 <= col < Board.SIZE):
+            raise ValueError(f"{position} {word} runs off the board")
+        if letter == "." or through:
+            if board.tile(row, col) is None:
+                raise ValueError(f"{position} {word}: no tile to play "
+                                 "through")
+        elif board.tile(row, col) is not None:
+            raise ValueError(f"{position} {word}: square already full")
+        elif letter != ' ' and letter_tile(letter) is not None:
+            positions.append((row, col, letter_tile(letter)))
+        else:
+            raise ValueError(f"{position} {word}: bad letter {letter!r}")
+        row += d_row
+        col += d_col
+    if not positions:
+        raise ValueError(f"{position} {word}: no tiles played")
+    return positions
+
+
+def _rack_value(tiles):
+    return sum(LETTER_SCORES.get(letter, 0) for letter in tiles)
+
+
+def replay(record, lexicon=None):
+    # play a game through Game.play_tiles, checking every recorded score
+    # and that the totals add up. With a lexicon, words that weren't
+    # withdrawn are checked too.
+    game = Game()
+    players = list(record.players)
+    for move in record.moves:
+        if move.player not in players:
+            players.append(move.player)
+    for name in players:
+        game.add_player(name)
+    seats = {name: i for i, name in enumerate(players)}
+    errors = list(record.errors)
+    last_play = {}
+
+    for i, move in enumerate(record.moves):
+        player = game.players[seats[move.player]]
+        score = move.score
+        if move.kind == MoveKind.PLAY:
+            try:
+                positions = tile_positions(game.board, move.position,
+                                           move.tiles)
+                orientation = game.get_orientation(positions)
+                if len(positions) == 1 and move.position[0].isalpha():
+                    orientation = Orientation.VERTICAL
+                withdrawn = (i + 1 < len(record.moves) and
+                             record.moves[i + 1].kind == MoveKind.WITHDRAWN)
+                if lexicon is not None and not withdrawn:
+                    _check_words(game, orientation, positions, lexicon,
+                                 move, errors)
+                score = game.play_tiles(positions)
+            except (ValueError, InvalidPlayException) as e:
+                message = getattr(e, "message", str(e))
+                errors.append((move.line, f"can't play {move.position} "
+                                          f"{move.tiles}: {message}"))
+                break
+            last_play[move.player] = score
+            if score != move.score:
+                errors.append((move.line, f"{move.position} {move.tiles} "
+                                          f"scores {score}, not "
+                                          f"{move.score}"))
+        elif move.kind == MoveKind.WITHDRAWN:
+            if move.player not in last_play:
+                errors.append((move.line, "nothing to withdraw"))
+                break
+            game.board.undo()
+            score = -last_play.pop(move.player)
+            if score != move.score:
+                errors.append((move.line, f"withdrawing takes back "
+                                          f"{-score}, not {-move.score}"))
+        elif move.kind == MoveKind.END_RACK_POINTS:
+            score = 2 * _rack_value(move.tiles)
+            if score != move.score:
+                errors.append((move.line, f"({move.tiles}) is worth "
+                                          f"{score}, not {move.score}"))
+        elif move.kind == MoveKind.END_RACK_PENALTY:
+            score = -_rack_value(move.tiles)
+            if score != move.score:
+                errors.append((move.line, f"({move.tiles}) costs "
+                                          f"{-score}, not {-move.score}"))
+        # totals carry on from the recorded score, so one wrong score
+        # isn't reported again on every later turn
+        player.score += move.score
+        if player.score != move.total:
+            errors.append((move.line, f"{move.player} has {player.score}, "
+                                      f"not {move.total}"))
+            # carry on from the recorded total
+            player.score = move.total
+
+    return ReplayResult(record, [player.score for player in game.players],
+                        errors)
+
+
+def _check_words(game, orientation, positions, lexicon, move, errors):
+    if orientation == Orientation.HORIZONTAL:
+        positions.sort(key=lambda x: x[1])
+    else:
+        positions.sort(key=lambda x: x[0])
+    for word in game.find_words(orientation, positions):
+        text = game.word_string(word)
+        if text not in lexicon:
+            errors.append((move.line, f"{text} is not a word"))
+
+
+def _record_starts(f, offset):
+    # the offset of the first game to start at or after offset. As in
+    # read_gcg, that is a header pragma with a turn read somewhere since
+    # the last one, whatever blank lines or other pragmas come in between.
+    if offset == 0:
+        return 0
+    f.seek(offset - 1)
+    f.readline()
+    after_turn = False
+    while True:
+        start = f.tell()
+        line = f.readline()
+        if not line:
+            return start
+        if line.startswith(b">"):
+            try:
+                parse_move(0, line.decode("utf-8", "replace").rstrip("\r\n"))
+                after_turn = True
+            except ValueError:
+                pass
+        elif (after_turn and line.startswith(b"#") and
+                _pragma(line.decode("utf-8", "replace")) in HEADER_PRAGMAS):
+            return start
+
+
+def _chunks(path, chunk_bytes=CHUNK_BYTES):
+    # (path, start, end) byte ranges of a file, each holding whole games
+    size = os.path.getsize(path)
+    starts = []
+    with open(path, "rb") as f:
+        for offset in range(0, size, chunk_bytes):
+            start = _record_starts(f, offset)
+            if start < size and (not starts or start > starts[-1]):
+                starts.append(start)
+    if not starts:
+        starts = [0]
+    return [(path, start, end)
+            for start, end in zip(starts, starts[1:] + [size])]
+
+
+def _replay_chunk(path, start, end, lexicon=None):
+    # returns the games, moves and errors in one range of a file, with
+    # errors numbered from the first line of the range
+    games = 0
+    moves = 0
+    errors = []
+    with open(path, "rb") as f:
+        f.seek(start)
+
+        def lines():
+            while f.tell() < end:
+                line = f.readline()
+                if not line:
+                    return
+                yield line.decode("utf-8", "replace")
+
+        for record in read_gcg(lines()):
+            result = replay(record, lexicon)
+            games += 1
+            moves += len(record.moves)
+            errors += result.errors
+    return games, moves, errors
+
+
+def _lines_before(path, offsets):
+    # the number of lines before each offset, in one pass over the file
+    counts = {}
+    count = 0
+    position = 0
+    with open(path, "rb") as f:
+        for offset in sorted(offsets):
+            while position < offset:
+                block = f.read(min(offset - position, 1 << 20))
+                count += block.count(b"\n")
+                position += len(block)
+            counts[offset] = count
+    return counts
+
+
+def replay_files(paths, lexicon=None, workers=None,
+                 chunk_bytes=CHUNK_BYTES):
+    # replay every game in the files, in worker processes, splitting
+    # large files between them. With workers == 0 it all runs here.
+    began = time.perf_counter()
+    chunks = [chunk for path in paths for chunk in _chunks(path, chunk_bytes)]
+    if workers == 0:
+        results = [_replay_chunk(path, start, end, lexicon)
+                   for path, start, end in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                _replay_chunk, *zip(*chunks), [lexicon] * len(chunks)))
+
+    # line numbers only need working out where there are errors
+    starts = {}
+    for (path, start, _), (_, _, errors) in zip(chunks, results):
+        if errors and start:
+            starts.setdefault(path, []).append(start)
+    lines_before = {path: _lines_before(path, offsets)
+                    for path, offsets in starts.items()}
+
+    result = BulkResult()
+    for (path, start, _), (games, moves, errors) in zip(chunks, results):
+        result.games += games
+        result.moves += moves
+        before = lines_before.get(path, {}).get(start, 0)
+        result.errors += [(path, before + line, message)
+                          for line, message in errors]
+    result.seconds = time.perf_counter() - began
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="replay GCG files, checking every score")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--lexicon", help="compiled lexicon file")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    lexicon = Lexicon.load(args.lexicon) if args.lexicon else None
+    bulk = replay_files(args.files, lexicon, args.workers)
+    for path, line, message in bulk.errors:
+        print(f"{path}:{line}: {message}")
+    print(f"{bulk.games} games, {bulk.moves} moves in {bulk.seconds:.1f}s "
+          f"({bulk.games_per_second:.0f} games/s), "
+          f"{len(bulk.errors)} errors")
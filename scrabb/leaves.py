@@ -0,0 +1,254 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import mmap
+import struct
+import sys
+from array import array
+from itertools import combinations_with_replacement
+from .move import Move
+from .tile import STANDARD_CODES, code_tile, rack_tile
+from .tilebag import DISTRIBUTION
+
+# A leave table holds a value for every multiset of up to MAX_LEAVE tiles
+# that a full bag could produce, as one flat array of 32 bit floats.
+# Leaves are numbered densely: first by size, then by how many of each
+# tile they hold, taking the tiles in code order (A-Z, then the blank).
+# Numbering a leave only needs a few additions from precomputed tables.
+MAX_LEAVE = 6
+# tile codes 1-27 are A-Z and the blank
+NUM_KINDS = 27
+CAPS = [DISTRIBUTION[code_tile(code).letter]
+        for code in range(1, NUM_KINDS + 1)]
+
+MAGIC = b'SCLV'
+VERSION = 1
+HEADER = struct.Struct('<4sII')  # magic, version, largest leave
+
+
+def _counting_tables():
+    # ways[kind][size]: multisets of size tiles using kinds kind and up
+    ways = [[0] * (MAX_LEAVE + 1) for _ in range(NUM_KINDS + 1)]
+    ways[NUM_KINDS][0] = 1
+    for kind in range(NUM_KINDS - 1, -1, -1):
+        for size in range(MAX_LEAVE + 1):
+            ways[kind][size] = sum(ways[kind + 1][size - n] for n in
+                                   range(min(CAPS[kind], size) + 1))
+
+    # steps[kind][size][count]: how many leaves of size tiles from kinds
+    # kind and up come before those holding count of kind
+    steps = [[[0] * (MAX_LEAVE + 1) for _ in range(MAX_LEAVE + 1)]
+             for _ in range(NUM_KINDS)]
+    for kind in range(NUM_KINDS):
+        for size in range(MAX_LEAVE + 1):
+            for count in range(1, size + 1):
+                steps[kind][size][count] = (steps[kind][size][count - 1] +
+                                            ways[kind + 1][size - count + 1])
+
+    offsets = [0]
+    for size in range(MAX_LEAVE):
+        offsets.append(offsets[-1] + ways[0][size])
+    return ways[0], steps, offsets
+
+
+_SIZES, _STEPS, _OFFSETS = _counting_tables()
+# the kind of every rack tile, and of blanks played as a letter
+_KINDS = {code_tile(code): code - 1 for code in range(1, NUM_KINDS + 1)}
+_KINDS.update((code_tile(code), NUM_KINDS - 1)
+              for code in range(NUM_KINDS + 1, STANDARD_CODES))
+
+
+class InvalidLeaveException(Exception):
+    def __init__(self, leave):
+        super().__init__()
+        self.leave = leave
+        self.message = f"{leave}"
+
+
+class InvalidLeaveTableException(Exception):
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.message = f"{path}"
+
+
+def num_leaves(max_size=MAX_LEAVE):
+    return _OFFSETS[max_size] + _SIZES[max_size]
+
+
+def leave_index(leave):
+    # the dense number of a leave, given as rack tiles in any order
+    try:
+        kinds = sorted([_KINDS[tile] for tile in leave])
+    except KeyError:
+        raise InvalidLeaveException(leave)
+    size = len(kinds)
+    if size > MAX_LEAVE:
+        raise InvalidLeaveException(leave)
+    index = _OFFSETS[size]
+    remaining = size
+    i = 0
+    while i < size:
+        kind = kinds[i]
+        count = 1
+        while i + count < size and kinds[i + count] == kind:
+            count += 1
+        if count > CAPS[kind]:
+            raise InvalidLeaveException(leave)
+        index += _STEPS[kind][remaining][count]
+        remaining -= count
+        i += count
+    return index
+
+
+def all_leaves(max_size=MAX_LEAVE):
+    # every leave up to max_size tiles, as tuples of tiles
+    tiles = [code_tile(code) for code in range(1, NUM_KINDS + 1)]
+    for size in range(max_size + 1):
+        for kinds in combinations_with_replacement(range(NUM_KINDS), size):
+            if all(kinds.count(kind) <= CAPS[kind] for kind in set(kinds)):
+                yield tuple(tiles[kind] for kind in kinds)
+
+
+# rough worth of keeping one of each tile, in points
+TILE_VALUES = {
+    'A': 1.0, 'B': -2.0, 'C': 0.5, 'D': 0.5, 'E': 4.0, 'F': -2.0,
+    'G': -2.5, 'H': 1.0, 'I': -0.5, 'J': -1.5, 'K': -2.5, 'L': -0.5,
+    'M': 0.5, 'N': 0.5, 'O': -1.5, 'P': -0.5, 'Q': -7.0, 'R': 1.5,
+    'S': 8.0, 'T': 0.0, 'U': -3.5, 'V': -5.5, 'W': -4.0, 'X': 3.5,
+    'Y': -0.5, 'Z': 2.0, ' ': 25.0
+}
+VOWELS = set("AEIOU")
+
+
+def heuristic_value(leave):
+    # tile worth, less penalties for duplicates, a poor vowel to
+    # consonant mix and a Q without a U
+    value = 0.0
+    seen = {}
+    vowels = 0
+    consonants = 0
+    for tile in leave:
+        letter = tile.letter
+        value += TILE_VALUES[letter]
+        seen[letter] = seen.get(letter, 0) + 1
+        if letter in VOWELS:
+            vowels += 1
+        elif letter != ' ':
+            consonants += 1
+    for letter, count in seen.items():
+        if count > 1 and letter != ' ':
+            value -= 3.0 * (count - 1) ** 1.5
+    if 'Q' in seen and 'U' not in seen:
+        value -= 4.0
+    value -= 1.5 * max(abs(vowels - consonants) - 1, 0) ** 1.5
+    return value
+
+
+class LeaveTable:
+    # Leaves longer than max_size are valued by fallback, a function of
+    # the leave, if there is one, and are otherwise worth nothing extra.
+
+    def __init__(self, values, max_size=MAX_LEAVE, path=None, mapping=None,
+                 fallback=None):
+        self._values = values
+        self.max_size = max_size
+        self.path = path
+        self._mapping = mapping
+        self.fallback = fallback
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, leave):
+        return self._values[leave_index(leave)]
+
+    def __copy__(self):
+        # tables are never modified, so copies can share one
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        # workers reopen the same file rather than copying the values
+        if self.path is not None:
+            return (LeaveTable.load, (self.path, self.fallback))
+        return (LeaveTable, (array('f', self._values), self.max_size, None,
+                             None, self.fallback))
+
+    def value(self, leave):
+        if len(leave) > self.max_size:
+            if self.fallback is not None:
+                return self.fallback(leave)
+            return 0.0
+        return self._values[leave_index(leave)]
+
+    def leave_value(self, rack, tile_positions):
+        # the value of what a play leaves on the rack
+        leave = list(rack)
+        if isinstance(tile_positions, Move):
+            for tile in tile_positions.tiles():
+                leave.remove(rack_tile(tile))
+        else:
+            for pos in tile_positions:
+                leave.remove(rack_tile(pos[2]))
+        return self.value(leave)
+
+    def close(self):
+        if self._mapping is not None:
+            self._values.release()
+            self._mapping.close()
+            self._mapping = None
+
+    @classmethod
+    def from_function(cls, value, max_size=MAX_LEAVE, fallback=None):
+        values = array('f', bytes(4 * num_leaves(max_size)))
+        for leave in all_leaves(max_size):
+            values[leave_index(leave)] = value(leave)
+        return cls(values, max_size, fallback=fallback)
+
+    @classmethod
+    def default(cls, max_size=MAX_LEAVE, fallback=None):
+        return cls.from_function(heuristic_value, max_size, fallback)
+
+    def save(self, path):
+        values = array('f', self._values)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.max_size))
+            f.write(values.tobytes())
+
+    @classmethod
+    def load(cls, path, fallback=None):
+        # like lexicons, the values are read straight from the page cache
+        with open(path, 'rb') as f:
+            try:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise InvalidLeaveTableException(path)
+        if len(mapping) < HEADER.size:
+            mapping.close()
+            raise InvalidLeaveTableException(path)
+        magic, version, max_size = HEADER.unpack_from(mapping)
+        if (magic != MAGIC or version != VERSION or max_size > MAX_LEAVE or
+                len(mapping) != HEADER.size + 4 * num_leaves(max_size)):
+            mapping.close()
+            raise InvalidLeaveTableException(path)
+
+        if sys.byteorder == 'big':
+            values = array('f', mapping[HEADER.size:])
+            values.byteswap()
+            mapping.close()
+            return cls(values, max_size, path, fallback=fallback)
+        values = memoryview(mapping)[HEADER.size:].cast('f')
+        return cls(values, max_size, path, mapping, fallback)
+
+
+if __name__ == "__main__":
+    # build the heuristic table: leaves.py OUTPUT
+    LeaveTable.default().save(sys.argv[1])
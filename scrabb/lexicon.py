@@ -0,0 +1,249 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import mmap
+import struct
+import sys
+from array import array
+
+# A lexicon is a minimized DAWG stored as one flat array of 32 bit edges.
+# The edges leaving a node are consecutive and sorted by letter, and each
+# edge packs:
+#   bits 0-4   letter (A=0 .. Z=25)
+#   bit 5      last edge leaving this node
+#   bit 6      the node this edge leads to ends a word
+#   bits 7-31  index of the first edge leaving that node (0 if none)
+# A node is referred to by the edge leading to it, so walking the lexicon
+# never allocates anything but ints.
+LETTER_MASK = 0x1F
+LAST_EDGE = 0x20
+TERMINAL = 0x40
+CHILD_SHIFT = 7
+
+MAGIC = b'SCRB'
+VERSION = 1
+HEADER = struct.Struct('<4sIII')  # magic, version, root, word count
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+class InvalidLexiconException(Exception):
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.message = f"{path} is not a lexicon file"
+
+
+class _Node:
+    __slots__ = ('terminal', 'children', 'id')
+
+    def __init__(self):
+        self.terminal = False
+        self.children = {}
+        self.id = None
+
+    def key(self):
+        return (self.terminal,
+                tuple((letter, child.id)
+                      for letter, child in self.children.items()))
+
+
+class Lexicon:
+
+    def __init__(self, edges, root, word_count, path=None, mapping=None):
+        self._edges = edges
+        self.root = root
+        self._word_count = word_count
+        self.path = path
+        self._mapping = mapping
+
+    def __len__(self):
+        return self._word_count
+
+    def __contains__(self, word):
+        node = self.root
+        for letter in word:
+            node = self.child(node, letter)
+            if node is None:
+                return False
+        return self.is_word(node)
+
+    def __iter__(self):
+        stack = [(self.root, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if self.is_word(node):
+                yield prefix
+            for letter, child in reversed(self.edges(node)):
+                stack.append((child, prefix + letter))
+
+    def __copy__(self):
+        # lexicons are never modified, so copies can share one
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        # workers reopen the same file rather than copying the edges
+        if self.path is not None:
+            return (Lexicon.load, (self.path,))
+        return (Lexicon, (array('I', self._edges), self.root,
+                          self._word_count))
+
+    def child(self, node, letter):
+        i = node >> CHILD_SHIFT
+        if i == 0:
+            return None
+        code = ord(letter) - 65
+        edges = self._edges
+        while True:
+            edge = edges[i]
+            edge_letter = edge & LETTER_MASK
+            if edge_letter == code:
+                return edge
+            if edge_letter > code or edge & LAST_EDGE:
+                return None
+            i += 1
+
+    def edges(self, node):
+        i = node >> CHILD_SHIFT
+        result = []
+        if i == 0:
+            return result
+        edges = self._edges
+        while True:
+            edge = edges[i]
+            result.append((LETTERS[edge & LETTER_MASK], edge))
+            if edge & LAST_EDGE:
+                return result
+            i += 1
+
+    def is_word(self, node):
+        return node & TERMINAL != 0
+
+    def close(self):
+        if self._mapping is not None:
+            self._edges.release()
+            self._mapping.close()
+            self._mapping = None
+
+    @classmethod
+    def from_words(cls, words):
+        # builds the minimal DAWG incrementally over the sorted words
+        # (Daciuk et al., 2000), so only the unminimized suffix of the last
+        # word is ever held as separate nodes
+        words = sorted({w.strip().upper() for w in words
+                        if w.strip().isalpha() and w.strip().isascii()})
+        root = _Node()
+        register = {}
+        unchecked = []
+
+        def minimize(down_to):
+            while len(unchecked) > down_to:
+                parent, letter, child = unchecked.pop()
+                key = child.key()
+                if key in register:
+                    parent.children[letter] = register[key]
+                else:
+                    child.id = len(register) + 1
+                    register[key] = child
+
+        previous = ""
+        for word in words:
+            common = 0
+            for a, b in zip(word, previous):
+                if a != b:
+                    break
+                common += 1
+            minimize(common)
+            node = unchecked[-1][2] if unchecked else root
+            for letter in word[common:]:
+                child = _Node()
+                node.children[letter] = child
+                unchecked.append((node, letter, child))
+                node = child
+            node.terminal = True
+            previous = word
+        minimize(0)
+
+        return cls(*cls._flatten(root), len(words))
+
+    @staticmethod
+    def _flatten(root):
+        # lay out every node's edges consecutively, index 0 is never used
+        # so that it can mean "no edges"
+        offsets = {}
+        order = []
+        size = 1
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if id(node) in offsets or not node.children:
+                continue
+            offsets[id(node)] = size
+            order.append(node)
+            size += len(node.children)
+            stack.extend(node.children.values())
+
+        edges = array('I', bytes(4 * size))
+        for node in order:
+            i = offsets[id(node)]
+            for letter, child in node.children.items():
+                edge = ord(letter) - 65
+                edge |= offsets.get(id(child), 0) << CHILD_SHIFT
+                if child.terminal:
+                    edge |= TERMINAL
+                edges[i] = edge
+                i += 1
+            edges[i-1] |= LAST_EDGE
+
+        root_node = offsets.get(id(root), 0) << CHILD_SHIFT
+        return edges, root_node
+
+    @classmethod
+    def from_file(cls, path):
+        # a plain word list, one word per line
+        with open(path, 'r') as f:
+            return cls.from_words(f)
+
+    def save(self, path):
+        edges = array('I', self._edges)
+        if sys.byteorder == 'big':
+            edges.byteswap()
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.root, self._word_count))
+            f.write(edges.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        # the edges are used straight out of the page cache, so loading
+        # costs nothing and processes share one read-only copy
+        with open(path, 'rb') as f:
+            try:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise InvalidLexiconException(path)
+        if len(mapping) < HEADER.size:
+            mapping.close()
+            raise InvalidLexiconException(path)
+        magic, version, root, word_count = HEADER.unpack_from(mapping)
+        if magic != MAGIC or version != VERSION:
+            mapping.close()
+            raise InvalidLexiconException(path)
+
+        if sys.byteorder == 'big':
+            edges = array('I', mapping[HEADER.size:])
+            edges.byteswap()
+            mapping.close()
+            return cls(edges, root, word_count, path)
+        edges = memoryview(mapping)[HEADER.size:].cast('I')
+        return cls(edges, root, word_count, path, mapping)
+
+
+if __name__ == "__main__":
+    # compile a word list: lexicon.py WORDS.txt OUTPUT
+    Lexicon.from_file(sys.argv[1]).save(sys.argv[2])
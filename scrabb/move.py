@@ -0,0 +1,127 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+from .board import ACROSS, DOWN, Board
+from .tile import STANDARD_CODES, code_tile, tile_code
+
+
+class InvalidMoveException(Exception):
+    def __init__(self, tile_positions):
+        super().__init__()
+        self.tile_positions = tile_positions
+        self.message = f"{tile_positions}"
+
+
+class Move:
+    # The tiles of one play, all on one row (ACROSS) or column (DOWN):
+    # the board index (row * SIZE + col) of every square played on, in
+    # order along the line, and the tile code played on each, as bytes.
+    # A Move is the sequence of (row, col, tile) it stands for, so it can
+    # go wherever a tile_positions list can; Game.play_tiles, PlayScorer
+    # and LeaveTable read its fields directly, trusting them to be in
+    # order along one line, so every Move is checked when it's made.
+
+    __slots__ = ('axis', 'squares', 'codes')
+
+    def __init__(self, axis, squares, codes):
+        try:
+            squares = bytes(squares)
+            codes = bytes(codes)
+        except (TypeError, ValueError):
+            raise InvalidMoveException(squares) from None
+        if (axis not in (ACROSS, DOWN) or not squares or
+                len(codes) != len(squares) or 0 in codes or
+                max(codes) >= STANDARD_CODES):
+            raise InvalidMoveException(squares)
+        # the squares must run forwards along one row or column
+        row, col = divmod(squares[0], Board.SIZE)
+        line = row if axis == ACROSS else col
+        previous = -1
+        for index in squares:
+            row, col = divmod(index, Board.SIZE)
+            if (row >= Board.SIZE or index <= previous or
+                    (row if axis == ACROSS else col) != line):
+                raise InvalidMoveException(squares)
+            previous = index
+        self.axis = axis
+        self.squares = squares
+        self.codes = codes
+
+    @classmethod
+    def _unchecked(cls, axis, squares, codes):
+        # for moves already known to be valid, such as MoveGenerator's
+        move = cls.__new__(cls)
+        move.axis = axis
+        move.squares = squares
+        move.codes = codes
+        return move
+
+    @classmethod
+    def from_tile_positions(cls, tile_positions):
+        # a single tile is taken as played ACROSS
+        positions = sorted(tile_positions, key=lambda pos: (pos[0], pos[1]))
+        if not positions:
+            raise InvalidMoveException(tile_positions)
+        if all(pos[0] == positions[0][0] for pos in positions):
+            axis = ACROSS
+        elif all(pos[1] == positions[0][1] for pos in positions):
+            axis = DOWN
+        else:
+            raise InvalidMoveException(tile_positions)
+        return cls(axis, [pos[0] * Board.SIZE + pos[1] for pos in positions],
+                   [tile_code(pos[2]) for pos in positions])
+
+    def __len__(self):
+        return len(self.squares)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(len(self))[i]]
+        row, col = divmod(self.squares[i], Board.SIZE)
+        return row, col, code_tile(self.codes[i])
+
+    def __iter__(self):
+        for index, code in zip(self.squares, self.codes):
+            row, col = divmod(index, Board.SIZE)
+            yield row, col, code_tile(code)
+
+    def __eq__(self, other):
+        # a Move equals the list or tuple of the tile positions it stands
+        # for, and hashes like that tuple. Moves compare by squares and
+        # tiles: the axis follows from the squares, except for a single
+        # tile, which is the same play either way.
+        if isinstance(other, Move):
+            return (self.squares == other.squares and
+                    self.codes == other.codes)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return f"Move({list(self)!r})"
+
+    def __reduce__(self):
+        return (Move, (self.axis, self.squares, self.codes))
+
+    def tiles(self):
+        return [code_tile(code) for code in self.codes]
+
+    def line_bits(self):
+        # the row or column the move is on, and the squares played along
+        # it as a bit mask (bit n is column or row n)
+        placed = 0
+        if self.axis == ACROSS:
+            line = self.squares[0] // Board.SIZE
+            for index in self.squares:
+                placed |= 1 << index % Board.SIZE
+        else:
+            line = self.squares[0] % Board.SIZE
+            for index in self.squares:
+                placed |= 1 << index // Board.SIZE
+        return line, placed
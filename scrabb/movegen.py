@@ -0,0 +1,443 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import heapq
+from itertools import combinations, count
+from .board import ACROSS, ANY_LETTER, DOWN, NO_CROSS_WORD, Board
+from .move import Move
+from .tile import Tile, tile_code
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+RACK_SIZE = 7
+BINGO_BONUS = 50
+
+
+class AnyWord:
+    # Accepts every sequence of letters, which is what the game does
+    # when no lexicon is supplied.
+    # Lexicons are walked through opaque node handles: `root` is the empty
+    # prefix, `child` follows one letter (None if no word continues that
+    # way), `edges` lists every (letter, child) and `is_word` says whether
+    # the prefix leading to a node is itself a word.
+
+    root = 0
+
+    def child(self, node, letter):
+        return 0
+
+    def edges(self, node):
+        return [(letter, 0) for letter in LETTERS]
+
+    def is_word(self, node):
+        return True
+
+    def __contains__(self, word):
+        return True
+
+
+ANY_WORD = AnyWord()
+
+
+class MoveGenerator:
+    # Anchor based move generation (Appel & Jacobson, 1988).
+    # Each row is scanned left to right for the horizontal plays; the
+    # board is transposed so the same code finds the vertical plays.
+    # Anchors and cross-checks are read from the board's caches.
+
+    def __init__(self, game):
+        self.game = game
+        if game.lexicon is not None:
+            self.lexicon = game.lexicon
+        else:
+            self.lexicon = ANY_WORD
+
+    def generate(self, rack, leaves=None):
+        # returns a list of (score, move), best first, where each move is
+        # a Move, ready for Game.play_tiles. With a LeaveTable, best means
+        # the score plus the value of the leave.
+        moves = []
+        for search, anchors, anchor_set in self._searches(rack, moves):
+            for anchor in anchors:
+                search.generate(anchor, anchor_set)
+
+        if leaves is not None:
+            moves.sort(key=lambda move: move[0] + leaves.leave_value(
+                rack, move[1]), reverse=True)
+        else:
+            moves.sort(key=lambda move: move[0], reverse=True)
+        return moves
+
+    def iter_moves(self, rack, leaves=None):
+        # yields the same moves as generate, best first, searching only
+        # as many anchors as the moves taken so far need. Each anchor gets
+        # an upper bound on the score of the plays through it; anchors
+        # are searched highest bound first, and a move is yielded once no
+        # anchor left to search could beat it.
+        moves = []
+        best_leave = 0.0
+        if leaves is not None:
+            best_leave = max((leaves.value(leave)
+                              for leave in _sub_racks(rack, len(rack) - 1)),
+                             default=0.0)
+
+        # heap entries carry a count, so ties never compare further.
+        # Anchors with no plays at all are never searched.
+        order = count()
+        anchors = []
+        for search, line_anchors, anchor_set in self._searches(rack, moves):
+            search.prepare_bounds()
+            for anchor in line_anchors:
+                bound = search.bound(anchor, anchor_set)
+                if bound is not None:
+                    anchors.append((-(bound + best_leave), next(order),
+                                    search, anchor, anchor_set))
+        heapq.heapify(anchors)
+
+        found = []
+        while anchors or found:
+            if found and (not anchors or found[0][0] <= anchors[0][0]):
+                yield heapq.heappop(found)[2]
+                continue
+            _, _, search, anchor, anchor_set = heapq.heappop(anchors)
+            search.generate(anchor, anchor_set)
+            for move in moves:
+                value = move[0]
+                if leaves is not None:
+                    value += leaves.leave_value(rack, move[1])
+                heapq.heappush(found, (-value, next(order), move))
+            moves.clear()
+
+    def _searches(self, rack, moves):
+        # a search for every line with anchors, recording into moves
+        board = self.game.board
+        grid = [[board.tile(row, col) for col in range(Board.SIZE)]
+                for row in range(Board.SIZE)]
+        transposed = [list(line) for line in zip(*grid)]
+
+        rack_counts = {}
+        for tile in rack:
+            rack_counts[tile] = rack_counts.get(tile, 0) + 1
+
+        for vertical, lines in ((False, grid), (True, transposed)):
+            for line in range(Board.SIZE):
+                search = self._line_search(moves, rack_counts, lines, line,
+                                           vertical)
+                if search is not None:
+                    yield search
+
+    def _squares(self, line, vertical):
+        # board indices of the squares along a line
+        if vertical:
+            return [pos * Board.SIZE + line for pos in range(Board.SIZE)]
+        return [line * Board.SIZE + pos for pos in range(Board.SIZE)]
+
+    def _line_search(self, moves, rack, lines, line, vertical):
+        # the search along one line, with its anchors, or None if it has
+        # no anchors
+        board = self.game.board
+        axis = DOWN if vertical else ACROSS
+        if board.is_empty:
+            anchors = [Board.MIDDLE[1]] if line == Board.MIDDLE[0] else []
+        else:
+            anchor_bits = board.anchor_bits(axis, line)
+            anchors = [pos for pos in range(Board.SIZE)
+                       if anchor_bits >> pos & 1]
+        if not anchors:
+            return None
+
+        squares = self._squares(line, vertical)
+        allowed = [board.cross_checks[axis][i] for i in squares]
+        cross_scores = [board.cross_scores[axis][i] for i in squares]
+        letter_mult = [board.letter_multipliers[i] for i in squares]
+        word_mult = [board.word_multipliers[i] for i in squares]
+
+        search = _LineSearch(self.lexicon, moves, rack, lines[line], line,
+                             vertical, squares, allowed, cross_scores,
+                             letter_mult, word_mult)
+        return search, anchors, set(anchors)
+
+
+def _sub_racks(rack, max_size):
+    # every distinct multiset of up to max_size tiles from rack
+    seen = set()
+    for size in range(max_size + 1):
+        for leave in combinations(sorted(rack, key=tile_code), size):
+            if leave not in seen:
+                seen.add(leave)
+                yield leave
+
+
+class _LineSearch:
+
+    def __init__(self, lexicon, moves, rack, cells, line, vertical,
+                 squares, allowed, cross_scores, letter_mult, word_mult):
+        self.lexicon = lexicon
+        self.moves = moves
+        self.rack = rack
+        self.cells = cells
+        self.line = line
+        self.vertical = vertical
+        self.axis = DOWN if vertical else ACROSS
+        self.squares = squares
+        self.allowed = allowed
+        self.cross_scores = cross_scores
+        self.letter_mult = letter_mult
+        self.word_mult = word_mult
+        self.anchor = 0
+
+    def generate(self, anchor, anchor_set):
+        self.anchor = anchor
+        cells = self.cells
+
+        if anchor > 0 and cells[anchor-1] is not None:
+            # the left part is already on the board
+            start = anchor - 1
+            while start > 0 and cells[start-1] is not None:
+                start -= 1
+            node = self.lexicon.root
+            main_score = 0
+            for pos in range(start, anchor):
+                node = self.lexicon.child(node, cells[pos].letter.upper())
+                if node is None:
+                    return
+                main_score += cells[pos].score
+            self.extend_right(anchor, start, node, [], main_score, 1, 0)
+            return
+
+        # the left part is built from the rack, over empty squares that
+        # are not anchors themselves
+        self.left_part(self.lexicon.root, [],
+                       self._left_limit(anchor, anchor_set))
+
+    def _left_limit(self, anchor, anchor_set):
+        limit = 0
+        pos = anchor - 1
+        while (pos >= 0 and pos not in anchor_set and
+               limit < RACK_SIZE - 1):
+            limit += 1
+            pos -= 1
+        return limit
+
+    def prepare_bounds(self):
+        # For bounding plays: for every square and number of tiles j, the
+        # most that covering the next j empty squares from there could
+        # add. Covering more squares never adds less, so a play with k
+        # tiles left to place can add at most the entry for k, or for as
+        # many squares as it can reach. Entries are the score of the
+        # tiles passed over on the board plus the best tiles on the best
+        # letter premiums, the product of the word premiums, and the best
+        # tile that fits on every square forming a cross word. A square
+        # no rack tile fits, given its cross-check, is as far as a play
+        # can reach.
+        cells = self.cells
+        tile_scores = sorted((tile.score for tile, left in self.rack.items()
+                              for _ in range(left)), reverse=True)
+        self._tile_count = len(tile_scores)
+        self._fits = [self._best_fit(pos) if cells[pos] is None else 0
+                      for pos in range(Board.SIZE)]
+        self._bounds = []
+        for pos in range(Board.SIZE + 1):
+            added = [0]
+            multipliers = [1]
+            crosses = [0]
+            letter_mults = []
+            board_score = 0
+            multiplier = 1
+            cross_total = 0
+            square = pos
+            while square < Board.SIZE and len(added) <= len(tile_scores):
+                if cells[square] is not None:
+                    board_score += cells[square].score
+                    square += 1
+                    continue
+                if self._fits[square] is None:
+                    break
+                letter_mults.append(self.letter_mult[square])
+                multiplier *= self.word_mult[square]
+                if self.cross_scores[square] != NO_CROSS_WORD:
+                    cross_total += ((self.cross_scores[square] +
+                                     self._fits[square] *
+                                     self.letter_mult[square]) *
+                                    self.word_mult[square])
+                square += 1
+                # the word runs on over any tiles that follow
+                run_score = 0
+                run = square
+                while run < Board.SIZE and cells[run] is not None:
+                    run_score += cells[run].score
+                    run += 1
+                letter_mults.sort(reverse=True)
+                added.append(board_score + run_score + sum(
+                    score * mult
+                    for score, mult in zip(tile_scores, letter_mults)))
+                multipliers.append(multiplier)
+                crosses.append(cross_total)
+            self._bounds.append((added, multipliers, crosses))
+
+    def _best_fit(self, pos):
+        # the highest scoring rack tile the cross-check at pos allows, or
+        # None if there isn't one
+        allowed = self.allowed[pos]
+        best = None
+        for tile, left in self.rack.items():
+            if not left or (best is not None and tile.score <= best):
+                continue
+            if tile.letter == ' ':
+                fits = allowed != 0
+            else:
+                code = ord(tile.letter) - 65
+                fits = 0 <= code < 26 and allowed >> code & 1
+            if fits:
+                best = tile.score
+        return best
+
+    def _completion(self, pos, main_score):
+        # the most a play could score that starts placing tiles at pos,
+        # with main_score from the tiles before it
+        added, multipliers, crosses = self._bounds[pos]
+        more = min(self._tile_count, len(added) - 1)
+        bound = (main_score + added[more]) * multipliers[more] + crosses[more]
+        if more >= RACK_SIZE:
+            bound += BINGO_BONUS
+        return bound
+
+    def bound(self, anchor, anchor_set):
+        # an upper bound on the score of any play generate would find for
+        # anchor, or None if it can't find any; prepare_bounds must have
+        # been called
+        cells = self.cells
+        if self._fits[anchor] is None:
+            return None
+        if anchor > 0 and cells[anchor-1] is not None:
+            start = anchor - 1
+            main_score = 0
+            node = self.lexicon.root
+            while start > 0 and cells[start-1] is not None:
+                start -= 1
+            for pos in range(start, anchor):
+                node = self.lexicon.child(node, cells[pos].letter.upper())
+                if node is None:
+                    return None
+                main_score += cells[pos].score
+            return self._completion(anchor, main_score)
+        # the left part can't reach past a square no tile fits
+        fits = self._fits
+        longest = 0
+        limit = min(self._left_limit(anchor, anchor_set),
+                    self._tile_count - 1)
+        while longest < limit and fits[anchor - longest - 1] is not None:
+            longest += 1
+        return max(self._completion(anchor - size, 0)
+                   for size in range(longest + 1))
+
+    def left_part(self, node, left, limit):
+        start = self.anchor - len(left)
+        placed = []
+        main_score = 0
+        multiplier = 1
+        for i, tile in enumerate(left):
+            pos = start + i
+            placed.append((pos, tile))
+            main_score += tile.score * self.letter_mult[pos]
+            multiplier *= self.word_mult[pos]
+        self.extend_right(self.anchor, start, node, placed, main_score,
+                          multiplier, 0)
+
+        if limit == 0:
+            return
+        for tile, letter in self._candidates(node, ANY_LETTER):
+            child = self.lexicon.child(node, letter)
+            if child is None:
+                continue
+            self.rack[tile] -= 1
+            left.append(self._played(tile, letter))
+            self.left_part(child, left, limit - 1)
+            left.pop()
+            self.rack[tile] += 1
+
+    def extend_right(self, pos, start, node, placed, main_score, multiplier,
+                     cross_total):
+        cells = self.cells
+        if pos < Board.SIZE and cells[pos] is not None:
+            tile = cells[pos]
+            child = self.lexicon.child(node, tile.letter.upper())
+            if child is not None:
+                self.extend_right(pos + 1, start, child, placed,
+                                  main_score + tile.score, multiplier,
+                                  cross_total)
+            return
+
+        if pos > self.anchor and self.lexicon.is_word(node):
+            self._record(start, pos, placed, main_score, multiplier,
+                         cross_total)
+
+        if pos >= Board.SIZE:
+            return
+        for tile, letter in self._candidates(node, self.allowed[pos]):
+            child = self.lexicon.child(node, letter)
+            if child is None:
+                continue
+            played = self._played(tile, letter)
+            letter_score = played.score * self.letter_mult[pos]
+            cross_score = self.cross_scores[pos]
+            if cross_score != NO_CROSS_WORD:
+                cross_score = (cross_score + letter_score) * \
+                    self.word_mult[pos]
+            else:
+                cross_score = 0
+            self.rack[tile] -= 1
+            placed.append((pos, played))
+            self.extend_right(pos + 1, start, child, placed,
+                              main_score + letter_score,
+                              multiplier * self.word_mult[pos],
+                              cross_total + cross_score)
+            placed.pop()
+            self.rack[tile] += 1
+
+    def _candidates(self, node, allowed):
+        # (rack tile, letter it plays as) pairs worth trying from node
+        candidates = []
+        for tile, left in self.rack.items():
+            if left == 0:
+                continue
+            if tile.letter == ' ':
+                for letter, _ in self.lexicon.edges(node):
+                    if allowed >> (ord(letter) - 65) & 1:
+                        candidates.append((tile, letter))
+            elif allowed == ANY_LETTER:
+                candidates.append((tile, tile.letter))
+            elif 0 <= ord(tile.letter) - 65 < 26 and \
+                    allowed >> (ord(tile.letter) - 65) & 1:
+                candidates.append((tile, tile.letter))
+        return candidates
+
+    @staticmethod
+    def _played(tile, letter):
+        # a blank is played as the lower case letter it stands for
+        if tile.letter == ' ':
+            return Tile(letter.lower(), tile.score)
+        return tile
+
+    def _record(self, start, end, placed, main_score, multiplier,
+                cross_total):
+        if end - start < 2:
+            return
+        if (self.vertical and len(placed) == 1 and
+                self.cross_scores[placed[0][0]] != NO_CROSS_WORD):
+            # single tiles that also form a horizontal word are found when
+            # scanning the rows
+            return
+
+        score = main_score * multiplier + cross_total
+        if len(placed) == RACK_SIZE:
+            score += BINGO_BONUS
+
+        # like Game.get_orientation, single tiles are taken as across
+        axis = self.axis if len(placed) > 1 else ACROSS
+        squares = self.squares
+        self.moves.append((score, Move._unchecked(
+            axis, bytes([squares[pos] for pos, _ in placed]),
+            bytes([tile_code(tile) for _, tile in placed]))))
@@ -5,11 +5,38 @@
 # Contact: chris@cplyon.ca
 
 from dataclasses import dataclass
-from .tile import Tile
+from .tile import code_tile, tile_code
 
 
-@dataclass
+@dataclass(init=False)
 class Player:
     name: str
-    score: int = 0
-    rack: list[Tile] = []
+    score: int
+    # the tiles on the rack, kept as their codes
+    codes: bytearray
+
+    def __init__(self, name, score=0, rack=()):
+        self.name = name
+        self.score = score
+        self.codes = bytearray(tile_code(tile) for tile in rack)
+
+    @property
+    def rack(self):
+        # the tiles on the rack, in order. Change it by setting it, or with
+        # add and take.
+        return tuple(code_tile(code) for code in self.codes)
+
+    @rack.setter
+    def rack(self, tiles):
+        self.codes[:] = bytes(tile_code(tile) for tile in tiles)
+
+    def add(self, tiles):
+        self.codes += bytes(tile_code(tile) for tile in tiles)
+
+    def take(self, tiles):
+        # take tiles off the rack. If any of them isn't on it, ValueError
+        # is raised and the rack is left as it was.
+        codes = bytearray(self.codes)
+        for tile in tiles:
+            codes.remove(tile_code(tile))
+        self.codes[:] = codes
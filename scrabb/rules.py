@@ -0,0 +1,87 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+from enum import Enum, auto
+from .board import ACROSS, DOWN, Board
+from .move import Move
+
+
+class ValidationReason(Enum):
+    FIRST_PLAY_NOT_ON_MIDDLE_CELL = auto()
+    FIRST_PLAY_TOO_FEW_TILES = auto()
+    CELL_ALREADY_FULL = auto()
+    DUPLICATE_CELL = auto()
+    INVALID_ORIENTATION = auto()
+    NOT_ADJACENT = auto()
+    NOT_CONTIGUOUS = auto()
+    INVALID_WORD = auto()
+    TILES_NOT_IN_RACK = auto()
+    VALID = auto()
+
+
+# The placement rules of a play, shared by Game.is_valid_play and
+# PlayScorer so the two can't disagree. Words are checked separately.
+
+def play_axis(tile_positions):
+    # ACROSS if the tiles are all on one row, as a single tile is, DOWN if
+    # they are all in one column, or None
+    if isinstance(tile_positions, Move):
+        return tile_positions.axis
+    row = tile_positions[0][0]
+    col = tile_positions[0][1]
+    if all(pos[0] == row for pos in tile_positions):
+        return ACROSS
+    if all(pos[1] == col for pos in tile_positions):
+        return DOWN
+    return None
+
+
+def play_bits(tile_positions, axis):
+    # the row or column a play along axis is on, and the squares it fills
+    # as a bit mask along it (bit n is column or row n), as (reason,
+    # line, placed). reason is INVALID_ORIENTATION if a tile is off the
+    # line and DUPLICATE_CELL if two tiles share a square.
+    if isinstance(tile_positions, Move) and tile_positions.axis == axis:
+        line, placed = tile_positions.line_bits()
+        return ValidationReason.VALID, line, placed
+
+    across = axis == ACROSS
+    line = tile_positions[0][0 if across else 1]
+    placed = 0
+    for pos in tile_positions:
+        if pos[0 if across else 1] != line:
+            return ValidationReason.INVALID_ORIENTATION, line, placed
+        placed |= 1 << pos[1 if across else 0]
+    if bin(placed).count("1") != len(tile_positions):
+        return ValidationReason.DUPLICATE_CELL, line, placed
+    return ValidationReason.VALID, line, placed
+
+
+def check_placement(axis, line, placed, is_empty, occupied, anchors):
+    # whether the squares placed along a line can be played, given the
+    # full squares of the line and its empty squares next to a tile
+    if is_empty:
+        # the first play covers the middle cell and is at least 2 tiles
+        middle = Board.MIDDLE if axis == ACROSS else Board.MIDDLE[::-1]
+        if line != middle[0] or not placed >> middle[1] & 1:
+            return ValidationReason.FIRST_PLAY_NOT_ON_MIDDLE_CELL
+        if placed & (placed - 1) == 0:
+            return ValidationReason.FIRST_PLAY_TOO_FEW_TILES
+    else:
+        # each cell must be empty, and the play next to at least one
+        # tile already on the board
+        if placed & occupied:
+            return ValidationReason.CELL_ALREADY_FULL
+        if not placed & anchors:
+            return ValidationReason.NOT_ADJACENT
+
+    # all played tiles must be contiguous, with the gaps between them
+    # filled by tiles already on the board
+    first = (placed & -placed).bit_length() - 1
+    span = (1 << placed.bit_length()) - (1 << first)
+    if (placed | occupied) & span != span:
+        return ValidationReason.NOT_CONTIGUOUS
+    return ValidationReason.VALID
@@ -0,0 +1,226 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+from .board import ACROSS, DOWN, NO_CROSS_WORD, Board
+from .move import Move
+from .rules import ValidationReason, check_placement, play_axis, play_bits
+from .tile import code_tile
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+BINGO = 50
+# tiles played in one turn that earn the bingo bonus
+BINGO_TILES = 7
+
+# letter and word multipliers of every square, indexed by row * SIZE + col,
+# for the tiles played on it
+LETTER_MULTIPLIERS = Board.LETTER_MULTIPLIERS
+WORD_MULTIPLIERS = Board.WORD_MULTIPLIERS
+
+
+class PlayScorer:
+    # Validates and scores any number of plays against one position,
+    # giving the same scores as Game.play_tiles without touching the
+    # board. Everything the position says about each square is read
+    # once: tile letters and scores, occupancy and anchors of every row
+    # and column, and the board's cross-checks and cross-scores.
+
+    def __init__(self, board, lexicon=None):
+        self.lexicon = lexicon
+        self.is_empty = board.is_empty
+        self._cross_checks = board.cross_checks
+        self._cross_scores = board.cross_scores
+        tiles = [code_tile(code) for code in board.squares()]
+        self._letters = [tile.letter.upper() if tile is not None else None
+                         for tile in tiles]
+        self._scores = [tile.score if tile is not None else 0
+                        for tile in tiles]
+        self._lines = ([board.line_bits(ACROSS, line)
+                        for line in range(Board.SIZE)],
+                       [board.line_bits(DOWN, line)
+                        for line in range(Board.SIZE)])
+        self._anchors = ([board.anchor_bits(ACROSS, line)
+                          for line in range(Board.SIZE)],
+                         [board.anchor_bits(DOWN, line)
+                          for line in range(Board.SIZE)])
+
+    def score_plays(self, candidates, vectorize=False):
+        # the score of each candidate tile_positions list, or None where
+        # it isn't a valid play. With vectorize and NumPy installed, the
+        # multiplier arithmetic is done for the whole batch at once; that
+        # only pays when checking plays is cheap next to scoring them,
+        # which it isn't with a lexicon.
+        if not vectorize or numpy is None:
+            return [self.score(tile_positions)
+                    for tile_positions in candidates]
+
+        scores = [None] * len(candidates)
+        plays = []
+        for i, tile_positions in enumerate(candidates):
+            play = self._check(tile_positions)
+            if play is not None:
+                plays.append((i, play))
+        if plays:
+            totals = self._vector_scores([play for _, play in plays])
+            for (i, _), total in zip(plays, totals.tolist()):
+                scores[i] = total
+        return scores
+
+    def score(self, tile_positions):
+        # the score of one play, or None if it isn't valid
+        play = self._check(tile_positions)
+        if play is None:
+            return None
+        axis, squares, tiles, existing, has_word = play
+        letter_multipliers = LETTER_MULTIPLIERS
+        word_multipliers = WORD_MULTIPLIERS
+        cross_scores = self._cross_scores[axis]
+
+        word_score = existing
+        word_multiplier = 1
+        cross_total = 0
+        for index, tile in zip(squares, tiles):
+            tile_score = tile.score * letter_multipliers[index]
+            word_score += tile_score
+            word_multiplier *= word_multipliers[index]
+            cross_score = cross_scores[index]
+            if cross_score != NO_CROSS_WORD:
+                cross_total += ((cross_score + tile_score) *
+                                word_multipliers[index])
+
+        score = cross_total
+        if has_word:
+            score += word_score * word_multiplier
+            if len(squares) == BINGO_TILES:
+                score += BINGO
+        return score
+
+    def _check(self, tile_positions):
+        # validate a play, returning its axis, the squares and tiles it
+        # fills in order, the score of the tiles already in its main word
+        # and whether that word is longer than one tile
+        if not tile_positions:
+            return None
+        axis = play_axis(tile_positions)
+        if axis is None:
+            return None
+        reason, line, placed = play_bits(tile_positions, axis)
+        if reason != ValidationReason.VALID:
+            return None
+        occupied = self._lines[axis][line]
+        reason = check_placement(axis, line, placed, self.is_empty,
+                                 occupied, self._anchors[axis][line])
+        if reason != ValidationReason.VALID:
+            return None
+
+        if isinstance(tile_positions, Move):
+            squares = list(tile_positions.squares)
+            tiles = tile_positions.tiles()
+        else:
+            along = 1 if axis == ACROSS else 0
+            positions = sorted(tile_positions, key=lambda pos: pos[along])
+            squares = [pos[0] * Board.SIZE + pos[1] for pos in positions]
+            tiles = [pos[2] for pos in positions]
+
+        first = (placed & -placed).bit_length() - 1
+        last = placed.bit_length() - 1
+        # the main word runs on over any tiles at either end
+        while first > 0 and occupied >> (first - 1) & 1:
+            first -= 1
+        while last < Board.SIZE - 1 and occupied >> (last + 1) & 1:
+            last += 1
+
+        if axis == ACROSS:
+            start = line * Board.SIZE
+            step = 1
+        else:
+            start = line
+            step = Board.SIZE
+
+        existing = 0
+        letters = self._letters
+        scores = self._scores
+        word = []
+        placed_tiles = iter(tiles)
+        for offset in range(first, last + 1):
+            index = start + offset * step
+            if placed >> offset & 1:
+                word.append(next(placed_tiles).letter.upper())
+            else:
+                word.append(letters[index])
+                existing += scores[index]
+
+        if self.lexicon is not None:
+            if len(word) > 1 and "".join(word) not in self.lexicon:
+                return None
+            cross_checks = self._cross_checks[axis]
+            cross_scores = self._cross_scores[axis]
+            for index, tile in zip(squares, tiles):
+                code = ord(tile.letter.upper()) - 65
+                if code < 0 or code >= 26:
+                    if cross_scores[index] != NO_CROSS_WORD:
+                        return None
+                elif not cross_checks[index] >> code & 1:
+                    return None
+        return axis, squares, tiles, existing, len(word) > 1
+
+    def _vector_scores(self, plays):
+        # score checked plays with one set of array operations
+        squares = []
+        tile_scores = []
+        play_ids = []
+        axes = []
+        starts = []
+        existing = []
+        has_word = []
+        sizes = []
+        for i, (axis, play_squares, tiles, play_existing,
+                play_has_word) in enumerate(plays):
+            starts.append(len(squares))
+            squares.extend(play_squares)
+            tile_scores.extend(tile.score for tile in tiles)
+            play_ids.extend([i] * len(play_squares))
+            axes.extend([axis] * len(play_squares))
+            existing.append(play_existing)
+            has_word.append(play_has_word)
+            sizes.append(len(play_squares))
+
+        squares = numpy.array(squares)
+        letter_scores = (numpy.array(tile_scores) *
+                         _numpy_table(LETTER_MULTIPLIERS)[squares])
+        word_multipliers = _numpy_table(WORD_MULTIPLIERS)[squares]
+        cross_scores = numpy.where(
+            numpy.array(axes) == ACROSS,
+            numpy.frombuffer(self._cross_scores[ACROSS], numpy.int16)[squares],
+            numpy.frombuffer(self._cross_scores[DOWN], numpy.int16)[squares])
+        cross = numpy.where(cross_scores != NO_CROSS_WORD,
+                            (cross_scores + letter_scores) * word_multipliers,
+                            0)
+
+        count = len(plays)
+        play_ids = numpy.array(play_ids)
+        words = ((numpy.bincount(play_ids, letter_scores, count) +
+                  numpy.array(existing)) *
+                 numpy.multiply.reduceat(word_multipliers, starts))
+        sizes = numpy.array(sizes)
+        words = numpy.where(numpy.array(has_word),
+                            words + BINGO * (sizes == BINGO_TILES), 0)
+        return (words + numpy.bincount(play_ids, cross, count)).astype(int)
+
+
+_NUMPY_TABLES = {}
+
+
+def _numpy_table(table):
+    # the multiplier tables as arrays, made once
+    array = _NUMPY_TABLES.get(table)
+    if array is None:
+        array = numpy.frombuffer(table, numpy.uint8).astype(numpy.int64)
+        _NUMPY_TABLES[table] = array
+    return array
@@ -4,19 +4,43 @@
 # Author: Chris Lyon
 # Contact: chris@cplyon.ca
 
+import struct
 from enum import Enum, Flag, auto
-from .board import Board
+from .board import ACROSS, DOWN, NO_CROSS_WORD, Board
+from .move import Move
+from .movegen import MoveGenerator
+from .player import Player
+from .rules import ValidationReason, check_placement, play_axis, play_bits
+from .scoring import PlayScorer
+from .stats import CALCULATE_SCORE, FIND_WORDS, GET_ORIENTATION
+from .stats import IS_VALID_PLAY, PLACE_TILES, PlayStats
+from .tile import STANDARD_CODES, rack_tile
 from .tilebag import TileBag
-
-
-class ValidationReason(Enum):
-    FIRST_PLAY_NOT_ON_MIDDLE_CELL = auto()
-    FIRST_PLAY_TOO_FEW_TILES = auto()
-    CELL_ALREADY_FULL = auto()
-    INVALID_ORIENTATION = auto()
-    NOT_ADJACENT = auto()
-    NOT_CONTIGUOUS = auto()
-    VALID = auto()
+from .zobrist import RACK, UNSEEN, codes_hash, side_key
+
+RACK_SIZE = 7
+
+# Game snapshots are little endian and laid out as:
+#   header      magic, version, player count, winner (255 if none), turn
+#   generator   the bag's Mersenne Twister state: version, 625 words,
+#               whether a gauss value is pending and the value
+#   board       one tile code per square; premiums left are the empty
+#               squares' ones
+#   bag         count, then a tile code per tile
+#   players     each as a length prefixed UTF-8 name, score and a count
+#               prefixed rack of tile codes
+# Streams hold one snapshot after another, each prefixed by its length.
+SNAPSHOT_MAGIC = b'SCGM'
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct('<4sBBBI')
+SNAPSHOT_RANDOM = struct.Struct('<B625I?d')
+SNAPSHOT_TILE = struct.Struct('<h')
+SNAPSHOT_PLAYER = struct.Struct('<iB')
+SNAPSHOT_LENGTH = struct.Struct('<I')
+NO_WINNER = 255
+# the most the header's player count and a name's length prefix can hold
+MAX_PLAYERS = 255
+MAX_NAME_BYTES = 2 ** 15 - 1
 
 
 class Orientation(Enum):
@@ -42,43 +66,366 @@ class InvalidPlayException(Exception):
         self.message = f"{positions} {orientation} {valid_reason}"
 
 
+class InvalidSnapshotException(Exception):
+    def __init__(self, reason):
+        super().__init__()
+        self.reason = reason
+        self.message = f"{reason}"
+
+
+class _SnapshotReader:
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, layout):
+        values = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values
+
+    def take(self, length):
+        chunk = bytes(self.data[self.offset:self.offset + length])
+        if len(chunk) != length:
+            raise InvalidSnapshotException("truncated or corrupt")
+        self.offset += length
+        return chunk
+
+    def take_codes(self, length):
+        # tile codes, which are only ever those of the standard tiles
+        chunk = self.take(length)
+        if chunk and max(chunk) >= STANDARD_CODES:
+            raise InvalidSnapshotException("unknown tile")
+        return chunk
+
+    def at_end(self):
+        return self.offset == len(self.data)
+
+
+class Turn(Enum):
+    PLAY = auto()
+    EXCHANGE = auto()
+    PASS = auto()
+
+
 class Game:
 
-    def __init__(self):
-        self.board = Board()
-        self.tile_bag = TileBag()
+    def __init__(self, lexicon=None, seed=None):
+        # without a lexicon, any sequence of letters is a word
+        self.lexicon = lexicon
+        self.board = Board(lexicon)
+        self.tile_bag = TileBag(seed)
         self.players = []
         self.turn = 0
         self.winner = None
+        # what each turn did, so it can be undone
+        self._history = []
+        # phase timings for play_tiles, off unless enabled
+        self.stats = None
+
+    @property
+    def current_player(self):
+        return self.players[self.turn % len(self.players)]
+
+    def add_player(self, name):
+        player = Player(name)
+        player.rack = self.tile_bag.draw_tiles(RACK_SIZE)
+        self.players.append(player)
+        return player
+
+    def position_hash(self):
+        # Zobrist hash of the board, whose turn it is and every rack.
+        # Racks are keyed by seat relative to the player on turn.
+        key = self.board.hash
+        if self.players:
+            seat = self.turn % len(self.players)
+            key ^= side_key(seat)
+            for i, player in enumerate(self.players):
+                key ^= codes_hash(player.codes, RACK,
+                                  (i - seat) % len(self.players))
+        return key
+
+    def unseen_hash(self, player):
+        # Zobrist hash of the tiles a player can't see: the bag and the
+        # other racks
+        unseen = bytearray(self.tile_bag.codes())
+        for other in self.players:
+            if other is not player:
+                unseen += other.codes
+        return codes_hash(unseen, UNSEEN)
+
+    def to_bytes(self):
+        # a compact snapshot of the game, without its undo history
+        board = self.board.squares()
+        bag, random_state = self.tile_bag.state()
+        racks = [bytes(player.codes) for player in self.players]
+        names = [player.name.encode() for player in self.players]
+        if len(self.players) > MAX_PLAYERS:
+            raise InvalidSnapshotException(
+                f"{len(self.players)} players, at most {MAX_PLAYERS} fit")
+        for name in names:
+            if len(name) > MAX_NAME_BYTES:
+                raise InvalidSnapshotException(
+                    f"a name of {len(name)} bytes, at most {MAX_NAME_BYTES}"
+                    " fit")
+
+        winner = NO_WINNER
+        if self.winner is not None:
+            if self.winner not in self.players:
+                raise InvalidSnapshotException("the winner isn't a player")
+            winner = self.players.index(self.winner)
+        version, words, gauss = random_state
+        try:
+            data = [SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                         len(self.players), winner,
+                                         self.turn),
+                    SNAPSHOT_RANDOM.pack(version, *words, gauss is not None,
+                                         gauss or 0.0),
+                    board, SNAPSHOT_TILE.pack(len(bag)), bag]
+            for player, name, rack in zip(self.players, names, racks):
+                data += [SNAPSHOT_TILE.pack(len(name)), name,
+                         SNAPSHOT_PLAYER.pack(player.score, len(rack)), rack]
+        except struct.error:
+            # a turn, score or rack out of the range the snapshot holds
+            raise InvalidSnapshotException(
+                "a turn, score or rack is out of range") from None
+        return b"".join(data)
+
+    @classmethod
+    def from_bytes(cls, data, lexicon=None):
+        try:
+            return cls._from_bytes(memoryview(data), lexicon)
+        except (struct.error, IndexError, UnicodeDecodeError, ValueError):
+            raise InvalidSnapshotException("truncated or corrupt")
+
+    @classmethod
+    def _from_bytes(cls, data, lexicon):
+        reader = _SnapshotReader(data)
+        magic, version, num_players, winner, turn = \
+            reader.unpack(SNAPSHOT_HEADER)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise InvalidSnapshotException("not a game snapshot")
+        random_state = reader.unpack(SNAPSHOT_RANDOM)
+        gauss = random_state[-1] if random_state[-2] else None
+        random_state = (random_state[0], random_state[1:626], gauss)
+
+        game = cls(lexicon)
+        game.board = Board.from_squares(reader.take_codes(Board.SIZE ** 2),
+                                        lexicon)
+        bag_length, = reader.unpack(SNAPSHOT_TILE)
+        game.tile_bag.restore(reader.take_codes(bag_length), random_state)
+        for _ in range(num_players):
+            name_length, = reader.unpack(SNAPSHOT_TILE)
+            name = str(reader.take(name_length), 'utf-8')
+            score, rack_length = reader.unpack(SNAPSHOT_PLAYER)
+            player = Player(name, score)
+            player.codes[:] = reader.take_codes(rack_length)
+            game.players.append(player)
+        if not reader.at_end():
+            raise InvalidSnapshotException("trailing data")
+        game.turn = turn
+        if winner != NO_WINNER:
+            game.winner = game.players[winner]
+        return game
+
+    def write(self, stream):
+        data = self.to_bytes()
+        stream.write(SNAPSHOT_LENGTH.pack(len(data)))
+        stream.write(data)
+
+    @classmethod
+    def read(cls, stream, lexicon=None):
+        # the next game in stream, or None at the end
+        prefix = stream.read(SNAPSHOT_LENGTH.size)
+        if not prefix:
+            return None
+        if len(prefix) != SNAPSHOT_LENGTH.size:
+            raise InvalidSnapshotException("truncated or corrupt")
+        length, = SNAPSHOT_LENGTH.unpack(prefix)
+        return cls.from_bytes(stream.read(length), lexicon)
+
+    def play(self, tile_positions):
+        # play tiles from the current player's rack, score them and
+        # refill the rack
+        player = self.current_player
+        rack = list(player.rack)
+        remaining = list(rack)
+        for pos in tile_positions:
+            tile = rack_tile(pos[2])
+            if tile not in remaining:
+                if self.stats is not None:
+                    self.stats.record({}, ValidationReason.TILES_NOT_IN_RACK)
+                raise InvalidPlayException(tile_positions,
+                                           self.get_orientation(
+                                               tile_positions),
+                                           ValidationReason.TILES_NOT_IN_RACK)
+            remaining.remove(tile)
+
+        score = self.play_tiles(tile_positions)
+        drawn_tiles = self.tile_bag.draw_tiles(len(tile_positions))
+        player.rack = remaining + drawn_tiles
+        player.score += score
+        self._history.append((Turn.PLAY, rack, score, drawn_tiles))
+        self.turn += 1
+        return score
+
+    def exchange(self, tiles):
+        # swap tiles from the current player's rack for new ones
+        player = self.current_player
+        rack = list(player.rack)
+        remaining = list(rack)
+        for tile in tiles:
+            if tile not in remaining:
+                raise InvalidPlayException(tiles, Orientation.NONE,
+                                           ValidationReason.TILES_NOT_IN_RACK)
+            remaining.remove(tile)
+
+        drawn_tiles = self.tile_bag.exchange_tiles(tiles)
+        player.rack = remaining + drawn_tiles
+        self._history.append((Turn.EXCHANGE, rack, list(tiles), drawn_tiles))
+        self.turn += 1
+        return drawn_tiles
+
+    def pass_turn(self):
+        self._history.append((Turn.PASS,))
+        self.turn += 1
+
+    def finish(self):
+        # end of game scoring: everyone loses the value of their rack, and
+        # a player who went out gains the value of all the others. Returns
+        # the winner, or None for a tie.
+        left = [sum(tile.score for tile in player.rack)
+                for player in self.players]
+        for player, value in zip(self.players, left):
+            player.score -= value
+            if not player.rack:
+                player.score += sum(left)
+
+        best = max(player.score for player in self.players)
+        leaders = [player for player in self.players if player.score == best]
+        self.winner = leaders[0] if len(leaders) == 1 else None
+        return self.winner
+
+    def undo(self):
+        # take back the last turn: the board, the player's score and rack
+        # and the bag go back to how they were, in O(tiles moved)
+        entry = self._history.pop()
+        self.turn -= 1
+        if entry[0] == Turn.PASS:
+            return
+
+        player = self.current_player
+        if entry[0] == Turn.PLAY:
+            _, rack, score, drawn_tiles = entry
+            self.board.undo()
+            player.score -= score
+        else:
+            _, rack, exchanged, drawn_tiles = entry
+            self.tile_bag.remove_tiles(exchanged)
+        self.tile_bag.return_tiles(drawn_tiles)
+        player.rack = rack
+
+    def enable_stats(self, hook=None):
+        # start timing play_tiles; see PlayStats
+        self.stats = PlayStats(hook)
+        return self.stats
+
+    def disable_stats(self):
+        self.stats = None
 
     def play_tiles(self, tile_positions):
+        if self.stats is not None:
+            return self._play_tiles_timed(tile_positions)
+        orientation = self._orient_play(tile_positions)
+        self._validate_play(tile_positions, orientation)
+        word, axis = self._check_words(tile_positions, orientation)
+        score = self._score_play(tile_positions, word, axis)
+        self.board.place_tiles(tile_positions)
+        return score
 
+    def _play_tiles_timed(self, tile_positions):
+        # play_tiles, timing each phase
+        stats = self.stats
+        timings = {}
+        try:
+            orientation = stats.time(timings, GET_ORIENTATION,
+                                     self._orient_play, tile_positions)
+            stats.time(timings, IS_VALID_PLAY, self._validate_play,
+                       tile_positions, orientation)
+            word, axis = stats.time(timings, FIND_WORDS, self._check_words,
+                                    tile_positions, orientation)
+            score = stats.time(timings, CALCULATE_SCORE, self._score_play,
+                               tile_positions, word, axis)
+            stats.time(timings, PLACE_TILES, self.board.place_tiles,
+                       tile_positions)
+        except InvalidPlayException as e:
+            stats.record(timings, e.valid_reason)
+            raise
+        stats.record(timings)
+        return score
+
+    def _orient_play(self, tile_positions):
         # determine orientation
         orientation = self.get_orientation(tile_positions)
+        if isinstance(tile_positions, Move):
+            # already in order along its line
+            return orientation
 
         # sort tiles based on orientation
         if orientation == Orientation.HORIZONTAL:
             tile_positions.sort(key=lambda x: x[1])
         else:
             tile_positions.sort(key=lambda x: x[0])
+        return orientation
 
+    def _validate_play(self, tile_positions, orientation):
         # reject play if not valid
         valid_reason = self.is_valid_play(tile_positions, orientation)
         if valid_reason != ValidationReason.VALID:
             raise InvalidPlayException(tile_positions, orientation,
                                        valid_reason)
 
-        # find all words
-        words = self.find_words(orientation, tile_positions)
-
+    def _check_words(self, tile_positions, orientation):
+        # find the primary word. Perpendicular words are checked and scored
+        # from the board's cross-checks rather than walking the board.
+        word = self.find_primary_word(orientation, tile_positions)
+        axis = ACROSS if orientation == Orientation.HORIZONTAL else DOWN
+
+        # reject play if any word isn't in the lexicon
+        if self.lexicon is not None:
+            if len(word) > 1 and self.word_string(word) not in self.lexicon:
+                raise InvalidPlayException(tile_positions, orientation,
+                                           ValidationReason.INVALID_WORD)
+            if not all(self.board.allows(axis, pos[0], pos[1],
+                                         pos[2].letter)
+                       for pos in tile_positions):
+                raise InvalidPlayException(tile_positions, orientation,
+                                           ValidationReason.INVALID_WORD)
+        return word, axis
+
+    def _score_play(self, tile_positions, word, axis):
         # calculate score
-        score = sum(self.calculate_score(word) for word in words)
-
-        # place the tiles on the board
-        self.board.place_tiles(tile_positions)
-
+        score = sum(self.calculate_cross_score(axis, pos)
+                    for pos in tile_positions)
+        if len(word) > 1:
+            score += self.calculate_score(word)
         return score
 
+    def score_plays(self, candidates, vectorize=False):
+        # validate and score many plays against the current board at
+        # once, without playing them: a score per candidate, or None
+        # where play_tiles would reject it. See PlayScorer.
+        return PlayScorer(self.board, self.lexicon).score_plays(
+            candidates, vectorize)
+
+    def iter_moves(self, rack=None, leaves=None):
+        # legal plays for rack, by default the current player's, best
+        # first and generated only as they are asked for, so taking the
+        # first few is cheap. See MoveGenerator.iter_moves.
+        if rack is None:
+            rack = self.current_player.rack
+        return MoveGenerator(self).iter_moves(list(rack), leaves)
+
     def get_contiguous_cells(self, cell, direction):
         new_word = []
         row = cell[0]
@@ -97,43 +444,55 @@ class Game:
             if row < 0 or row >= Board.SIZE or col < 0 or col >= Board.SIZE:
                 break
 
-            if self.board[row][col] is None:
+            tile = self.board.tile(row, col)
+            if tile is None:
                 break
 
-            if direction in [AdjacentDirection.LEFT, AdjacentDirection.ABOVE]:
-                new_word.insert(0, (row, col, self.board[row][col]))
-            else:
-                new_word.append((row, col, self.board[row][col]))
+            new_word.append((row, col, tile))
 
+        # cells found walking backwards are put back in reading order
+        if direction in (AdjacentDirection.LEFT, AdjacentDirection.ABOVE):
+            new_word.reverse()
         return new_word
 
     def extend_word(self, orientation, tile_position):
-        adjacency = self.is_adjacent(tile_position)
         cells_front = []
         cells_end = []
 
         if orientation == Orientation.HORIZONTAL:
-            if adjacency | AdjacentDirection.LEFT:
-                cells_front = self.get_contiguous_cells(
-                    tile_position,
-                    AdjacentDirection.LEFT)
-            if adjacency | AdjacentDirection.RIGHT:
-                cells_end = self.get_contiguous_cells(
-                    tile_position,
-                    AdjacentDirection.RIGHT)
+            cells_front = self.get_contiguous_cells(
+                tile_position,
+                AdjacentDirection.LEFT)
+            cells_end = self.get_contiguous_cells(
+                tile_position,
+                AdjacentDirection.RIGHT)
 
         elif orientation == Orientation.VERTICAL:
-            if adjacency | AdjacentDirection.ABOVE:
-                cells_front = self.get_contiguous_cells(
-                    tile_position,
-                    AdjacentDirection.ABOVE)
-            if adjacency | AdjacentDirection.BELOW:
-                cells_end = self.get_contiguous_cells(
-                    tile_position,
-                    AdjacentDirection.BELOW)
+            cells_front = self.get_contiguous_cells(
+                tile_position,
+                AdjacentDirection.ABOVE)
+            cells_end = self.get_contiguous_cells(
+                tile_position,
+                AdjacentDirection.BELOW)
 
         return cells_front + [tile_position] + cells_end
 
+    def find_primary_word(self, orientation, tile_positions):
+        # assumes tile_positions are sorted based on orientation
+        if orientation == Orientation.HORIZONTAL:
+            front, end = AdjacentDirection.LEFT, AdjacentDirection.RIGHT
+        else:
+            front, end = AdjacentDirection.ABOVE, AdjacentDirection.BELOW
+
+        # extend front and end as needed. Tiles already on the board
+        # between the played tiles are picked up by extending each played
+        # tile towards the end.
+        primary_word = self.get_contiguous_cells(tile_positions[0], front)
+        for pos in tile_positions:
+            primary_word.append(pos)
+            primary_word += self.get_contiguous_cells(pos, end)
+        return primary_word
+
     def find_words(self, orientation, tile_positions):
         # assumes tile_positions are sorted based on orientation
 
@@ -143,11 +502,11 @@ class Game:
         else:
             perpendicular_orientation = Orientation.HORIZONTAL
 
-        # first, add the primary word, extending front and end as needed
-        front = self.extend_word(orientation, tile_positions[0])
-        end = self.extend_word(orientation, tile_positions[-1])
-        primary_word = front[0:-1] + tile_positions + end[1:]
-        words.append(primary_word)
+        # first, add the primary word
+        primary_word = self.find_primary_word(orientation, tile_positions)
+        # a single tile may only form a perpendicular word
+        if len(primary_word) > 1:
+            words.append(primary_word)
 
         # next, look for perpendicular words for all tiles
         for pos in tile_positions:
@@ -158,61 +517,74 @@ class Game:
 
         return words
 
+    @staticmethod
+    def word_string(tile_positions):
+        # blanks are played as lower case letters
+        return "".join(pos[2].letter for pos in tile_positions).upper()
+
     def calculate_score(self, tile_positions):
+        # premiums are read from the board's multiplier tables, where
+        # squares that hold a tile have none left
+        letter_multipliers = self.board.letter_multipliers
+        word_multipliers = self.board.word_multipliers
+        row_bits = self.board.row_bits
         word_multiplier = 1
 
         # calculate tile scores
         current_score = 0
+        new_tiles = 0
         for pos in tile_positions:
-            # calculate word bonuses
-            if (pos[0], pos[1]) in self.board.double_word_cells:
-                word_multiplier *= 2
-            elif (pos[0], pos[1]) in self.board.triple_word_cells:
-                word_multiplier *= 3
-            # calculate letter bonuses
-            if (pos[0], pos[1]) in self.board.double_letter_cells:
-                current_score += (pos[2].score * 2)
-            elif (pos[0], pos[1]) in self.board.triple_letter_cells:
-                current_score += (pos[2].score * 3)
-            else:
-                current_score += pos[2].score
+            row = pos[0]
+            col = pos[1]
+            if not row_bits[row] >> col & 1:
+                new_tiles += 1
+            index = row * Board.SIZE + col
+            current_score += pos[2].score * letter_multipliers[index]
+            word_multiplier *= word_multipliers[index]
         score = current_score * word_multiplier
 
-        # bingo bonus
-        if len(tile_positions) == 7:
+        # bingo bonus, for playing all 7 tiles
+        if new_tiles == 7:
             score += 50
         return score
 
+    def calculate_cross_score(self, axis, tile_position):
+        # score of the perpendicular word formed by a tile about to be
+        # played, using the board's cached score of the tiles already in it
+        index = tile_position[0] * Board.SIZE + tile_position[1]
+        cross_score = self.board.cross_scores[axis][index]
+        if cross_score == NO_CROSS_WORD:
+            return 0
+        return ((cross_score + tile_position[2].score *
+                 self.board.letter_multipliers[index]) *
+                self.board.word_multipliers[index])
+
     def get_orientation(self, positions):
         # Determine word orientation, or NONE if we can't.
         # Treat single tile plays as Horizontal
-        row = positions[0][0]
-        col = positions[0][1]
-        orientation = Orientation.NONE
-
-        if all(p[0] == row for p in positions):
-            orientation = Orientation.HORIZONTAL
-        elif all(p[1] == col for p in positions):
-            orientation = Orientation.VERTICAL
-
-        return orientation
+        axis = play_axis(positions)
+        if axis is None:
+            return Orientation.NONE
+        if axis == ACROSS:
+            return Orientation.HORIZONTAL
+        return Orientation.VERTICAL
 
     def is_adjacent(self, position):
         row = position[0]
         col = position[1]
+        row_bits = self.board.row_bits
         adjacent_direction = AdjacentDirection.NONE
 
         # check above, if not at top row
-        if row > 0 and self.board[row-1][col] is not None:
+        if row > 0 and row_bits[row-1] >> col & 1:
             adjacent_direction |= AdjacentDirection.ABOVE
         # check below, if not at bottom row
-        if row < Board.SIZE-1 and self.board[row+1][col] is not None:
+        if row < Board.SIZE-1 and row_bits[row+1] >> col & 1:
             adjacent_direction |= AdjacentDirection.BELOW
-        # check left, if not at left column
-        if col > 0 and self.board[row][col-1] is not None:
+        # check left and right; shifting past either edge finds nothing
+        if (row_bits[row] << 1) >> col & 1:
             adjacent_direction |= AdjacentDirection.LEFT
-        # check right, if not at right column
-        if col < Board.SIZE-1 and self.board[row][col+1] is not None:
+        if row_bits[row] >> (col + 1) & 1:
             adjacent_direction |= AdjacentDirection.RIGHT
 
         return adjacent_direction
@@ -222,45 +594,15 @@ class Game:
         if orientation == Orientation.NONE:
             return ValidationReason.INVALID_ORIENTATION
 
-        # get just the tile positions, since we don't need the actual tile
-        # to determine if the play is valid
-        positions = [(pos[0], pos[1]) for pos in tile_positions]
-
-        # check that first play is on middle cell and
-        # is at least 2 tiles
-        if self.board.is_empty:
-            if Board.MIDDLE not in positions:
-                return ValidationReason.FIRST_PLAY_NOT_ON_MIDDLE_CELL
-            if len(positions) < 2:
-                return ValidationReason.FIRST_PLAY_TOO_FEW_TILES
-        else:
-            # check each cell isn't already full
-            if any(self.board[pos[0]][pos[1]] is not None
-                   for pos in positions):
-                return ValidationReason.CELL_ALREADY_FULL
-
-            # check that play is adjacent to at least one tile
-            # already on the board
-            if all(self.is_adjacent(pos) == AdjacentDirection.NONE
-                   for pos in positions):
-                return ValidationReason.NOT_ADJACENT
-
-        # check that all played tiles are contiguous
-        if orientation == Orientation.HORIZONTAL:
-            row = positions[0][0]
-            if any((row, i) not in positions and self.board[row][i] is None
-                   for i in range(positions[0][1],
-                                  max(positions, key=lambda x: x[1])[1]+1)):
-                return ValidationReason.NOT_CONTIGUOUS
-        elif orientation == Orientation.VERTICAL:
-            col = positions[0][1]
-            if any((i, col) not in positions and self.board[i][col] is None
-                   for i in range(positions[0][0],
-                                  max(positions, key=lambda x: x[0])[0]+1)):
-                return ValidationReason.NOT_CONTIGUOUS
-
-        # this is a valid play!
-        return ValidationReason.VALID
+        # the play as a bit mask along its row or column, since we don't
+        # need the actual tile to determine if the play is valid
+        axis = ACROSS if orientation == Orientation.HORIZONTAL else DOWN
+        reason, line, placed = play_bits(tile_positions, axis)
+        if reason != ValidationReason.VALID:
+            return reason
+        return check_placement(axis, line, placed, self.board.is_empty,
+                               self.board.line_bits(axis, line),
+                               self.board.anchor_bits(axis, line))
 
 
 if __name__ == "__main__":
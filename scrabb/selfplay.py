@@ -0,0 +1,309 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import argparse
+import json
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from .exchange import evaluate_exchanges
+from .leaves import LeaveTable, heuristic_value
+from .lexicon import Lexicon
+from .scrabb import RACK_SIZE, Game, Turn
+
+# games are handed to workers in fixed size chunks, and each game is
+# seeded by its number, so results don't depend on how many workers
+# there are
+CHUNK_SIZE = 10
+# the game ends after this many turns in a row without a score
+SCORELESS_TURNS = 6
+# latencies are counted in buckets 10% apart, from a microsecond up
+MIN_LATENCY = 1e-6
+GROWTH = 1.1
+PERCENTILES = (50, 90, 99)
+# the phases of every turn; plays also time those of Game.play_tiles
+CHOOSE = "choose"
+APPLY = "apply"
+# the largest leave table the equity bot builds for itself; a full table
+# takes seconds to build, so longer leaves are valued by the heuristic
+# directly rather than counted as worth nothing
+DEFAULT_LEAVE = 3
+
+
+# A bot is a function of the game, with the current player on turn, and
+# a LeaveTable. It returns (Turn.PLAY, tile_positions),
+# (Turn.EXCHANGE, tiles) or (Turn.PASS, None).
+def greedy(game, leaves):
+    # the highest scoring play, or failing that a new rack
+    best = next(game.iter_moves(), None)
+    if best is not None:
+        return Turn.PLAY, best[1]
+    return _exchange_all(game)
+
+
+def equity(game, leaves):
+    # the play or exchange with the best score plus leave value
+    rack = game.current_player.rack
+    best = next(game.iter_moves(leaves=leaves), None)
+    if len(game.tile_bag) >= RACK_SIZE:
+        exchange = evaluate_exchanges(game, leaves, top=1)[0]
+        if best is None or exchange.equity > (
+                best[0] + leaves.leave_value(rack, best[1])):
+            return Turn.EXCHANGE, exchange.tiles
+    if best is not None:
+        return Turn.PLAY, best[1]
+    return Turn.PASS, None
+
+
+def _exchange_all(game):
+    if len(game.tile_bag) >= RACK_SIZE:
+        return Turn.EXCHANGE, list(game.current_player.rack)
+    return Turn.PASS, None
+
+
+BOTS = {"greedy": greedy, "equity": equity}
+
+
+class Latencies:
+    # How long each phase took, as counts in buckets growing by GROWTH,
+    # so any number of games can be merged in fixed memory. Percentiles
+    # are the top of the bucket they fall in.
+
+    def __init__(self):
+        self.buckets = {}
+
+    def add(self, phase, seconds):
+        bucket = 0
+        if seconds > MIN_LATENCY:
+            bucket = math.ceil(math.log(seconds / MIN_LATENCY, GROWTH))
+        counts = self.buckets.setdefault(phase, {})
+        counts[bucket] = counts.get(bucket, 0) + 1
+
+    def merge(self, other):
+        for phase, counts in other.buckets.items():
+            mine = self.buckets.setdefault(phase, {})
+            for bucket, count in counts.items():
+                mine[bucket] = mine.get(bucket, 0) + count
+
+    def count(self, phase):
+        return sum(self.buckets.get(phase, {}).values())
+
+    def percentile(self, phase, percent):
+        counts = self.buckets.get(phase)
+        if not counts:
+            return None
+        rank = math.ceil(percent / 100 * sum(counts.values()))
+        seen = 0
+        for bucket in sorted(counts):
+            seen += counts[bucket]
+            if seen >= max(rank, 1):
+                return MIN_LATENCY * GROWTH ** bucket
+
+    def summary(self):
+        # {phase: {"count": n, "p50": seconds, ...}}, ready for JSON
+        return {phase: dict({"count": self.count(phase)},
+                            **{f"p{percent}": self.percentile(phase, percent)
+                               for percent in PERCENTILES})
+                for phase in sorted(self.buckets)}
+
+
+@dataclass
+class SelfPlayResult:
+    games: int = 0
+    # turns taken, whether plays, exchanges or passes
+    moves: int = 0
+    seconds: float = 0.0
+    # games won by each bot, in the order they were given, and tied
+    wins: list = field(default_factory=list)
+    ties: int = 0
+    latencies: Latencies = field(default_factory=Latencies)
+
+    @property
+    def games_per_second(self):
+        return self.games / self.seconds if self.seconds else 0.0
+
+    @property
+    def moves_per_second(self):
+        return self.moves / self.seconds if self.seconds else 0.0
+
+
+def play_game(bots, seed=None, lexicon=None, leaves=None, latencies=None):
+    # Plays one game to the end between bots, one player each, in seat
+    # order. Returns a record of it, with every turn's phases timed into
+    # latencies if given.
+    if leaves is None:
+        leaves = _default_leaves()
+    game = Game(lexicon, seed)
+    for seat in range(len(bots)):
+        game.add_player(f"player{seat + 1}")
+    if latencies is not None:
+        def record(timings, reason):
+            for phase, seconds in timings.items():
+                latencies.add(phase, seconds)
+        game.enable_stats(record)
+
+    began = time.perf_counter()
+    counts = dict.fromkeys(Turn, 0)
+    scoreless = 0
+    while scoreless < SCORELESS_TURNS:
+        player = game.current_player
+        start = time.perf_counter()
+        turn, payload = bots[game.turn % len(bots)](game, leaves)
+        chosen = time.perf_counter()
+
+        score = 0
+        if turn == Turn.PLAY:
+            score = game.play(list(payload))
+        elif turn == Turn.EXCHANGE:
+            game.exchange(payload)
+        else:
+            game.pass_turn()
+        if latencies is not None:
+            latencies.add(CHOOSE, chosen - start)
+            latencies.add(APPLY, time.perf_counter() - chosen)
+        counts[turn] += 1
+        scoreless = scoreless + 1 if score == 0 else 0
+        if not player.rack and not len(game.tile_bag):
+            break
+
+    winner = game.finish()
+    return {
+        "seed": seed,
+        "scores": [player.score for player in game.players],
+        "winner": (game.players.index(winner) if winner is not None
+                   else None),
+        "turns": game.turn,
+        "plays": counts[Turn.PLAY],
+        "exchanges": counts[Turn.EXCHANGE],
+        "passes": counts[Turn.PASS],
+        "seconds": time.perf_counter() - began,
+    }
+
+
+def run_games(num_games, bots, lexicon=None, leaves=None, workers=None,
+              seed=0, output=None):
+    # Plays num_games games between bots, given as functions or names
+    # from BOTS, in worker processes. Seats rotate from game to game.
+    # Each game's record is written to output as a line of JSON, in game
+    # order, as soon as its chunk is done. With workers == 0 everything
+    # runs in this process.
+    names = [bot if isinstance(bot, str) else bot.__name__ for bot in bots]
+    bots = [BOTS[bot] if isinstance(bot, str) else bot for bot in bots]
+    chunks = [(first, min(CHUNK_SIZE, num_games - first))
+              for first in range(0, num_games, CHUNK_SIZE)]
+    tasks = [(bots, first, size, seed) for first, size in chunks]
+
+    result = SelfPlayResult(wins=[0] * len(bots))
+    began = time.perf_counter()
+    if workers == 0:
+        _init_worker(lexicon, leaves)
+        _collect(result, names, map(_play_chunk, *zip(*tasks)), output)
+    else:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(lexicon, leaves)) as executor:
+            _collect(result, names,
+                     executor.map(_play_chunk, *zip(*tasks)), output)
+    result.seconds = time.perf_counter() - began
+    return result
+
+
+def _collect(result, names, chunks, output):
+    for records, latencies in chunks:
+        result.latencies.merge(latencies)
+        for record in records:
+            result.games += 1
+            result.moves += record["turns"]
+            seats = record["bots"]
+            if record["winner"] is None:
+                result.ties += 1
+            else:
+                result.wins[seats[record["winner"]]] += 1
+            if output is not None:
+                output.write(json.dumps(dict(
+                    record, bots=[names[bot] for bot in seats])) + "\n")
+
+
+# what every game in a worker shares, set once per process
+_worker_lexicon = None
+_worker_leaves = None
+
+
+def _init_worker(lexicon, leaves):
+    global _worker_lexicon, _worker_leaves
+    _worker_lexicon = lexicon
+    _worker_leaves = leaves
+
+
+def _default_leaves():
+    global _worker_leaves
+    if _worker_leaves is None:
+        _worker_leaves = LeaveTable.default(DEFAULT_LEAVE, heuristic_value)
+    return _worker_leaves
+
+
+def _play_chunk(bots, first, count, seed):
+    # returns the records of games first to first + count, with the bots
+    # each played by, and their latencies
+    latencies = Latencies()
+    records = []
+    for number in range(first, first + count):
+        seats = [(number + seat) % len(bots) for seat in range(len(bots))]
+        record = play_game([bots[seat] for seat in seats],
+                           f"{seed}:{number}", _worker_lexicon,
+                           _worker_leaves, latencies)
+        record["game"] = number
+        record["bots"] = seats
+        records.append(record)
+    return records, latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="play games between bots and report throughput")
+    parser.add_argument("games", type=int)
+    parser.add_argument("--bots", nargs="+", default=["greedy", "greedy"],
+                        choices=sorted(BOTS))
+    parser.add_argument("--lexicon", required=True,
+                        help="compiled lexicon file")
+    parser.add_argument("--leaves", help="leave table file")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes, 0 to play them here")
+    parser.add_argument("--seed", default="0")
+    parser.add_argument("--output", help="JSONL file for game records")
+    args = parser.parse_args(argv)
+
+    lexicon = Lexicon.load(args.lexicon)
+    leaves = None
+    if args.leaves:
+        # as with the default table, leaves longer than the file holds
+        # are valued by the heuristic
+        leaves = LeaveTable.load(args.leaves, heuristic_value)
+    output = open(args.output, "w") if args.output else None
+    try:
+        result = run_games(args.games, args.bots, lexicon, leaves,
+                           args.workers, args.seed, output)
+    finally:
+        if output is not None:
+            output.close()
+
+    print(f"{result.games} games, {result.moves} moves in "
+          f"{result.seconds:.1f}s ({result.games_per_second:.2f} games/s, "
+          f"{result.moves_per_second:.1f} moves/s)")
+    print("wins: " + ", ".join(f"{name} {wins}" for name, wins in
+                               zip(args.bots, result.wins)) +
+          f", ties {result.ties}")
+    for phase, summary in result.latencies.summary().items():
+        print(f"{phase:>16} {summary['count']:>8} " + " ".join(
+            f"p{percent} {summary[f'p{percent}'] * 1000:.3f}ms"
+            for percent in PERCENTILES))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
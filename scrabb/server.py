@@ -0,0 +1,300 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+from .board import Board
+from .lexicon import Lexicon
+from .movegen import MoveGenerator
+from .scrabb import Game, InvalidPlayException
+from .tile import code_tile, letter_tile
+from .tilebag import NotEnoughTilesException
+
+# Every request and response is one JSON object per line. Requests name a
+# command and, apart from "new", a game:
+#   {"cmd": "new", "players": ["ann", "bob"], "seed": 1}
+#   {"cmd": "state", "game": 1}
+#   {"cmd": "play", "game": 1, "tiles": [[7, 7, "C"], [7, 8, "a"]]}
+#   {"cmd": "exchange", "game": 1, "tiles": ["Q", " "]}
+#   {"cmd": "pass", "game": 1}
+#   {"cmd": "undo", "game": 1}
+#   {"cmd": "hint", "game": 1, "count": 5}
+#   {"cmd": "end", "game": 1}
+# Tiles are given by letter: a lower case letter is a blank played as that
+# letter, and " " is an unplayed blank. Responses have "ok" and either the
+# result or an "error", and echo the request's "id" if it had one.
+
+
+class ServerError(Exception):
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+        self.message = f"{error}"
+
+
+def tile_from_letter(letter):
+    if not isinstance(letter, str):
+        raise ServerError(f"bad tile {letter!r}")
+    tile = letter_tile(letter)
+    if tile is None:
+        raise ServerError(f"bad tile {letter!r}")
+    return tile
+
+
+def board_rows(board):
+    return ["".join(tile.letter if tile is not None else '.' for tile in
+                    board[row]) for row in range(Board.SIZE)]
+
+
+# the lexicon of a worker process, set once when it starts, so hints only
+# send the board's squares and the rack's codes
+_worker_lexicon = None
+
+
+def _init_worker(lexicon):
+    global _worker_lexicon
+    _worker_lexicon = lexicon
+
+
+def _hints(squares, rack, count, lexicon):
+    # the best scoring moves for a rack of tile codes
+    game = Game(lexicon)
+    game.board = Board.from_squares(squares, lexicon)
+    moves = MoveGenerator(game).generate(
+        [code_tile(code) for code in rack])[:count]
+    return [{"score": score,
+             "tiles": [[pos[0], pos[1], pos[2].letter]
+                       for pos in tile_positions]}
+            for score, tile_positions in moves]
+
+
+def _worker_hints(squares, rack, count):
+    # runs in a worker process, with the lexicon it was started with
+    return _hints(squares, rack, count, _worker_lexicon)
+
+
+async def _skip_line(reader):
+    # drop the rest of a line longer than the reader will hold, up to and
+    # including its newline
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+class GameServer:
+    # Hosts any number of games. Commands that only touch a game are
+    # handled straight away on the event loop; move generation goes to a
+    # pool of worker processes, so a slow hint never holds up other
+    # connections. With workers == 0 hints run on a thread instead.
+
+    def __init__(self, lexicon=None, workers=None):
+        self.lexicon = lexicon
+        self.games = {}
+        self._next_game = 1
+        self._workers = workers
+        self._executor = None
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=0):
+        if self._workers != 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers, initializer=_init_worker,
+                initargs=(self.lexicon,))
+        self._server = await asyncio.start_server(self.handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    # a last line without a newline, or nothing at the end
+                    line = e.partial
+                    if not line:
+                        break
+                except asyncio.LimitOverrunError:
+                    line = None
+                    await _skip_line(reader)
+                if line is None:
+                    response = {"ok": False, "error": "request too long"}
+                else:
+                    response = await self.respond(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, line):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"ok": False, "error": "bad json"}
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "request must be an object"}
+
+        try:
+            if request.get("cmd") == "hint":
+                response = await self.hint(request)
+            else:
+                response = self.dispatch(request)
+            response["ok"] = True
+        except ServerError as e:
+            response = {"ok": False, "error": e.error}
+        except InvalidPlayException as e:
+            response = {"ok": False, "error": e.valid_reason.name}
+        except NotEnoughTilesException:
+            response = {"ok": False, "error": "not enough tiles"}
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def dispatch(self, request):
+        cmd = request.get("cmd")
+        if cmd == "new":
+            return self.new_game(request.get("players"), request.get("seed"))
+        game_id, game = self._game(request)
+
+        if cmd == "state":
+            pass
+        elif cmd == "play":
+            try:
+                tile_positions = [(row, col, tile_from_letter(letter))
+                                  for row, col, letter in
+                                  self._tiles(request)]
+            except (TypeError, ValueError):
+                raise ServerError("tiles must be [row, col, letter]")
+            if not tile_positions or not all(
+                    isinstance(pos[0], int) and isinstance(pos[1], int) and
+                    0 <= pos[0] < Board.SIZE and 0 <= pos[1] < Board.SIZE
+                    for pos in tile_positions):
+                raise ServerError("tiles must be on the board")
+            score = game.play(tile_positions)
+            return dict(self.state(game_id), score=score)
+        elif cmd == "exchange":
+            tiles = [tile_from_letter(letter)
+                     for letter in self._tiles(request)]
+            if not tiles:
+                # exchanging nothing is a pass
+                raise ServerError("no tiles to exchange")
+            game.exchange(tiles)
+        elif cmd == "pass":
+            game.pass_turn()
+        elif cmd == "undo":
+            try:
+                game.undo()
+            except IndexError:
+                raise ServerError("nothing to undo")
+        elif cmd == "end":
+            del self.games[game_id]
+            return {"game": game_id}
+        else:
+            raise ServerError(f"unknown command {cmd}")
+        return self.state(game_id)
+
+    def new_game(self, names, seed=None):
+        if not names:
+            raise ServerError("no players")
+        if not isinstance(names, list) or not all(
+                isinstance(name, str) for name in names):
+            raise ServerError("players must be a list of names")
+        if seed is not None and not isinstance(seed, (int, str)):
+            raise ServerError("seed must be a number or a string")
+        game = Game(self.lexicon, seed)
+        for name in names:
+            game.add_player(name)
+        game_id = self._next_game
+        self._next_game += 1
+        self.games[game_id] = game
+        return self.state(game_id)
+
+    def state(self, game_id):
+        game = self.games[game_id]
+        return {
+            "game": game_id,
+            "turn": game.turn,
+            "player": game.current_player.name,
+            "rack": [tile.letter for tile in game.current_player.rack],
+            "players": [player.name for player in game.players],
+            "scores": [player.score for player in game.players],
+            "bag": len(game.tile_bag),
+            "board": board_rows(game.board),
+        }
+
+    async def hint(self, request):
+        game_id, game = self._game(request)
+        count = request.get("count", 1)
+        if not isinstance(count, int) or count < 1:
+            raise ServerError("count must be a positive number")
+        # the worker gets a snapshot, so the game can carry on meanwhile
+        squares = game.board.squares()
+        rack = bytes(game.current_player.codes)
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            moves = await loop.run_in_executor(
+                None, _hints, squares, rack, count, self.lexicon)
+        else:
+            moves = await loop.run_in_executor(
+                self._executor, _worker_hints, squares, rack, count)
+        return {"game": game_id, "moves": moves}
+
+    def _game(self, request):
+        # the id and game a request names
+        game_id = request.get("game")
+        if not isinstance(game_id, int) or isinstance(game_id, bool):
+            raise ServerError("game must be a number")
+        game = self.games.get(game_id)
+        if game is None:
+            raise ServerError(f"no game {game_id}")
+        return game_id, game
+
+    @staticmethod
+    def _tiles(request):
+        tiles = request.get("tiles")
+        if not isinstance(tiles, list):
+            raise ServerError("tiles must be a list")
+        return tiles
+
+
+async def main(args):
+    lexicon = Lexicon.load(args.lexicon) if args.lexicon else None
+    server = GameServer(lexicon, args.workers)
+    port = await server.start(args.host, args.port)
+    print(f"serving on {args.host}:{port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrabble game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--lexicon", help="compiled lexicon file")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="hint worker processes, 0 to use a thread")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,183 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from .board import Board
+from .movegen import MoveGenerator
+from .scrabb import RACK_SIZE, Game
+from .tile import code_tile, rack_tile, tile_code
+
+# iterations are handed to workers in fixed size chunks, each with its own
+# seed, so results don't depend on how many workers there are
+CHUNK_SIZE = 50
+# normal quantile for 95% confidence intervals
+Z_95 = 1.96
+
+
+@dataclass
+class SimResult:
+    tile_positions: list
+    score: int
+    iterations: int
+    # mean spread gained over the simulated turns, including the play
+    equity: float
+    equity_error: float
+    # share of iterations ahead after the simulated turns, ties counting
+    # as half
+    win_rate: float
+    win_error: float
+
+
+def unseen_tiles(game, player=None):
+    # the tiles player can't see: the bag and every other rack
+    if player is None:
+        player = game.current_player
+    unseen = game.tile_bag.tiles()
+    for other in game.players:
+        if other is not player:
+            unseen += other.rack
+    return unseen
+
+
+def simulate(game, candidates=None, top=10, unseen=None, iterations=1000,
+             plies=2, workers=None, seed=0):
+    # Monte Carlo simulation of the current player's candidate plays.
+    # Each iteration makes the play, deals the opponent a random rack from
+    # the unseen tiles, refills our rack from what is left, then plays
+    # plies more turns with the best scoring move for whoever is on turn.
+    # Candidates default to the top scoring moves for the current rack.
+    # With workers == 0 everything runs in this process.
+    player = game.current_player
+    if candidates is None:
+        moves = MoveGenerator(game).generate(player.rack)
+        candidates = [tile_positions for _, tile_positions in moves[:top]]
+    if unseen is None:
+        unseen = unseen_tiles(game, player)
+    spread = player.score - max((other.score for other in game.players
+                                 if other is not player), default=0)
+
+    # tasks carry tile codes rather than the board, whose lexicon each
+    # worker is given once when it starts
+    lexicon = game.board.lexicon
+    squares = game.board.squares()
+    rack = bytes(player.codes)
+    unseen = bytes(tile_code(tile) for tile in unseen)
+    tasks = []
+    for i, tile_positions in enumerate(candidates):
+        for chunk, start in enumerate(range(0, iterations, CHUNK_SIZE)):
+            count = min(CHUNK_SIZE, iterations - start)
+            tasks.append((i, (squares, rack, unseen, spread,
+                              list(tile_positions), plies,
+                              f"{seed}:{i}:{chunk}", count)))
+
+    if workers == 0:
+        results = [_simulate_chunk(lexicon, *args) for _, args in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(lexicon,)) as executor:
+            results = list(executor.map(_worker_chunk,
+                                        *zip(*(args for _, args in tasks))))
+
+    totals = [[0, [], 0.0] for _ in candidates]
+    for (i, _), (score, spreads, wins) in zip(tasks, results):
+        totals[i][0] = score
+        totals[i][1] += spreads
+        totals[i][2] += wins
+
+    sim_results = []
+    for tile_positions, (score, spreads, wins) in zip(candidates, totals):
+        sim_results.append(_summarize(tile_positions, score, spreads, wins))
+    sim_results.sort(key=lambda result: result.equity, reverse=True)
+    return sim_results
+
+
+def _summarize(tile_positions, score, spreads, wins):
+    n = len(spreads)
+    if n == 0:
+        return SimResult(list(tile_positions), score, 0, float(score), 0.0,
+                         0.0, 0.0)
+    mean = sum(spreads) / n
+    variance = sum((s - mean) ** 2 for s in spreads) / max(n - 1, 1)
+    win_rate = wins / n
+    return SimResult(list(tile_positions), score, n, mean,
+                     Z_95 * math.sqrt(variance / n), win_rate,
+                     Z_95 * math.sqrt(win_rate * (1 - win_rate) / n))
+
+
+# the lexicon of a worker process, set once when it starts
+_worker_lexicon = None
+
+
+def _init_worker(lexicon):
+    global _worker_lexicon
+    _worker_lexicon = lexicon
+
+
+def _worker_chunk(*args):
+    return _simulate_chunk(_worker_lexicon, *args)
+
+
+def _simulate_chunk(lexicon, squares, rack, unseen, spread, tile_positions,
+                    plies, seed, count):
+    # returns the play's score, the spread gained by each iteration and
+    # the number of wins. The board, rack and unseen tiles come as codes.
+    rng = random.Random(seed)
+    game = Game(lexicon)
+    game.board = Board.from_squares(squares, lexicon)
+    generator = MoveGenerator(game)
+
+    score = game.play_tiles(list(tile_positions))
+    leave = [code_tile(code) for code in rack]
+    for pos in tile_positions:
+        leave.remove(rack_tile(pos[2]))
+    unseen = [code_tile(code) for code in unseen]
+
+    spreads = []
+    wins = 0.0
+    for _ in range(count):
+        pool = list(unseen)
+        rng.shuffle(pool)
+        opponent = pool[-RACK_SIZE:]
+        del pool[-RACK_SIZE:]
+        ours = leave + _draw(pool, RACK_SIZE - len(leave))
+        racks = [opponent, ours]
+        gained = score
+        placed = 0
+
+        for ply in range(plies):
+            rack_now = racks[ply % 2]
+            if not rack_now:
+                break
+            moves = generator.generate(rack_now)
+            if not moves:
+                continue
+            move_score, move_positions = moves[0]
+            game.play_tiles(list(move_positions))
+            placed += 1
+            for pos in move_positions:
+                rack_now.remove(rack_tile(pos[2]))
+            rack_now += _draw(pool, len(move_positions))
+            gained += move_score if ply % 2 else -move_score
+
+        for _ in range(placed):
+            game.board.undo()
+        spreads.append(gained)
+        final = spread + gained
+        wins += 1.0 if final > 0 else 0.5 if final == 0 else 0.0
+
+    return score, spreads, wins
+
+
+def _draw(pool, num_tiles):
+    # the pool is already shuffled, so draws come off the end
+    num_tiles = min(num_tiles, len(pool))
+    drawn = pool[len(pool) - num_tiles:]
+    del pool[len(pool) - num_tiles:]
+    return drawn
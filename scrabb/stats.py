@@ -0,0 +1,63 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+from time import perf_counter
+
+# the phases of Game.play_tiles, in the order they run
+GET_ORIENTATION = "get_orientation"
+IS_VALID_PLAY = "is_valid_play"
+FIND_WORDS = "find_words"
+CALCULATE_SCORE = "calculate_score"
+PLACE_TILES = "place_tiles"
+PHASES = (GET_ORIENTATION, IS_VALID_PLAY, FIND_WORDS, CALCULATE_SCORE,
+          PLACE_TILES)
+
+
+class PlayStats:
+    # Counts and cumulative times for each phase of Game.play_tiles, and
+    # counts of rejected plays by ValidationReason. Only games that have
+    # stats attached pay for timing. After every play the hook, if any, is
+    # called with that play's {phase: seconds} and the ValidationReason it
+    # was rejected for, or None if it was played.
+
+    def __init__(self, hook=None):
+        self.hook = hook
+        self.reset()
+
+    def reset(self):
+        self.plays = 0
+        self.counts = dict.fromkeys(PHASES, 0)
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.rejected = {}
+
+    def time(self, timings, phase, function, *args):
+        # run one phase, adding its time to timings and the totals
+        start = perf_counter()
+        try:
+            return function(*args)
+        finally:
+            elapsed = perf_counter() - start
+            timings[phase] = elapsed
+            self.counts[phase] += 1
+            self.seconds[phase] += elapsed
+
+    def record(self, timings, reason=None):
+        self.plays += 1
+        if reason is not None:
+            self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        if self.hook is not None:
+            self.hook(timings, reason)
+
+    def snapshot(self):
+        # plain values only, ready for logging or JSON
+        return {
+            "plays": self.plays,
+            "phases": {phase: {"count": self.counts[phase],
+                               "seconds": self.seconds[phase]}
+                       for phase in PHASES},
+            "rejected": {reason.name: count
+                         for reason, count in self.rejected.items()},
+        }
@@ -11,3 +11,65 @@ from dataclasses import dataclass
 class Tile:
     letter: str
     score: int
+
+
+class InvalidTileException(Exception):
+    def __init__(self, tile):
+        super().__init__()
+        self.tile = tile
+        self.message = f"{tile}"
+
+
+# Tiles are stored on the board as small integer codes, 0 meaning no tile.
+# The standard tiles have fixed codes: A-Z are 1-26, the blank is 27 and a
+# blank played as a-z is 28-53. Those are the only tiles there are codes
+# for, so they mean the same in every process; any other tile is rejected
+# with InvalidTileException.
+LETTER_SCORES = {
+    'A': 1, 'B': 3, 'C': 3, 'D': 2, 'E': 1, 'F': 4, 'G': 2, 'H': 4, 'I': 1,
+    'J': 8, 'K': 5, 'L': 1, 'M': 3, 'N': 1, 'O': 1, 'P': 3, 'Q': 10, 'R': 1,
+    'S': 1, 'T': 1, 'U': 1, 'V': 4, 'W': 4, 'X': 8, 'Y': 4, 'Z': 10
+}
+BLANK = Tile(' ', 0)
+
+_TILES = tuple([None] +
+               [Tile(letter, score)
+                for letter, score in LETTER_SCORES.items()] +
+               [BLANK] +
+               [Tile(letter.lower(), 0) for letter in LETTER_SCORES])
+STANDARD_CODES = len(_TILES)
+_CODES = {tile: code for code, tile in enumerate(_TILES) if tile is not None}
+# the standard tiles by letter, upper case for a tile, ' ' for the blank
+# and lower case for a blank played as that letter
+_LETTER_CODES = {tile.letter: code for code, tile in enumerate(_TILES)
+                 if tile is not None}
+
+
+def tile_code(tile):
+    if tile is None:
+        return 0
+    code = _CODES.get(tile)
+    if code is None:
+        raise InvalidTileException(tile)
+    return code
+
+
+def code_tile(code):
+    return _TILES[code]
+
+
+def letter_code(letter):
+    # the code of the standard tile for a letter, or 0 if there is none
+    return _LETTER_CODES.get(letter, 0)
+
+
+def letter_tile(letter):
+    # the shared instance of the standard tile for a letter, or None
+    return _TILES[_LETTER_CODES.get(letter, 0)]
+
+
+def rack_tile(tile):
+    # the tile a played tile came from: blanks are played as lower case
+    if tile.letter.islower():
+        return BLANK
+    return tile
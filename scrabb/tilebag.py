@@ -5,8 +5,14 @@
 # Contact: chris@cplyon.ca
 
 import random
-from collections_extended import bag
-from .tile import Tile
+from .tile import code_tile, letter_code, tile_code
+
+# how many of each letter a full bag holds
+DISTRIBUTION = {
+    'A': 9, 'B': 2, 'C': 2, 'D': 4, 'E': 12, 'F': 2, 'G': 3, 'H': 2, 'I': 9,
+    'J': 1, 'K': 1, 'L': 4, 'M': 2, 'N': 6, 'O': 8, 'P': 2, 'Q': 1, 'R': 6,
+    'S': 4, 'T': 6, 'U': 4, 'V': 2, 'W': 2, 'X': 1, 'Y': 2, 'Z': 1, ' ': 2
+}
 
 
 class NotEnoughTilesException(Exception):
@@ -20,8 +26,11 @@ class NotEnoughTilesException(Exception):
 class TileBag:
 
     def __init__(self, seed=None):
-        self._tiles = bag()
-        random.seed(seed)
+        # the tile codes in the bag, in no particular order
+        self._tiles = bytearray()
+        # each bag draws from its own generator, so seeded games are
+        # reproducible however many are played at once
+        self._random = random.Random(seed)
         self.populate_tiles()
 
     def __len__(self):
@@ -29,52 +38,55 @@ class TileBag:
 
     def populate_tiles(self):
         self._tiles.clear()
-        self._tiles.add(Tile('J', 8))
-        self._tiles.add(Tile('K', 5))
-        self._tiles.add(Tile('Q', 10))
-        self._tiles.add(Tile('X', 8))
-        self._tiles.add(Tile('Z', 10))
-        for _ in range(2):
-            self._tiles.add(Tile('B', 3))
-            self._tiles.add(Tile('C', 3))
-            self._tiles.add(Tile('F', 4))
-            self._tiles.add(Tile('H', 4))
-            self._tiles.add(Tile('M', 3))
-            self._tiles.add(Tile('P', 3))
-            self._tiles.add(Tile('V', 4))
-            self._tiles.add(Tile('W', 4))
-            self._tiles.add(Tile('Y', 4))
-            self._tiles.add(Tile(' ', 0))
-        for _ in range(3):
-            self._tiles.add(Tile('G', 2))
-        for _ in range(4):
-            self._tiles.add(Tile('D', 2))
-            self._tiles.add(Tile('L', 1))
-            self._tiles.add(Tile('S', 1))
-            self._tiles.add(Tile('U', 1))
-        for _ in range(6):
-            self._tiles.add(Tile('N', 1))
-            self._tiles.add(Tile('R', 1))
-            self._tiles.add(Tile('T', 1))
-        for _ in range(8):
-            self._tiles.add(Tile('O', 1))
-        for _ in range(9):
-            self._tiles.add(Tile('A', 1))
-            self._tiles.add(Tile('I', 1))
-        for _ in range(12):
-            self._tiles.add(Tile('E', 1))
+        for letter, count in DISTRIBUTION.items():
+            self._tiles.extend(bytes([letter_code(letter)]) * count)
+
+    def state(self):
+        # the tile codes in the bag and the generator's state
+        return bytes(self._tiles), self._random.getstate()
+
+    def restore(self, tiles, random_state):
+        self._tiles[:] = tiles
+        self._random.setstate(random_state)
+
+    def codes(self):
+        return bytes(self._tiles)
+
+    def tiles(self):
+        return [code_tile(code) for code in self._tiles]
+
+    def count(self, tile):
+        return self._tiles.count(tile_code(tile))
 
     def draw_tiles(self, num_tiles):
+        # partial Fisher-Yates shuffle: each draw swaps a random tile to
+        # the end of the bag, and the drawn tiles are cut off the end
         num_tiles = min(num_tiles, len(self))
-        drawn_tiles = random.sample(list(self._tiles), k=num_tiles)
-        self._tiles -= drawn_tiles
+        tiles = self._tiles
+        end = len(tiles)
+        for _ in range(num_tiles):
+            i = self._random.randrange(end)
+            end -= 1
+            tiles[i], tiles[end] = tiles[end], tiles[i]
+        drawn_tiles = [code_tile(code) for code in tiles[end:]]
+        del tiles[end:]
         return drawn_tiles
 
     def exchange_tiles(self, tiles):
         if len(tiles) > len(self):
             raise NotEnoughTilesException(tiles, len(self))
 
-        drawn_tiles = self.draw_tiles(len(tiles))
-        for tile in tiles:
-            self._tiles.add(tile)
+        # the tiles are checked before any are drawn
+        codes = bytes(tile_code(tile) for tile in tiles)
+        drawn_tiles = self.draw_tiles(len(codes))
+        self._tiles += codes
         return drawn_tiles
+
+    def return_tiles(self, tiles):
+        self._tiles += bytes(tile_code(tile) for tile in tiles)
+
+    def remove_tiles(self, tiles):
+        # tiles are searched for from the end of the bag, where tiles
+        # just returned or exchanged are
+        for tile in tiles:
+            del self._tiles[self._tiles.rindex(tile_code(tile))]
@@ -0,0 +1,108 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import math
+from functools import lru_cache
+from .leaves import CAPS, NUM_KINDS
+from .scrabb import RACK_SIZE
+from .tile import InvalidTileException, code_tile, rack_tile, tile_code
+
+FULL_BAG = sum(CAPS)
+# CHOOSE[n][k] for every pool a full bag can make
+CHOOSE = [[math.comb(n, k) for k in range(n + 1)]
+          for n in range(FULL_BAG + 1)]
+
+
+class TileTracker:
+    # The tiles one player hasn't seen yet: the bag and the other racks,
+    # kept as a count of each kind (A-Z, then the blank). Tiles are seen
+    # as they are drawn onto the player's rack or played by anyone else,
+    # and each update costs one step per tile. Blanks played as a letter
+    # count as blanks.
+
+    def __init__(self, rack=()):
+        # starting from a full bag, with rack already seen
+        self._counts = list(CAPS)
+        self._total = FULL_BAG
+        self.see(rack)
+
+    @classmethod
+    def from_game(cls, game, player=None):
+        # what player, by default the one on turn, hasn't seen
+        if player is None:
+            player = game.current_player
+        tracker = cls(player.rack)
+        tracker.see(code_tile(code) for code in game.board.squares()
+                    if code)
+        return tracker
+
+    def __len__(self):
+        return self._total
+
+    def see(self, tiles):
+        for tile in tiles:
+            kind = _kind(tile)
+            if not self._counts[kind]:
+                raise InvalidTileException(tile)
+            self._counts[kind] -= 1
+            self._total -= 1
+
+    def unsee(self, tiles):
+        # tiles back out of sight, such as those exchanged into the bag
+        for tile in tiles:
+            kind = _kind(tile)
+            if self._counts[kind] == CAPS[kind]:
+                raise InvalidTileException(tile)
+            self._counts[kind] += 1
+            self._total += 1
+
+    def count(self, tile):
+        return self._counts[_kind(tile)]
+
+    def counts(self):
+        # {letter: count} of every unseen kind, ' ' for the blank
+        return {code_tile(kind + 1).letter: count
+                for kind, count in enumerate(self._counts) if count}
+
+    def tiles(self):
+        tiles = []
+        for kind, count in enumerate(self._counts):
+            tiles.extend([code_tile(kind + 1)] * count)
+        return tiles
+
+    def draw_probability(self, tile, draws, at_least=1):
+        # the chance that draws tiles taken at random from the unseen
+        # tiles include at least at_least of tile
+        return hypergeometric_tail(self.count(tile), self._total,
+                                   min(draws, self._total), at_least)
+
+    def holds_probability(self, tile, rack_size=RACK_SIZE):
+        # the chance that an opponent's rack of rack_size tiles, drawn
+        # from what is unseen, holds tile
+        return self.draw_probability(tile, rack_size)
+
+
+def _kind(tile):
+    code = tile_code(rack_tile(tile))
+    if not 0 < code <= NUM_KINDS:
+        raise InvalidTileException(tile)
+    return code - 1
+
+
+@lru_cache(maxsize=None)
+def hypergeometric_tail(successes, population, draws, at_least):
+    # P(at least at_least successes in draws taken without replacement
+    # from population items, successes of which count)
+    if at_least <= 0:
+        return 1.0
+    if draws > population or successes > population:
+        raise ValueError("more draws or successes than items")
+    failures = population - successes
+    ways = 0
+    for hits in range(at_least, min(successes, draws) + 1):
+        if draws - hits <= failures:
+            ways += CHOOSE[successes][hits] * CHOOSE[failures][draws - hits]
+    return ways / CHOOSE[population][draws]
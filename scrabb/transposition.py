@@ -0,0 +1,66 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+
+class TranspositionTable:
+    # A fixed size table of values keyed by Zobrist hash. Each slot holds
+    # two entries: one kept for the deepest search stored there, and one
+    # always replaced, so deep results survive while recent ones still get
+    # cached. Searches store with their remaining depth; plain caches can
+    # leave depth at 0.
+
+    def __init__(self, size=1 << 16):
+        # size is rounded up to a power of two so a slot is key & mask
+        slots = 1
+        while slots < size:
+            slots <<= 1
+        self._mask = slots - 1
+        self._keys = [None] * (2 * slots)
+        self._depths = [0] * (2 * slots)
+        self._values = [None] * (2 * slots)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return sum(1 for key in self._keys if key is not None)
+
+    def __contains__(self, key):
+        i = (key & self._mask) << 1
+        return self._keys[i] == key or self._keys[i + 1] == key
+
+    def get(self, key, min_depth=0):
+        # the value stored for key from a search at least min_depth deep,
+        # or None
+        i = (key & self._mask) << 1
+        for j in (i, i + 1):
+            if self._keys[j] == key and self._depths[j] >= min_depth:
+                self.hits += 1
+                return self._values[j]
+        self.misses += 1
+        return None
+
+    def store(self, key, value, depth=0):
+        i = (key & self._mask) << 1
+        if (self._keys[i] is None or self._keys[i] == key or
+                depth >= self._depths[i]):
+            self._keys[i] = key
+            self._depths[i] = depth
+            self._values[i] = value
+            if self._keys[i + 1] == key:
+                self._keys[i + 1] = None
+                self._values[i + 1] = None
+        else:
+            self._keys[i + 1] = key
+            self._depths[i + 1] = depth
+            self._values[i + 1] = value
+
+    def clear(self):
+        for i in range(len(self._keys)):
+            self._keys[i] = None
+            self._values[i] = None
+            self._depths[i] = 0
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,65 @@
+#! /usr/bin/env python3
+#
+# Scrabble Game
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+from .tile import code_tile, tile_code
+
+# Zobrist keys are 64 bit values XORed together to hash a position. They
+# are derived from the tile's letter and score rather than drawn from a
+# random generator, so every process agrees on them and hashes can be
+# shared between workers and stored.
+MASK = (1 << 64) - 1
+
+SQUARE = 1
+RACK = 2
+UNSEEN = 3
+SIDE = 4
+
+
+def _splitmix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK
+    return x ^ (x >> 31)
+
+
+def _tile_seed(tile):
+    return (ord(tile.letter) << 16) | (tile.score & 0xFFFF)
+
+
+_square_keys = {}
+
+
+def square_keys(code):
+    # the key of a tile code on each square, indexed by row * SIZE + col
+    keys = _square_keys.get(code)
+    if keys is None:
+        seed = (SQUARE << 56) | (_tile_seed(code_tile(code)) << 8)
+        keys = [_splitmix64(seed + (index << 40)) for index in range(225)]
+        _square_keys[code] = keys
+    return keys
+
+
+def tiles_hash(tiles, kind=RACK, seat=0):
+    # hash a multiset of tiles, such as a rack or the unseen tiles. The
+    # n-th copy of a tile has its own key, so the order doesn't matter
+    # but the counts do.
+    return codes_hash([tile_code(tile) for tile in tiles], kind, seat)
+
+
+def codes_hash(codes, kind=RACK, seat=0):
+    # tiles_hash of the tiles with these codes
+    counts = {}
+    key = 0
+    for code in codes:
+        n = counts.get(code, 0)
+        counts[code] = n + 1
+        key ^= _splitmix64((kind << 56) | (seat << 48) |
+                           (_tile_seed(code_tile(code)) << 8) | n)
+    return key
+
+
+def side_key(seat):
+    return _splitmix64((SIDE << 56) | seat)
@@ -12,12 +12,18 @@ setuptools.setup(
     url='https://github.com/cplyon/scrabb',
     author='Chris Lyon',
     author_email='chris@cplyon.ca',
-    packages=setuptools.find_packages(),
-    install_requires=['collections-extended'],
+    packages=setuptools.find_packages(exclude=['benchmarks']),
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
     ],
     python_requires='>=3.8',
+    entry_points={
+        'console_scripts': ['scrabb-selfplay=scrabb.selfplay:main'],
+    },
+    extras_require={
+        # vectorized batch scoring
+        'numpy': ['numpy'],
+    },
 )
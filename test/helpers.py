@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+from scrabb.lexicon import Lexicon
+from scrabb.tile import BLANK, LETTER_SCORES, Tile
+
+# A small lexicon of common short words, enough for the bots and searches
+# in the tests to find plays.
+WORD_LIST = ["AT", "TA", "AN", "NA", "TAN", "ANT", "EAT", "TEA", "ATE", "SEA",
+             "SAT", "SET", "TO", "ON", "NO", "NOT", "TON", "IT", "IN", "TIN",
+             "SIT", "ITS", "RAT", "TAR", "ART", "TEN", "NET", "ONE", "RATE",
+             "STAR", "RAIN"]
+WORDS = Lexicon.from_words(WORD_LIST)
+
+
+def tiles(letters):
+    # the tiles for letters, ' ' being the blank
+    return [BLANK if letter == ' ' else Tile(letter, LETTER_SCORES[letter])
+            for letter in letters]
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import random
+import unittest
+from collections import Counter
+
+from scrabb.anagram import AnagramIndex, alphagram
+from scrabb.tile import BLANK, LETTER_SCORES, Tile
+
+WORDS = ["AE", "AT", "EAT", "ETA", "TEA", "ATE", "TAE", "RATE", "TEAR",
+         "TARE", "STARE", "TEARS", "RATES", "ASTER", "QI", "QAT", "ZA",
+         "RETAINS", "NASTIER", "RETINAS", "STAINER", "AA", "AAH"]
+
+
+def fits(word, rack):
+    # brute force: can rack spell word, blanks standing in for anything
+    missing = Counter(word) - Counter(rack.replace('?', ''))
+    return sum(missing.values()) <= rack.count('?')
+
+
+class AnagramIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = AnagramIndex.from_words(WORDS)
+
+    def test_alphagram(self):
+        self.assertEqual(alphagram("STARE"), "AERST")
+        self.assertEqual(alphagram(""), "")
+
+    def test_len(self):
+        self.assertEqual(len(self.index), len(WORDS))
+
+    def test_anagrams(self):
+        self.assertEqual(self.index.anagrams("TAE"),
+                         ["ATE", "EAT", "ETA", "TAE", "TEA"])
+        self.assertEqual(self.index.anagrams("SATIRNE"),
+                         ["NASTIER", "RETAINS", "RETINAS", "STAINER"])
+        self.assertEqual(self.index.anagrams("XYZ"), [])
+        self.assertEqual(self.index.anagrams(""), [])
+
+    def test_anagrams_blanks(self):
+        self.assertEqual(self.index.anagrams("RAT?"),
+                         ["RATE", "TARE", "TEAR"])
+        self.assertEqual(self.index.anagrams("Q??"), ["QAT"])
+        self.assertEqual(self.index.anagrams("Q "), ["QI"])
+
+    def test_anagrams_tiles(self):
+        rack = [Tile('Z', LETTER_SCORES['Z']), BLANK]
+        self.assertEqual(self.index.anagrams(rack), ["ZA"])
+        # a blank already played as a letter counts as that letter
+        rack = [Tile('q', 0), Tile('I', LETTER_SCORES['I'])]
+        self.assertEqual(self.index.anagrams(rack), ["QI"])
+
+    def test_anagrams_not_letters(self):
+        self.assertEqual(self.index.anagrams("QI1"), [])
+        self.assertEqual(self.index.subanagrams("QI1"), ["QI"])
+        self.assertEqual(self.index.containing("1"), [])
+
+    def test_subanagrams(self):
+        self.assertEqual(self.index.subanagrams("TAES"),
+                         ["ATE", "EAT", "ETA", "TAE", "TEA", "AE", "AT"])
+        self.assertEqual(self.index.subanagrams("TAES", min_length=3),
+                         ["ATE", "EAT", "ETA", "TAE", "TEA"])
+        self.assertEqual(self.index.subanagrams("A"), [])
+
+    def test_subanagrams_blanks(self):
+        self.assertEqual(self.index.subanagrams("A?"),
+                         ["AA", "AE", "AT", "ZA"])
+        # a word is only found once, whether a blank was used or not
+        found = self.index.subanagrams("AA?")
+        self.assertEqual(len(found), len(set(found)))
+        self.assertIn("AAH", found)
+
+    def test_containing(self):
+        self.assertEqual(self.index.containing("Q"), ["QAT", "QI"])
+        self.assertEqual(self.index.containing("QT"), ["QAT"])
+        self.assertEqual(self.index.containing("AA"), ["AA", "AAH"])
+        self.assertEqual(self.index.containing("NS"),
+                         ["NASTIER", "RETAINS", "RETINAS", "STAINER"])
+        self.assertEqual(self.index.containing("J"), [])
+        self.assertEqual(self.index.containing(""), sorted(WORDS))
+
+    def test_pattern(self):
+        self.assertEqual(self.index.pattern("?A?E"), ["RATE", "TARE"])
+        self.assertEqual(self.index.pattern("t?a"), ["TEA"])
+        self.assertEqual(self.index.pattern("??"),
+                         ["AA", "AE", "AT", "QI", "ZA"])
+        self.assertEqual(self.index.pattern("Q"), [])
+        self.assertEqual(self.index.pattern("ST ?E"), ["STARE"])
+
+    def test_brute_force(self):
+        rng = random.Random(1)
+        letters = "AAEEIIOTRSNLQZ"
+        words = {"".join(rng.choice(letters)
+                         for _ in range(rng.randint(2, 6)))
+                 for _ in range(2000)}
+        index = AnagramIndex.from_words(words)
+        for _ in range(40):
+            rack = "".join(rng.choice(letters + "??")
+                           for _ in range(rng.randint(1, 7)))
+            expected = {word for word in words if fits(word, rack)}
+            self.assertEqual(set(index.subanagrams(rack, 1)), expected)
+            self.assertEqual(index.anagrams(rack), sorted(
+                word for word in expected if len(word) == len(rack)))
+
+            wanted = "".join(rng.choice(letters) for _ in range(2))
+            self.assertEqual(index.containing(wanted), sorted(
+                word for word in words
+                if not Counter(wanted) - Counter(word)))
+
+            pattern = "".join(rng.choice(letters[:6] + "??")
+                              for _ in range(rng.randint(2, 4)))
+            self.assertEqual(index.pattern(pattern), sorted(
+                word for word in words if len(word) == len(pattern) and
+                all(p == '?' or p == c for p, c in zip(pattern, word))))
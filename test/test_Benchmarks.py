@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import unittest
+
+from benchmarks.fixtures import position
+from benchmarks.run import compare, measure, position_benchmarks
+from scrabb.lexicon import Lexicon
+from scrabb.selfplay import SCORELESS_TURNS
+
+from .helpers import WORDS
+
+
+class BenchmarksTest(unittest.TestCase):
+
+    def test_position(self):
+        game = position(WORDS, 2)
+        again = position(WORDS, 2)
+        self.assertEqual(game.board.squares(), again.board.squares())
+        self.assertEqual(game.turn, 2)
+        self.assertTrue(position(WORDS, 0).board.is_empty)
+
+    def test_position_scoreless(self):
+        # bots that can't play only exchange, which ends the game
+        game = position(Lexicon.from_words(["ZZZZZZZZ"]), None)
+        self.assertTrue(game.board.is_empty)
+        self.assertEqual(game.turn, SCORELESS_TURNS)
+
+    def test_position_benchmarks(self):
+        game = position(WORDS, 2)
+        squares = game.board.squares()
+        bag = game.tile_bag.state()
+        benchmarks = position_benchmarks(game)
+        self.assertIn("play_tiles", benchmarks)
+        self.assertIn("iter_moves_top", benchmarks)
+        for function, calls in benchmarks.values():
+            self.assertEqual(len(measure(function, 2, 0)), 2)
+        # the position is left as it was
+        self.assertEqual(game.board.squares(), squares)
+        self.assertEqual(game.tile_bag.state(), bag)
+
+    def test_compare(self):
+        baseline = {"results": {"a": {"best": 1.0}, "b": {"best": 1.0},
+                                "gone": {"best": 1.0}}}
+        current = {"results": {"a": {"best": 1.05}, "b": {"best": 1.5},
+                               "new": {"best": 1.0}}}
+        rows, regressions = compare(baseline, current, 0.1)
+        self.assertEqual([row[0] for row in rows], ["a", "b"])
+        self.assertEqual(regressions, ["b"])
+        self.assertAlmostEqual(rows[1][3], 0.5)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import pickle
+import unittest
+
+from scrabb.board import ACROSS, ANY_LETTER, DOWN, NO_CROSS_WORD, Board
+from scrabb.board import Premium
+from scrabb.lexicon import Lexicon
+from scrabb.tile import InvalidTileException, Tile
+
+
+class BoardTest(unittest.TestCase):
+
+    A = Tile('A', 1)
+    B = Tile('B', 3)
+    T = Tile('T', 1)
+
+    def test_bits_empty(self):
+        board = Board()
+        self.assertListEqual(list(board.row_bits), [0] * Board.SIZE)
+        self.assertListEqual(list(board.col_bits), [0] * Board.SIZE)
+        self.assertEqual(board.anchor_bits(ACROSS, Board.MIDDLE[0]), 0)
+
+    def test_bits_place_tiles(self):
+        board = Board()
+        board.place_tiles([(7, 7, self.A), (7, 8, self.T)])
+        self.assertEqual(board.row_bits[7], 0b110000000)
+        self.assertEqual(board.col_bits[7], 1 << 7)
+        self.assertEqual(board.col_bits[8], 1 << 7)
+        self.assertEqual(board.line_bits(ACROSS, 7), board.row_bits[7])
+        self.assertEqual(board.line_bits(DOWN, 8), board.col_bits[8])
+
+    def test_bits_direct_set(self):
+        board = Board()
+        board[0][14] = self.A
+        self.assertEqual(board.row_bits[0], 1 << 14)
+        board[0][14] = None
+        self.assertEqual(board.row_bits[0], 0)
+
+    def test_anchor_bits(self):
+        board = Board()
+        board.place_tiles([(7, 7, self.A), (7, 8, self.T)])
+        self.assertEqual(board.anchor_bits(ACROSS, 7), 0b1001000000)
+        self.assertEqual(board.anchor_bits(ACROSS, 6), 0b110000000)
+        self.assertEqual(board.anchor_bits(ACROSS, 8), 0b110000000)
+        self.assertEqual(board.anchor_bits(ACROSS, 5), 0)
+        self.assertEqual(board.anchor_bits(DOWN, 7), 0b101000000)
+
+    def test_anchor_bits_edges(self):
+        board = Board()
+        board[0][0] = self.A
+        board[14][14] = self.A
+        self.assertEqual(board.anchor_bits(ACROSS, 0), 0b10)
+        self.assertEqual(board.anchor_bits(ACROSS, 1), 0b1)
+        self.assertEqual(board.anchor_bits(ACROSS, 14), 1 << 13)
+        self.assertEqual(board.anchor_bits(DOWN, 14), 1 << 13)
+
+    def test_cross_checks(self):
+        board = Board(Lexicon.from_words(["AT", "TA", "AA"]))
+        board.place_tiles([(7, 7, self.A)])
+        # below the A, only AT and AA can be formed
+        index = 8 * Board.SIZE + 7
+        self.assertEqual(board.cross_checks[ACROSS][index], 0b1 | 1 << 19)
+        self.assertEqual(board.cross_scores[ACROSS][index], 1)
+        self.assertTrue(board.allows(ACROSS, 8, 7, 't'))
+        self.assertFalse(board.allows(ACROSS, 8, 7, 'S'))
+        # playing down from below the A is unconstrained sideways
+        self.assertEqual(board.cross_checks[DOWN][index], ANY_LETTER)
+        self.assertEqual(board.cross_scores[DOWN][index], NO_CROSS_WORD)
+
+    def test_cross_checks_refresh(self):
+        board = Board(Lexicon.from_words(["AT", "TA", "AA", "ATA"]))
+        board.place_tiles([(7, 7, self.A)])
+        board.place_tiles([(9, 7, self.A)])
+        # the square between the two A's must make ATA
+        index = 8 * Board.SIZE + 7
+        self.assertEqual(board.cross_checks[ACROSS][index], 1 << 19)
+        self.assertEqual(board.cross_scores[ACROSS][index], 2)
+        board[9][7] = None
+        self.assertEqual(board.cross_checks[ACROSS][index], 0b1 | 1 << 19)
+        self.assertEqual(board.cross_scores[ACROSS][index], 1)
+
+    def test_premium(self):
+        board = Board()
+        self.assertEqual(board.premium(7, 7), Premium.DOUBLE_WORD)
+        self.assertEqual(board.premium(0, 0), Premium.TRIPLE_WORD)
+        self.assertEqual(board.premium(0, 3), Premium.DOUBLE_LETTER)
+        self.assertEqual(board.premium(1, 5), Premium.TRIPLE_LETTER)
+        self.assertEqual(board.premium(0, 1), Premium.NONE)
+        self.assertEqual(len(board.double_letter_cells), 24)
+        self.assertEqual(len(board.triple_letter_cells), 12)
+        self.assertEqual(len(board.double_word_cells), 17)
+        self.assertEqual(len(board.triple_word_cells), 8)
+
+    def test_premium_used(self):
+        board = Board()
+        board.place_tiles([(7, 7, self.A), (7, 8, self.T)])
+        self.assertEqual(board.premium(7, 7), Premium.NONE)
+        self.assertNotIn((7, 7), board.double_word_cells)
+        self.assertIn((8, 8), board.double_letter_cells)
+        # the layout itself is shared and untouched
+        self.assertEqual(Board.PREMIUMS[7 * Board.SIZE + 7],
+                         Premium.DOUBLE_WORD)
+        self.assertEqual(Board().premium(7, 7), Premium.DOUBLE_WORD)
+
+    def test_multipliers(self):
+        board = Board()
+        middle = 7 * Board.SIZE + 7
+        self.assertEqual(board.word_multipliers[0], 3)
+        self.assertEqual(board.letter_multipliers[1 * Board.SIZE + 5], 3)
+        board.place_tiles([(7, 7, self.A), (1, 5, self.T)])
+        self.assertEqual(board.word_multipliers[middle], 1)
+        self.assertEqual(board.letter_multipliers[1 * Board.SIZE + 5], 1)
+        self.assertEqual(board.copy().word_multipliers[middle], 1)
+        self.assertEqual(Board.from_squares(
+            board.squares()).word_multipliers[middle], 1)
+        board.undo()
+        self.assertEqual(board.word_multipliers, Board.WORD_MULTIPLIERS)
+        self.assertEqual(board.letter_multipliers, Board.LETTER_MULTIPLIERS)
+
+    def test_copy(self):
+        board = Board()
+        board.place_tiles([(7, 7, self.A), (7, 8, self.T)])
+        copy = board.copy()
+        copy.place_tiles([(8, 7, self.T)])
+        self.assertIsNone(board[8][7])
+        self.assertEqual(copy[8][7], self.T)
+        self.assertEqual(copy[7][7], self.A)
+        self.assertEqual(board.col_bits[7], 1 << 7)
+        self.assertEqual(copy.col_bits[7], 0b11 << 7)
+        self.assertFalse(copy.is_empty)
+
+    def test_pickle(self):
+        board = Board()
+        board.place_tiles([(7, 7, self.B), (7, 8, self.T)])
+        copy = pickle.loads(pickle.dumps(board))
+        self.assertEqual(copy[7][7], self.B)
+        self.assertEqual(copy[7][8], self.T)
+        self.assertEqual(copy.row_bits[7], board.row_bits[7])
+
+    def test_other_tiles(self):
+        # only the standard tiles can be stored
+        board = Board()
+        with self.assertRaises(InvalidTileException):
+            board.place_tiles([(7, 7, self.A), (7, 8, Tile('B', 1))])
+        with self.assertRaises(InvalidTileException):
+            board[7][7] = Tile('?', 1)
+        self.assertTrue(board.is_empty)
+        self.assertEqual(board.squares(), bytes(Board.SIZE ** 2))
+
+    def test_str(self):
+        board = Board()
+        board.place_tiles([(0, 0, self.A)])
+        self.assertTrue(str(board).startswith("A 0 0 "))
+
+    def test_place_tiles_invalid(self):
+        board = Board()
+        board.place_tiles([(7, 7, self.A)])
+        squares = board.squares()
+        for bad in ([(7, 8, self.T), (7, 15, self.A)],
+                    [(7, 8, self.T), (-1, 7, self.A)]):
+            with self.assertRaises(IndexError):
+                board.place_tiles(bad)
+            self.assertEqual(board.squares(), squares)
+        self.assertListEqual(board.undo(), [(7, 7, self.A)])
+        self.assertTrue(board.is_empty)
+
+    def test_copy_history(self):
+        board = Board()
+        board.place_tiles([(7, 7, self.A)])
+        copy = board.copy()
+        copy.place_tiles([(7, 8, self.T)])
+        self.assertListEqual(copy.undo(), [(7, 8, self.T)])
+        with self.assertRaises(IndexError):
+            copy.undo()
+        self.assertEqual(copy[7][7], self.A)
+
+    def test_undo(self):
+        board = Board(Lexicon.from_words(["AT", "TA", "ATA"]))
+        before = board.copy()
+        board.place_tiles([(7, 7, self.A), (7, 8, self.T)])
+        middle = board.copy()
+        board.place_tiles([(8, 7, self.T), (9, 7, self.A)])
+        self.assertListEqual(board.undo(),
+                             [(8, 7, self.T), (9, 7, self.A)])
+        self.assertEqual(board._squares, middle._squares)
+        self.assertEqual(board.cross_checks, middle.cross_checks)
+        self.assertEqual(board.cross_scores, middle.cross_scores)
+        self.assertEqual(board.col_bits, middle.col_bits)
+        board.undo()
+        self.assertTrue(board.is_empty)
+        self.assertEqual(board.premium(7, 7), Premium.DOUBLE_WORD)
+        self.assertEqual(board._squares, before._squares)
+        self.assertEqual(board.cross_checks, before.cross_checks)
+        self.assertEqual(board.cross_scores, before.cross_scores)
+        self.assertEqual(board.row_bits, before.row_bits)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import unittest
+
+from scrabb.endgame import EndgameSolver, NotEndgameException, rack_value
+from scrabb.lexicon import Lexicon
+from scrabb.scrabb import Game
+
+from .helpers import WORD_LIST, tiles
+
+
+class EndgameTest(unittest.TestCase):
+
+    WORDS = Lexicon.from_words(WORD_LIST + ["TRAIN", "ZA", "JA"])
+
+    def endgame(self, ours, theirs):
+        game = Game(self.WORDS, seed=1)
+        game.add_player("one")
+        game.add_player("two")
+        game.tile_bag.draw_tiles(len(game.tile_bag))
+        game.board.place_tiles([(7, 7 + i, tile)
+                                for i, tile in enumerate(tiles("TRAIN"))])
+        game.players[0].rack = tiles(ours)
+        game.players[1].rack = tiles(theirs)
+        game.players[0].score = 30
+        game.players[1].score = 20
+        return game
+
+    def replay(self, game, moves):
+        # the spread the line gains for the player on turn
+        racks = [list(game.players[0].rack), list(game.players[1].rack)]
+        value = 0
+        passes = 0
+        for turn, tile_positions in enumerate(moves):
+            sign = 1 if turn % 2 == 0 else -1
+            rack, other = racks[turn % 2], racks[(turn + 1) % 2]
+            if tile_positions is None:
+                passes += 1
+                if passes == 2:
+                    return value + sign * (rack_value(other) -
+                                           rack_value(rack))
+                continue
+            passes = 0
+            value += sign * game.play_tiles(list(tile_positions))
+            for pos in tile_positions:
+                rack.remove(pos[2])
+            if not rack:
+                return value + sign * 2 * rack_value(other)
+        self.fail("line doesn't end the game")
+
+    def test_not_endgame(self):
+        game = Game(self.WORDS)
+        game.add_player("one")
+        game.add_player("two")
+        with self.assertRaises(NotEndgameException):
+            EndgameSolver(game)
+
+    def test_go_out(self):
+        game = self.endgame("Z", "JS")
+        result = EndgameSolver(game).solve()
+        self.assertTrue(result.solved)
+        # ZA, going out and gaining the J and S
+        self.assertEqual(result.value, 11 + 2 * 9)
+        self.assertEqual(result.spread, 10 + result.value)
+        self.assertEqual(len(result.moves), 1)
+
+    def test_solve(self):
+        game = self.endgame("ZAJ", "TS")
+        result = EndgameSolver(game).solve()
+        self.assertTrue(result.solved)
+        # checked against a search of every line
+        self.assertEqual(result.value, 2)
+        self.assertEqual(self.replay(game, result.moves), result.value)
+
+    def test_game_untouched(self):
+        game = self.endgame("ZAJ", "TS")
+        board_hash = game.board.hash
+        EndgameSolver(game).solve()
+        self.assertEqual(game.board.hash, board_hash)
+        self.assertEqual(len(game.players[0].rack), 3)
+
+    def test_time_limit(self):
+        game = self.endgame("ZAJ", "TS")
+        result = EndgameSolver(game).solve(time_limit=0)
+        # no time to search, so the best scoring play
+        self.assertFalse(result.solved)
+        self.assertEqual(result.depth, 0)
+        self.assertEqual(len(result.moves), 1)
+        self.assertEqual(result.spread, 10 + result.value)
+
+    def test_max_depth(self):
+        game = self.endgame("ZAJ", "TS")
+        result = EndgameSolver(game).solve(max_depth=1)
+        self.assertEqual(result.depth, 1)
+        self.assertFalse(result.solved)
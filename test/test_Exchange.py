@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import unittest
+
+from scrabb.exchange import evaluate_exchanges
+from scrabb.leaves import LeaveTable
+from scrabb.lexicon import Lexicon
+from scrabb.scrabb import Game
+
+from .helpers import tiles
+
+
+class ExchangeTest(unittest.TestCase):
+
+    WORDS = Lexicon.from_words(["AT", "TA", "QI", "SAT", "EAT", "TEA",
+                                "SEAT", "EATS", "TEAS"])
+
+    def new_game(self, rack):
+        game = Game(self.WORDS, seed=3)
+        game.add_player("one")
+        game.add_player("two")
+        game.current_player.rack = tiles(rack)
+        return game
+
+    def test_all_subsets(self):
+        game = self.new_game("ABCDEFG")
+        results = evaluate_exchanges(game, LeaveTable.default(3))
+        self.assertEqual(len(results), 127)
+        values = [result.equity for result in results]
+        self.assertEqual(values, sorted(values, reverse=True))
+        for result in results:
+            self.assertEqual(len(result.tiles) + len(result.leave), 7)
+            self.assertIsNone(result.next_score)
+
+    def test_repeated_tiles(self):
+        # exchanging either of two E's is the same exchange
+        game = self.new_game("EEEEEEE")
+        self.assertEqual(len(evaluate_exchanges(game,
+                                                LeaveTable.default(3))), 7)
+
+    def test_leave_value(self):
+        table = LeaveTable.from_function(
+            lambda leave: sum(1 if tile.letter == 'S' else -1
+                              for tile in leave), 3)
+        game = self.new_game("QSAVVWU")
+        best = evaluate_exchanges(game, table, top=1)[0]
+        self.assertEqual([tile.letter for tile in best.leave], ['S'])
+        self.assertEqual(best.equity, 1)
+        # the exchange can be made as it stands
+        game.exchange(best.tiles)
+        self.assertEqual(len(game.players[0].rack), 7)
+
+    def test_bag_limit(self):
+        game = self.new_game("ABCDEFG")
+        game.tile_bag._tiles[3:] = b''
+        results = evaluate_exchanges(game, LeaveTable.default(3))
+        self.assertTrue(all(len(result.tiles) <= 3 for result in results))
+
+    def test_next_score(self):
+        game = self.new_game("QISEATV")
+        results = evaluate_exchanges(game, LeaveTable.default(3), top=5,
+                                     samples=2)
+        self.assertEqual(len(results), 5)
+        for result in results:
+            self.assertGreaterEqual(result.next_score, 0)
+            self.assertEqual(result.equity,
+                             result.leave_value + result.next_score)
+        again = evaluate_exchanges(game, LeaveTable.default(3), top=5,
+                                   samples=2)
+        self.assertEqual(results, again)
@@ -4,12 +4,18 @@
 # Author: Chris Lyon
 # Contact: chris@cplyon.ca
 
+import io
+import pickle
 import unittest
 
-from scrabb.board import Board
-from scrabb.tile import Tile
+from scrabb.board import Board, Premium
+from scrabb.lexicon import Lexicon
+from scrabb.tile import STANDARD_CODES, InvalidTileException, Tile
+from scrabb.player import Player
 from scrabb.scrabb import Game
 from scrabb.scrabb import InvalidPlayException
+from scrabb.scrabb import InvalidSnapshotException
+from scrabb.scrabb import SNAPSHOT_HEADER, SNAPSHOT_RANDOM
 from scrabb.scrabb import Orientation
 from scrabb.scrabb import AdjacentDirection
 from scrabb.scrabb import ValidationReason
@@ -18,8 +24,8 @@ from scrabb.scrabb import ValidationReason
 class GameTest(unittest.TestCase):
 
     A = Tile('A', 1)
-    B = Tile('B', 1)
-    C = Tile('C', 1)
+    B = Tile('B', 3)
+    C = Tile('C', 3)
     L = Tile('L', 1)
     R = Tile('R', 1)
 
@@ -78,6 +84,12 @@ class GameTest(unittest.TestCase):
         self.assertEqual(is_valid,
                          ValidationReason.CELL_ALREADY_FULL)
 
+    def test_is_valid_duplicate_cell(self):
+        game = Game()
+        is_valid = game.is_valid_play([Board.MIDDLE, Board.MIDDLE],
+                                      Orientation.HORIZONTAL)
+        self.assertEqual(is_valid, ValidationReason.DUPLICATE_CELL)
+
     def test_is_valid_not_adjacent(self):
         game = Game()
         game.board[Board.MIDDLE[0]][Board.MIDDLE[1]] = self.A
@@ -166,7 +178,7 @@ class GameTest(unittest.TestCase):
             (Board.MIDDLE[0], Board.MIDDLE[1], self.A),
             (Board.MIDDLE[0], Board.MIDDLE[1]+1, self.B)
         ])
-        self.assertEqual(score, 4)
+        self.assertEqual(score, 8)
 
     def test_play_tiles_valid_vertical(self):
         game = Game()
@@ -174,7 +186,7 @@ class GameTest(unittest.TestCase):
             (Board.MIDDLE[0], Board.MIDDLE[1], self.A),
             (Board.MIDDLE[0]+1, Board.MIDDLE[1], self.B)
         ])
-        self.assertEqual(score, 4)
+        self.assertEqual(score, 8)
 
     # Is Adjacent Tests
     def test_is_adjacent_none(self):
@@ -507,3 +519,334 @@ class GameTest(unittest.TestCase):
             (Board.MIDDLE[0]+1, Board.MIDDLE[1]+6, self.A)
         ])
         self.assertEqual(score, 59)
+
+    # Turn Tests
+    def new_game(self):
+        game = Game(seed=7)
+        game.add_player("one")
+        game.add_player("two")
+        return game
+
+    def opening(self, rack):
+        return [(Board.MIDDLE[0], Board.MIDDLE[1], rack[0]),
+                (Board.MIDDLE[0], Board.MIDDLE[1]+1, rack[1])]
+
+    def test_add_player(self):
+        game = self.new_game()
+        self.assertEqual(len(game.players[0].rack), 7)
+        self.assertEqual(len(game.players[1].rack), 7)
+        self.assertEqual(len(game.tile_bag), 86)
+        self.assertIs(game.current_player, game.players[0])
+
+    def test_play(self):
+        game = self.new_game()
+        player = game.current_player
+        tile_positions = self.opening(player.rack)
+        score = (tile_positions[0][2].score + tile_positions[1][2].score) * 2
+        self.assertEqual(game.play(tile_positions), score)
+        self.assertEqual(player.score, score)
+        self.assertEqual(len(player.rack), 7)
+        self.assertEqual(len(game.tile_bag), 86 - len(tile_positions))
+        self.assertIs(game.current_player, game.players[1])
+
+    def test_play_not_in_rack(self):
+        game = self.new_game()
+        rack = game.current_player.rack
+        tile = Tile('Q', 10) if Tile('Q', 10) not in rack else Tile('Z', 10)
+        with self.assertRaises(InvalidPlayException) as e:
+            game.play([(Board.MIDDLE[0], Board.MIDDLE[1], tile),
+                       (Board.MIDDLE[0], Board.MIDDLE[1]+1, rack[0])])
+        self.assertEqual(e.exception.valid_reason,
+                         ValidationReason.TILES_NOT_IN_RACK)
+        self.assertTrue(game.board.is_empty)
+        self.assertEqual(game.turn, 0)
+
+    def test_play_duplicate_cell(self):
+        game = self.new_game()
+        rack = list(game.current_player.rack)
+        tile_positions = [(Board.MIDDLE[0], Board.MIDDLE[1], rack[0]),
+                          (Board.MIDDLE[0], Board.MIDDLE[1], rack[1])]
+        self.assertEqual(game.score_plays([list(tile_positions)]), [None])
+        with self.assertRaises(InvalidPlayException) as e:
+            game.play(tile_positions)
+        self.assertEqual(e.exception.valid_reason,
+                         ValidationReason.DUPLICATE_CELL)
+        self.assertTrue(game.board.is_empty)
+        self.assertListEqual(list(game.current_player.rack), rack)
+
+    def test_undo_play(self):
+        game = self.new_game()
+        player = game.current_player
+        rack = list(player.rack)
+        bag = sorted(game.tile_bag._tiles)
+        game.play(self.opening(rack))
+        game.undo()
+        self.assertTrue(game.board.is_empty)
+        self.assertIsNone(game.board[Board.MIDDLE[0]][Board.MIDDLE[1]])
+        self.assertEqual(player.score, 0)
+        self.assertListEqual(list(player.rack), rack)
+        self.assertListEqual(sorted(game.tile_bag._tiles), bag)
+        self.assertEqual(game.turn, 0)
+
+    def test_undo_exchange(self):
+        game = self.new_game()
+        player = game.current_player
+        rack = list(player.rack)
+        bag = sorted(game.tile_bag._tiles)
+        drawn = game.exchange(rack[:3])
+        self.assertEqual(len(drawn), 3)
+        self.assertListEqual(list(player.rack), rack[3:] + drawn)
+        game.undo()
+        self.assertListEqual(list(player.rack), rack)
+        self.assertListEqual(sorted(game.tile_bag._tiles), bag)
+        self.assertEqual(game.turn, 0)
+
+    def test_undo_pass(self):
+        game = self.new_game()
+        game.pass_turn()
+        self.assertIs(game.current_player, game.players[1])
+        game.undo()
+        self.assertIs(game.current_player, game.players[0])
+
+    def test_finish(self):
+        game = self.new_game()
+        one, two = game.players
+        one.score, one.rack = 50, []
+        two.score, two.rack = 60, [Tile('Q', 10), Tile('A', 1)]
+        self.assertIs(game.finish(), one)
+        self.assertEqual(one.score, 61)
+        self.assertEqual(two.score, 49)
+
+    def test_finish_tie(self):
+        game = self.new_game()
+        one, two = game.players
+        one.score, one.rack = 20, [Tile('E', 1)]
+        two.score, two.rack = 20, [Tile('A', 1)]
+        self.assertIsNone(game.finish())
+        self.assertEqual(one.score, 19)
+        self.assertIsNone(game.winner)
+
+    # Snapshot Tests
+    def assertSameGame(self, game, copy):
+        self.assertEqual(copy.board.squares(), game.board.squares())
+        self.assertEqual(copy.board.hash, game.board.hash)
+        self.assertEqual(copy.board.is_empty, game.board.is_empty)
+        self.assertEqual(copy.board.row_bits, game.board.row_bits)
+        self.assertEqual(copy.board.cross_scores, game.board.cross_scores)
+        self.assertListEqual(copy.players, game.players)
+        self.assertEqual(copy.turn, game.turn)
+        self.assertListEqual(copy.tile_bag.tiles(), game.tile_bag.tiles())
+
+    def test_snapshot(self):
+        game = self.new_game()
+        game.play(self.opening(game.current_player.rack))
+        copy = Game.from_bytes(game.to_bytes())
+        self.assertSameGame(game, copy)
+        self.assertEqual(copy.board.premium(*Board.MIDDLE), Premium.NONE)
+        # the bag carries on drawing the same tiles
+        self.assertListEqual(copy.tile_bag.draw_tiles(7),
+                             game.tile_bag.draw_tiles(7))
+
+    def test_snapshot_empty(self):
+        game = Game(seed=3)
+        copy = Game.from_bytes(game.to_bytes())
+        self.assertSameGame(game, copy)
+        self.assertTrue(copy.board.is_empty)
+
+    def test_snapshot_name_and_winner(self):
+        game = self.new_game()
+        game.board.place_tiles([(0, 0, Tile('e', 0))])
+        game.players[1].name = "zoë"
+        game.winner = game.players[1]
+        copy = Game.from_bytes(game.to_bytes())
+        self.assertSameGame(game, copy)
+        self.assertEqual(copy.board[0][0], Tile('e', 0))
+        self.assertIs(copy.winner, copy.players[1])
+
+    def test_player_rack_codes(self):
+        game = self.new_game()
+        player = game.players[0]
+        self.assertEqual(len(player.codes), 7)
+        player.rack = [Tile('e', 0), Tile('A', 1)]
+        self.assertEqual(player.rack, (Tile('e', 0), Tile('A', 1)))
+        copy = pickle.loads(pickle.dumps(player))
+        self.assertEqual(copy, player)
+        self.assertEqual(copy.rack, player.rack)
+        # the rack can't be changed in place, only through the player
+        with self.assertRaises(AttributeError):
+            player.rack.append(Tile('E', 1))
+        player.add([Tile('E', 1)])
+        player.take([Tile('A', 1)])
+        self.assertEqual(player.rack, (Tile('e', 0), Tile('E', 1)))
+        with self.assertRaises(ValueError):
+            player.take([Tile('E', 1), Tile('A', 1)])
+        self.assertEqual(player.rack, (Tile('e', 0), Tile('E', 1)))
+        # only the standard tiles can go on a rack
+        with self.assertRaises(InvalidTileException):
+            player.add([Tile('É', 2)])
+        with self.assertRaises(InvalidTileException):
+            Player("new", 0, [Tile('A', 5)])
+        self.assertEqual(Player("new", 5, [Tile('B', 3)]),
+                         Player("new", 5, rack=[Tile('B', 3)]))
+
+    def test_snapshot_stream(self):
+        games = [self.new_game(), Game(seed=1)]
+        games[0].pass_turn()
+        stream = io.BytesIO()
+        for game in games:
+            game.write(stream)
+        stream.seek(0)
+        for game in games:
+            self.assertSameGame(game, Game.read(stream))
+        self.assertIsNone(Game.read(stream))
+
+    def test_snapshot_invalid(self):
+        data = self.new_game().to_bytes()
+        # a square holding a code no tile has
+        board = SNAPSHOT_HEADER.size + SNAPSHOT_RANDOM.size
+        unknown = data[:board] + bytes([STANDARD_CODES]) + data[board + 1:]
+        for bad in [b"", b"SCGM", b"XXXX" + data[4:], data[:-1],
+                    data + b"!", unknown]:
+            with self.assertRaises(InvalidSnapshotException):
+                Game.from_bytes(bad)
+
+    def test_snapshot_out_of_range(self):
+        game = self.new_game()
+        game.players[0].name = "a" * 2 ** 15
+        with self.assertRaises(InvalidSnapshotException):
+            game.to_bytes()
+        game = self.new_game()
+        game.players[0].score = 2 ** 31
+        with self.assertRaises(InvalidSnapshotException):
+            game.to_bytes()
+        game = self.new_game()
+        game.turn = -1
+        with self.assertRaises(InvalidSnapshotException):
+            game.to_bytes()
+        game = self.new_game()
+        game.winner = Player("someone else")
+        with self.assertRaises(InvalidSnapshotException):
+            game.to_bytes()
+        game = Game()
+        game.players = [Player(str(i)) for i in range(256)]
+        with self.assertRaises(InvalidSnapshotException):
+            game.to_bytes()
+        game.players.pop()
+        self.assertEqual(len(Game.from_bytes(game.to_bytes()).players), 255)
+
+    # Instrumentation Tests
+    def test_stats_off(self):
+        game = Game()
+        self.assertIsNone(game.stats)
+        game.play_tiles([(7, 7, self.A), (7, 8, self.B)])
+        self.assertIsNone(game.stats)
+
+    def test_stats(self):
+        calls = []
+        game = Game(Lexicon.from_words(["AB", "CAB"]))
+        stats = game.enable_stats(lambda timings, reason:
+                                  calls.append((set(timings), reason)))
+        game.play_tiles([(7, 7, self.A), (7, 8, self.B)])
+        with self.assertRaises(InvalidPlayException):
+            game.play_tiles([(9, 9, self.A), (9, 10, self.C)])
+        with self.assertRaises(InvalidPlayException):
+            game.play_tiles([(6, 7, self.C), (6, 8, self.A)])
+        game.play_tiles([(7, 6, self.C)])
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["plays"], 4)
+        phases = snapshot["phases"]
+        self.assertEqual(phases["get_orientation"]["count"], 4)
+        self.assertEqual(phases["is_valid_play"]["count"], 4)
+        self.assertEqual(phases["find_words"]["count"], 3)
+        self.assertEqual(phases["calculate_score"]["count"], 2)
+        self.assertEqual(phases["place_tiles"]["count"], 2)
+        self.assertTrue(all(phase["seconds"] >= 0
+                            for phase in phases.values()))
+        self.assertEqual(snapshot["rejected"],
+                         {"NOT_ADJACENT": 1, "INVALID_WORD": 1})
+
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(calls[0], (set(phases), None))
+        self.assertEqual(calls[1][1], ValidationReason.NOT_ADJACENT)
+        self.assertEqual(calls[2][1], ValidationReason.INVALID_WORD)
+
+        stats.reset()
+        self.assertEqual(stats.snapshot()["plays"], 0)
+        game.disable_stats()
+        self.assertIsNone(game.stats)
+
+    def test_stats_rack(self):
+        game = self.new_game()
+        stats = game.enable_stats()
+        with self.assertRaises(InvalidPlayException):
+            game.play([(7, 7, Tile('Q', 10)), (7, 8, Tile('Q', 10))])
+        self.assertEqual(stats.snapshot()["rejected"],
+                         {"TILES_NOT_IN_RACK": 1})
+
+    # Batch Scoring Tests
+    def scored_game(self):
+        game = Game(Lexicon.from_words(["AB", "CAB", "CABLE", "BA", "LA",
+                                        "ABLE", "BAR", "ARC"]))
+        game.play_tiles([(7, 7, self.C), (7, 8, self.A), (7, 9, self.B)])
+        return game
+
+    def play_scores(self, game, candidates):
+        scores = []
+        for tile_positions in candidates:
+            try:
+                scores.append(game.play_tiles(list(tile_positions)))
+                game.board.undo()
+            except InvalidPlayException:
+                scores.append(None)
+        return scores
+
+    def test_score_plays(self):
+        game = self.scored_game()
+        E = Tile('E', 1)
+        candidates = [
+            [(7, 10, self.L), (7, 11, E)],
+            [(7, 11, E), (7, 10, self.L)],
+            [(8, 8, self.B), (9, 8, self.A), (10, 8, self.R)],
+            [(6, 9, self.A), (8, 9, self.A)],
+            [(8, 9, self.A)],
+            [(8, 10, self.A)],
+            [(7, 10, self.A), (8, 10, self.A)],
+            [(7, 7, self.A)],
+            [(7, 10, self.L), (7, 12, E)],
+            [(7, 10, self.R), (7, 11, E)],
+            [(6, 8, self.B), (6, 9, self.A)],
+            [(7, 10, self.L), (7, 10, E)],
+            [],
+        ]
+        scores = game.score_plays(candidates)
+        self.assertEqual(scores[:-1], self.play_scores(game, candidates[:-1]))
+        self.assertEqual(scores[0], 10)
+        self.assertEqual(scores[1], 10)
+        self.assertEqual(scores[-2:], [None, None])
+        self.assertTrue(any(score is None for score in scores[:-1]))
+        # candidates are left as they were
+        self.assertEqual(candidates[1][0][1], 11)
+
+    def test_score_plays_first_play(self):
+        game = Game()
+        tiles = [Tile(letter, 1) for letter in "AEINRST"]
+        candidates = [[(7, 4 + i, tile) for i, tile in enumerate(tiles)],
+                      [(7, 7, self.A)],
+                      [(6, 6, self.A), (6, 7, self.B)]]
+        self.assertEqual(game.score_plays(candidates),
+                         self.play_scores(game, candidates))
+        self.assertEqual(game.score_plays(candidates)[0], 64)
+
+    def test_score_plays_vectorize(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("NumPy is not installed")
+        game = self.scored_game()
+        candidates = [[(7, 10, self.L), (7, 11, Tile('E', 1))],
+                      [(8, 8, self.B), (9, 8, self.A), (10, 8, self.R)],
+                      [(8, 10, self.A)], [(6, 9, self.A), (8, 9, self.A)]]
+        self.assertEqual(game.score_plays(candidates, vectorize=True),
+                         game.score_plays(candidates))
+        self.assertEqual(game.score_plays([], vectorize=True), [])
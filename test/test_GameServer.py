@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import asyncio
+import json
+import unittest
+
+from scrabb.server import GameServer
+from scrabb.tile import Tile
+
+from .helpers import WORDS
+
+
+class GameServerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = GameServer(WORDS, workers=0)
+        port = await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection(
+            '127.0.0.1', port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.server.close()
+
+    async def request(self, **request):
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def new_game(self):
+        response = await self.request(cmd="new", players=["ann", "bob"],
+                                      seed=1)
+        game = response["game"]
+        # give ann a rack we know
+        self.server.games[game].players[0].rack = [
+            Tile(letter, 1) for letter in "TANSEIT"]
+        return game
+
+    async def test_new_game(self):
+        response = await self.request(cmd="new", players=["ann", "bob"],
+                                      id=7)
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["id"], 7)
+        self.assertEqual(response["player"], "ann")
+        self.assertEqual(len(response["rack"]), 7)
+        self.assertEqual(response["bag"], 86)
+        self.assertListEqual(response["scores"], [0, 0])
+        self.assertEqual(response["board"][7], "." * 15)
+
+    async def test_play(self):
+        game = await self.new_game()
+        response = await self.request(cmd="play", game=game,
+                                      tiles=[[7, 7, "A"], [7, 8, "T"]])
+        self.assertTrue(response["ok"], response)
+        self.assertEqual(response["score"], 4)
+        self.assertEqual(response["player"], "bob")
+        self.assertListEqual(response["scores"], [4, 0])
+        self.assertEqual(response["board"][7][7:9], "AT")
+
+        response = await self.request(cmd="undo", game=game)
+        self.assertEqual(response["player"], "ann")
+        self.assertEqual(response["board"][7], "." * 15)
+
+    async def test_play_invalid(self):
+        game = await self.new_game()
+        response = await self.request(cmd="play", game=game,
+                                      tiles=[[7, 7, "T"], [7, 8, "T"]])
+        self.assertFalse(response["ok"])
+        self.assertEqual(response["error"], "INVALID_WORD")
+        response = await self.request(cmd="play", game=game,
+                                      tiles=[[7, 7, "Z"], [7, 8, "A"]])
+        self.assertEqual(response["error"], "TILES_NOT_IN_RACK")
+        response = await self.request(cmd="play", game=game,
+                                      tiles=[[7, 20, "A"]])
+        self.assertEqual(response["error"], "tiles must be on the board")
+        response = await self.request(cmd="play", game=game, tiles=[7])
+        self.assertEqual(response["error"], "tiles must be [row, col, letter]")
+
+    async def test_exchange_and_pass(self):
+        game = await self.new_game()
+        response = await self.request(cmd="exchange", game=game,
+                                      tiles=["T", "T"])
+        self.assertTrue(response["ok"], response)
+        self.assertEqual(response["player"], "bob")
+        self.assertEqual(response["bag"], 86)
+        response = await self.request(cmd="pass", game=game)
+        self.assertEqual(response["player"], "ann")
+        self.assertEqual(response["turn"], 2)
+
+    async def test_hint(self):
+        game = await self.new_game()
+        response = await self.request(cmd="hint", game=game, count=3)
+        self.assertTrue(response["ok"], response)
+        self.assertEqual(len(response["moves"]), 3)
+        best = response["moves"][0]
+        response = await self.request(cmd="play", game=game,
+                                      tiles=best["tiles"])
+        self.assertEqual(response["score"], best["score"])
+
+    async def test_hint_workers(self):
+        # the worker processes get the lexicon once, when they start
+        server = GameServer(WORDS, workers=1)
+        await server.start()
+        try:
+            game = server.new_game(["ann"], 1)["game"]
+            server.games[game].players[0].rack = [
+                Tile(letter, 1) for letter in "TANSEIT"]
+            response = await server.hint({"game": game, "count": 2})
+            self.assertEqual(response["moves"], (await self.server.hint(
+                {"game": await self.new_game(), "count": 2}))["moves"])
+        finally:
+            await server.close()
+
+    async def test_exchange_nothing(self):
+        game = await self.new_game()
+        response = await self.request(cmd="exchange", game=game, tiles=[])
+        self.assertEqual(response["error"], "no tiles to exchange")
+        response = await self.request(cmd="state", game=game)
+        self.assertEqual(response["turn"], 0)
+
+    async def test_request_too_long(self):
+        self.writer.write(b"x" * 2 ** 17 + b"\n")
+        response = json.loads(await self.reader.readline())
+        self.assertEqual(response["error"], "request too long")
+        # the rest of the line is dropped, and the next one read as usual
+        response = await self.request(cmd="new", players=["a"])
+        self.assertTrue(response["ok"])
+
+    async def test_errors(self):
+        self.writer.write(b"not json\n")
+        self.assertEqual(json.loads(await self.reader.readline())["error"],
+                         "bad json")
+        response = await self.request(cmd="state", game=99)
+        self.assertEqual(response["error"], "no game 99")
+        game = await self.new_game()
+        response = await self.request(cmd="dance", game=game)
+        self.assertEqual(response["error"], "unknown command dance")
+        response = await self.request(cmd="undo", game=game)
+        self.assertEqual(response["error"], "nothing to undo")
+        response = await self.request(cmd="end", game=game)
+        self.assertTrue(response["ok"])
+        self.assertNotIn(game, self.server.games)
+
+    async def test_malformed_requests(self):
+        for request, error in [
+                (dict(cmd="state", game=[1]), "game must be a number"),
+                (dict(cmd="hint", game="1"), "game must be a number"),
+                (dict(cmd="new"), "no players"),
+                (dict(cmd="new", players=[]), "no players"),
+                (dict(cmd="new", players=5),
+                 "players must be a list of names"),
+                (dict(cmd="new", players="ab"),
+                 "players must be a list of names"),
+                (dict(cmd="new", players=["a", 1]),
+                 "players must be a list of names"),
+                (dict(cmd="new", players=["a"], seed=[1]),
+                 "seed must be a number or a string")]:
+            response = await self.request(**request)
+            self.assertFalse(response["ok"], request)
+            self.assertEqual(response["error"], error)
+        # the connection is still open
+        response = await self.request(cmd="new", players=["a"], seed="x")
+        self.assertTrue(response["ok"])
+
+    async def test_many_games(self):
+        games = [(await self.request(cmd="new", players=["a", "b"]))["game"]
+                 for _ in range(50)]
+        self.assertEqual(len(set(games)), 50)
+        self.assertEqual(len(self.server.games), 50)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import io
+import os
+import tempfile
+import unittest
+
+from scrabb.gcg import MoveKind, read_gcg, replay, replay_files
+from scrabb.gcg import _chunks, tile_positions
+from scrabb.lexicon import Lexicon
+from scrabb.board import Board
+from scrabb.tile import Tile
+
+
+GAME = """#character-encoding UTF-8
+#player1 ann Ann Smith
+#player2 bob Bob Jones
+>ann: ACTIRSE 8G CAT +10 10
+#note a quiet start
+>bob: AETNOQX H7 T.E +3 3
+>ann: IRSEQDD -QDD +0 10
+>bob: ANOQXSU - +0 3
+>ann: IRSEABC 9I ZeBRA +48 58
+>ann: IRSEABC -- -48 10
+>bob: ANOQXSU 9F QA. +18 21
+>ann: IRSEABC (challenge) +5 15
+>bob: ANOQXSU (time) -10 11
+>bob: (ABC) +14 25
+"""
+
+
+class GcgTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tempdir.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_read(self):
+        records = list(read_gcg(io.StringIO(GAME)))
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertListEqual(record.players, ["ann", "bob"])
+        self.assertEqual(record.pragmas["note"], "a quiet start")
+        self.assertListEqual([move.kind for move in record.moves], [
+            MoveKind.PLAY, MoveKind.PLAY, MoveKind.EXCHANGE, MoveKind.PASS,
+            MoveKind.PLAY, MoveKind.WITHDRAWN, MoveKind.PLAY,
+            MoveKind.CHALLENGE_BONUS, MoveKind.TIME_PENALTY,
+            MoveKind.END_RACK_POINTS])
+        self.assertEqual(record.moves[2].tiles, "QDD")
+        self.assertEqual(record.moves[1].line, 6)
+
+    def test_read_many(self):
+        text = GAME + GAME.replace("ann", "cat")
+        records = list(read_gcg(io.StringIO(text)))
+        self.assertEqual(len(records), 2)
+        self.assertListEqual(records[1].players, ["cat", "bob"])
+        self.assertEqual(records[1].line, 15)
+
+    def test_read_bad_line(self):
+        record = next(read_gcg(["#player1 ann", ">ann: what"]))
+        self.assertEqual(record.errors[0][0], 2)
+
+    def test_tile_positions(self):
+        board = Board()
+        board.place_tiles([(7, 7, Tile('A', 1))])
+        self.assertListEqual(tile_positions(board, "8G", "C.T"),
+                             [(7, 6, Tile('C', 3)), (7, 8, Tile('T', 1))])
+        self.assertListEqual(tile_positions(board, "H7", "s(A)"),
+                             [(6, 7, Tile('s', 0))])
+        for position, word in [("8H", "AT"), ("8G", "CAT."), ("8N", "ABC"),
+                               ("8G", "C1T"), ("Z9", "AT")]:
+            with self.assertRaises(ValueError):
+                tile_positions(board, position, word)
+
+    def test_replay(self):
+        result = replay(next(read_gcg(io.StringIO(GAME))))
+        self.assertListEqual(result.errors, [])
+        self.assertListEqual(result.scores, [15, 25])
+
+    def test_replay_bad_scores(self):
+        text = GAME.replace("8G CAT +10 10", "8G CAT +12 10")
+        result = replay(next(read_gcg(io.StringIO(text))))
+        self.assertListEqual(result.errors, [
+            (4, "8G CAT scores 10, not 12"), (4, "ann has 12, not 10")])
+
+    def test_replay_invalid_play(self):
+        text = GAME.replace("H7 T.E", "H9 T.E")
+        result = replay(next(read_gcg(io.StringIO(text))))
+        self.assertEqual(result.errors[0][0], 6)
+
+    def test_replay_lexicon(self):
+        lexicon = Lexicon.from_words(["CAT", "TAE", "QAT", "CA"])
+        result = replay(next(read_gcg(io.StringIO(GAME))), lexicon)
+        # ZEBRA was withdrawn, QAE stood
+        self.assertListEqual(result.errors, [(11, "QAE is not a word")])
+
+    def test_chunks_blank_lines(self):
+        # games apart from each other by blank lines are split between
+        # them too
+        path = self.write("spaced.gcg", "\n\n".join([GAME] * 10))
+        chunks = _chunks(path, 500)
+        self.assertGreater(len(chunks), 1)
+        with open(path, "rb") as f:
+            for _, start, end in chunks:
+                f.seek(start)
+                self.assertTrue(f.readline().startswith(
+                    b"#character-encoding"))
+        result = replay_files([path], workers=0, chunk_bytes=500)
+        self.assertEqual(result.games, 10)
+        self.assertEqual(result.moves, 100)
+        self.assertListEqual(result.errors, [])
+
+    def test_replay_files(self):
+        good = self.write("good.gcg", GAME * 20)
+        bad = self.write("bad.gcg", GAME * 3 + GAME.replace("+3 3", "+4 3"))
+        for workers in (0, 2):
+            result = replay_files([good, bad], workers=workers,
+                                  chunk_bytes=500)
+            self.assertEqual(result.games, 24)
+            self.assertEqual(result.moves, 240)
+            self.assertListEqual(result.errors, [
+                (bad, 48, "H7 T.E scores 3, not 4"),
+                (bad, 48, "bob has 4, not 3")])
+            self.assertGreater(result.games_per_second, 0)
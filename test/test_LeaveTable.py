@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import os
+import pickle
+import tempfile
+import unittest
+
+from scrabb.leaves import InvalidLeaveException, InvalidLeaveTableException
+from scrabb.leaves import LeaveTable, all_leaves, heuristic_value
+from scrabb.leaves import leave_index, num_leaves
+from scrabb.movegen import MoveGenerator
+from scrabb.scrabb import Game
+from scrabb.tile import Tile
+
+from .helpers import tiles
+
+
+class LeaveTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.table = LeaveTable.default(3)
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, "leaves.bin")
+
+    def tearDown(self):
+        self.table.close()
+        self.tempdir.cleanup()
+
+    def test_num_leaves(self):
+        self.assertEqual(num_leaves(0), 1)
+        self.assertEqual(num_leaves(1), 28)
+        self.assertEqual(num_leaves(), 914625)
+        self.assertEqual(len(self.table), num_leaves(3))
+
+    def test_index_dense(self):
+        indices = sorted(leave_index(leave) for leave in all_leaves(3))
+        self.assertListEqual(indices, list(range(num_leaves(3))))
+
+    def test_index_order(self):
+        self.assertEqual(leave_index(tiles("SEA")), leave_index(tiles("AES")))
+        # a blank played as a letter is still a blank on the rack
+        self.assertEqual(leave_index([Tile('e', 0)]), leave_index(tiles(" ")))
+        self.assertEqual(leave_index([]), 0)
+
+    def test_index_invalid(self):
+        with self.assertRaises(InvalidLeaveException):
+            leave_index(tiles("JJ"))
+        with self.assertRaises(InvalidLeaveException):
+            leave_index([Tile('A', 7)])
+        with self.assertRaises(InvalidLeaveException):
+            leave_index(tiles("AEIOUST"))
+
+    def test_value(self):
+        self.assertEqual(self.table.value(tiles("S")), heuristic_value(
+            tiles("S")))
+        self.assertEqual(self.table[tiles("ES")], self.table.value(
+            tiles("SE")))
+        self.assertGreater(self.table.value(tiles("QU")),
+                           self.table.value(tiles("Q")))
+        # longer leaves than the table holds are worth nothing
+        self.assertEqual(self.table.value(tiles("ERST")), 0)
+
+    def test_fallback(self):
+        table = LeaveTable.default(2, heuristic_value)
+        self.assertEqual(table.value(tiles("ERST")),
+                         heuristic_value(tiles("ERST")))
+        self.assertEqual(table.value(tiles("ES")), self.table.value(
+            tiles("ES")))
+        copy = pickle.loads(pickle.dumps(table))
+        self.assertEqual(copy.value(tiles("QUIT")),
+                         heuristic_value(tiles("QUIT")))
+        table.save(self.path)
+        loaded = LeaveTable.load(self.path, len)
+        self.assertEqual(loaded.value(tiles("ERST")), 4)
+        self.assertEqual(pickle.loads(pickle.dumps(loaded)).value(
+            tiles("ERS")), 3)
+        loaded.close()
+
+    def test_from_function(self):
+        table = LeaveTable.from_function(len, 2)
+        self.assertEqual(table.value(tiles("QU")), 2)
+        self.assertEqual(table.value([]), 0)
+
+    def test_leave_value(self):
+        rack = tiles("SATI ")
+        play = [(7, 7, Tile('T', 1)), (7, 8, Tile('i', 0))]
+        self.assertEqual(self.table.leave_value(rack, play),
+                         heuristic_value(tiles("SAI")))
+
+    def test_save_load(self):
+        self.table.save(self.path)
+        table = LeaveTable.load(self.path)
+        self.assertEqual(table.max_size, 3)
+        self.assertEqual(len(table), len(self.table))
+        self.assertEqual(table.value(tiles("S E")),
+                         self.table.value(tiles("S E")))
+        copy = pickle.loads(pickle.dumps(table))
+        self.assertEqual(copy.path, self.path)
+        self.assertEqual(copy.value(tiles("Z")), table.value(tiles("Z")))
+        copy.close()
+        table.close()
+
+    def test_pickle_in_memory(self):
+        copy = pickle.loads(pickle.dumps(self.table))
+        self.assertEqual(copy.value(tiles("XYZ")),
+                         self.table.value(tiles("XYZ")))
+
+    def test_load_invalid(self):
+        with open(self.path, 'wb') as f:
+            f.write(b"not a leave table")
+        with self.assertRaises(InvalidLeaveTableException):
+            LeaveTable.load(self.path)
+
+    def test_generate_with_leaves(self):
+        game = Game()
+        game.board.place_tiles([(7, 7, Tile('A', 1))])
+        rack = tiles("ES")
+        table = LeaveTable.default(1)
+        by_score = MoveGenerator(game).generate(rack)
+        moves = MoveGenerator(game).generate(rack, table)
+        self.assertEqual(len(moves[0][1]), 1)
+        self.assertGreater(by_score[0][0], moves[0][0])
+        self.assertEqual(table.leave_value(rack, moves[0][1]),
+                         table.value(tiles("S")))
+
+    def test_iter_moves_with_leaves(self):
+        game = Game()
+        game.board.place_tiles([(7, 7, Tile('A', 1))])
+        rack = tiles("ES")
+        table = LeaveTable.default(1)
+        moves = MoveGenerator(game).generate(rack, table)
+        streamed = list(MoveGenerator(game).iter_moves(rack, table))
+        self.assertEqual(len(streamed), len(moves))
+        values = [score + table.leave_value(rack, tile_positions)
+                  for score, tile_positions in streamed]
+        self.assertEqual(values, sorted(values, reverse=True))
+        self.assertEqual(values[0], moves[0][0] +
+                         table.leave_value(rack, moves[0][1]))
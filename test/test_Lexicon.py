@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import os
+import pickle
+import tempfile
+import unittest
+
+from scrabb.board import Board
+from scrabb.lexicon import InvalidLexiconException, Lexicon
+from scrabb.movegen import MoveGenerator
+from scrabb.scrabb import Game, InvalidPlayException, ValidationReason
+from scrabb.tile import Tile
+
+
+class LexiconTest(unittest.TestCase):
+
+    WORDS = ["cat", "CATS", "bat", "bats", "at", "act", "acts", "Tab"]
+
+    def setUp(self):
+        self.lexicon = Lexicon.from_words(self.WORDS)
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, "words.dawg")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_contains(self):
+        for word in ["CAT", "CATS", "BAT", "BATS", "AT", "ACT", "ACTS",
+                     "TAB"]:
+            self.assertIn(word, self.lexicon)
+        for word in ["", "C", "CA", "TABS", "ATS", "DOG"]:
+            self.assertNotIn(word, self.lexicon)
+
+    def test_len_and_iter(self):
+        self.assertEqual(len(self.lexicon), 8)
+        self.assertListEqual(list(self.lexicon),
+                             sorted(w.upper() for w in self.WORDS))
+
+    def test_skips_invalid_words(self):
+        lexicon = Lexicon.from_words(["OK", "NO-GO", "CAFÉ", "  "])
+        self.assertListEqual(list(lexicon), ["OK"])
+
+    def test_minimized(self):
+        # CATS and BATS share every node after the first letter
+        lexicon = Lexicon.from_words(["CATS", "BATS"])
+        self.assertEqual(len(lexicon._edges), 1 + 2 + 1 + 1 + 1)
+
+    def test_empty(self):
+        lexicon = Lexicon.from_words([])
+        self.assertEqual(len(lexicon), 0)
+        self.assertNotIn("A", lexicon)
+        self.assertListEqual(lexicon.edges(lexicon.root), [])
+
+    def test_edges(self):
+        node = self.lexicon.child(self.lexicon.root, "C")
+        node = self.lexicon.child(node, "A")
+        self.assertListEqual([letter for letter, _ in
+                              self.lexicon.edges(node)], ["T"])
+        self.assertFalse(self.lexicon.is_word(node))
+        self.assertTrue(self.lexicon.is_word(
+            self.lexicon.child(node, "T")))
+
+    def test_save_load(self):
+        self.lexicon.save(self.path)
+        loaded = Lexicon.load(self.path)
+        self.assertListEqual(list(loaded), list(self.lexicon))
+        self.assertIn("BATS", loaded)
+        loaded.close()
+
+    def test_load_invalid(self):
+        with open(self.path, 'wb') as f:
+            f.write(b"not a lexicon at all")
+        with self.assertRaises(InvalidLexiconException):
+            Lexicon.load(self.path)
+
+    def test_load_empty_file(self):
+        open(self.path, 'wb').close()
+        with self.assertRaises(InvalidLexiconException):
+            Lexicon.load(self.path)
+
+    def test_pickle(self):
+        self.assertListEqual(list(pickle.loads(pickle.dumps(self.lexicon))),
+                             list(self.lexicon))
+        self.lexicon.save(self.path)
+        loaded = Lexicon.load(self.path)
+        copy = pickle.loads(pickle.dumps(loaded))
+        self.assertEqual(copy.path, self.path)
+        self.assertListEqual(list(copy), list(self.lexicon))
+        copy.close()
+        loaded.close()
+
+    def test_game_rejects_invalid_word(self):
+        game = Game(self.lexicon)
+        with self.assertRaises(InvalidPlayException) as e:
+            game.play_tiles([
+                (Board.MIDDLE[0], Board.MIDDLE[1], Tile('C', 3)),
+                (Board.MIDDLE[0], Board.MIDDLE[1]+1, Tile('T', 1))
+            ])
+        self.assertEqual(e.exception.valid_reason,
+                         ValidationReason.INVALID_WORD)
+        self.assertTrue(game.board.is_empty)
+
+    def test_game_accepts_blank(self):
+        game = Game(self.lexicon)
+        score = game.play_tiles([
+            (Board.MIDDLE[0], Board.MIDDLE[1], Tile('a', 0)),
+            (Board.MIDDLE[0], Board.MIDDLE[1]+1, Tile('T', 1))
+        ])
+        self.assertEqual(score, 2)
+
+    def test_move_generator_uses_game_lexicon(self):
+        game = Game(self.lexicon)
+        moves = MoveGenerator(game).generate(
+            [Tile('C', 3), Tile('A', 1), Tile('T', 1)])
+        words = {Game.word_string(positions) for _, positions in moves}
+        self.assertEqual(words, {"AT", "CAT", "ACT"})
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import pickle
+import unittest
+
+from scrabb.board import ACROSS, DOWN, Board
+from scrabb.leaves import LeaveTable
+from scrabb.lexicon import Lexicon
+from scrabb.move import InvalidMoveException, Move
+from scrabb.scrabb import Game, InvalidPlayException, Orientation
+from scrabb.scrabb import ValidationReason
+from scrabb.tile import BLANK, STANDARD_CODES, InvalidTileException, Tile
+from scrabb.tile import tile_code
+
+
+class MoveTest(unittest.TestCase):
+
+    C = Tile('C', 3)
+    A = Tile('A', 1)
+    T = Tile('T', 1)
+    S = Tile('S', 1)
+    WORDS = Lexicon.from_words(["CAT", "CATS", "AT", "TA", "ACT"])
+
+    def cat(self, row=7, col=7):
+        return [(row, col, self.C), (row, col + 1, self.A),
+                (row, col + 2, self.T)]
+
+    def test_from_tile_positions(self):
+        move = Move.from_tile_positions(list(reversed(self.cat())))
+        self.assertEqual(move.axis, ACROSS)
+        self.assertEqual(len(move), 3)
+        self.assertEqual(move[0], (7, 7, self.C))
+        self.assertEqual(move[-1], (7, 9, self.T))
+        self.assertEqual(list(move), self.cat())
+        self.assertEqual(move, self.cat())
+        self.assertEqual(move.tiles(), [self.C, self.A, self.T])
+        self.assertEqual(move.line_bits(), (7, 0b111 << 7))
+        down = Move.from_tile_positions([(8, 3, self.A), (7, 3, self.C)])
+        self.assertEqual(down.axis, DOWN)
+        self.assertEqual(down.line_bits(), (3, 0b11 << 7))
+
+    def test_from_tile_positions_invalid(self):
+        with self.assertRaises(InvalidMoveException):
+            Move.from_tile_positions([])
+        with self.assertRaises(InvalidMoveException):
+            Move.from_tile_positions([(7, 7, self.C), (8, 8, self.A)])
+
+    def test_init_invalid(self):
+        C = tile_code(self.C)
+        A = tile_code(self.A)
+        middle = 7 * Board.SIZE + 7
+        for axis, squares in [(ACROSS, [middle, middle + Board.SIZE + 1]),
+                              (ACROSS, [middle + 1, middle]),
+                              (ACROSS, [middle, middle]),
+                              (DOWN, [middle, middle + 1]),
+                              (ACROSS, [14, 15]),
+                              (DOWN, [middle, Board.SIZE ** 2 + 7]),
+                              (2, [middle, middle + 1]),
+                              (ACROSS, [(7, 7), (7, 8)])]:
+            with self.assertRaises(InvalidMoveException):
+                Move(axis, squares, [C, A])
+        with self.assertRaises(InvalidMoveException):
+            Move(ACROSS, [middle, middle + 1], [C])
+        with self.assertRaises(InvalidMoveException):
+            Move(ACROSS, [], [])
+        down = Move(DOWN, [middle, middle + Board.SIZE], [C, A])
+        self.assertEqual(list(down), [(7, 7, self.C), (8, 7, self.A)])
+
+    def test_hash_and_pickle(self):
+        move = Move.from_tile_positions(self.cat())
+        self.assertEqual(len({move, Move.from_tile_positions(self.cat())}),
+                         1)
+        self.assertEqual(move, tuple(self.cat()))
+        self.assertEqual(hash(move), hash(tuple(self.cat())))
+        self.assertEqual(Move.from_tile_positions([(7, 7, self.A)]),
+                         Move(DOWN, [7 * Board.SIZE + 7], [tile_code(self.A)]))
+        self.assertEqual(pickle.loads(pickle.dumps(move)), move)
+        # only the standard tiles have codes
+        with self.assertRaises(InvalidTileException):
+            Move.from_tile_positions([(7, 7, Tile('*', 5)),
+                                      (7, 8, Tile('e', 0))])
+        with self.assertRaises(InvalidMoveException):
+            Move(ACROSS, [7 * Board.SIZE + 7], [STANDARD_CODES])
+        with self.assertRaises(AttributeError):
+            move.extra = 1
+
+    def test_play_tiles(self):
+        game = Game(self.WORDS)
+        move = Move.from_tile_positions(self.cat())
+        self.assertEqual(game.get_orientation(move), Orientation.HORIZONTAL)
+        self.assertEqual(game.score_plays([move]), [10])
+        self.assertEqual(game.play_tiles(move), 10)
+        self.assertEqual(game.board.tile(7, 9), self.T)
+        self.assertEqual(game.play_tiles(
+            Move.from_tile_positions([(7, 10, self.S)])), 6)
+
+    def test_play_tiles_invalid(self):
+        game = Game(self.WORDS)
+        with self.assertRaises(InvalidPlayException) as e:
+            game.play_tiles(Move.from_tile_positions(self.cat(6)))
+        self.assertEqual(e.exception.valid_reason,
+                         ValidationReason.FIRST_PLAY_NOT_ON_MIDDLE_CELL)
+        game.play_tiles(Move.from_tile_positions(self.cat()))
+        gap = Move.from_tile_positions([(Board.MIDDLE[0] + 1, 3, self.A),
+                                        (Board.MIDDLE[0] + 1, 5, self.T)])
+        self.assertEqual(game.is_valid_play(gap, Orientation.HORIZONTAL),
+                         ValidationReason.NOT_ADJACENT)
+        self.assertEqual(game.score_plays([gap]), [None])
+        # a play is only checked along the line it's said to be on
+        self.assertEqual(game.is_valid_play([(8, 10, self.S), (9, 11, self.S)],
+                                            Orientation.HORIZONTAL),
+                         ValidationReason.INVALID_ORIENTATION)
+        down = Move.from_tile_positions([(8, 10, self.S), (9, 10, self.A)])
+        self.assertEqual(game.is_valid_play(down, Orientation.HORIZONTAL),
+                         ValidationReason.INVALID_ORIENTATION)
+
+    def test_leave_value(self):
+        table = LeaveTable.default(1)
+        rack = [self.C, self.A, self.T, BLANK]
+        move = Move.from_tile_positions(self.cat())
+        self.assertEqual(table.leave_value(rack, move),
+                         table.value([BLANK]))
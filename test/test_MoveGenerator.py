@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import copy
+import itertools
+import unittest
+
+from scrabb.board import Board
+from scrabb.movegen import MoveGenerator
+from scrabb.scrabb import Game
+from scrabb.tile import Tile
+
+
+class WordSet:
+    # minimal trie lexicon for the tests
+
+    def __init__(self, words):
+        self.root = {}
+        for word in words:
+            node = self.root
+            for letter in word:
+                node = node.setdefault(letter, {})
+            node['$'] = True
+
+    def child(self, node, letter):
+        return node.get(letter)
+
+    def edges(self, node):
+        return [(k, v) for k, v in node.items() if k != '$']
+
+    def is_word(self, node):
+        return '$' in node
+
+    def __contains__(self, word):
+        node = self.root
+        for letter in word:
+            node = node.get(letter)
+            if node is None:
+                return False
+        return '$' in node
+
+
+class MoveGeneratorTest(unittest.TestCase):
+
+    A = Tile('A', 1)
+    C = Tile('C', 3)
+    E = Tile('E', 1)
+    S = Tile('S', 1)
+    T = Tile('T', 1)
+    BLANK = Tile(' ', 0)
+
+    WORDS = WordSet(["AT", "CAT", "CATS", "ACT", "ACTS", "SAT", "EAT",
+                     "EATS", "TEA", "TEAS", "SEA", "SET", "TA", "AS"])
+
+    def assertScoresMatchGame(self, game, moves):
+        for score, tile_positions in moves:
+            trial = copy.deepcopy(game)
+            self.assertEqual(trial.play_tiles(list(tile_positions)), score,
+                             tile_positions)
+
+    def test_generate_first_play_any_word(self):
+        game = Game()
+        moves = MoveGenerator(game).generate([self.A, self.C])
+        # two squares either side of the middle, in both orders and
+        # both directions
+        self.assertEqual(len(moves), 8)
+        self.assertScoresMatchGame(game, moves)
+
+    def test_generate_first_play_lexicon(self):
+        game = Game(self.WORDS)
+        moves = MoveGenerator(game).generate(
+            [self.C, self.A, self.T])
+        words = {"".join(t.letter for _, _, t in positions)
+                 for _, positions in moves}
+        self.assertEqual(words, {"AT", "CAT", "ACT", "TA"})
+        self.assertTrue(all(
+            any((r, c) == Board.MIDDLE for r, c, _ in positions)
+            for _, positions in moves))
+        self.assertScoresMatchGame(game, moves)
+
+    def test_generate_hooks_and_cross_words(self):
+        game = Game(self.WORDS)
+        game.play_tiles([
+            (Board.MIDDLE[0], Board.MIDDLE[1], self.C),
+            (Board.MIDDLE[0], Board.MIDDLE[1]+1, self.A),
+            (Board.MIDDLE[0], Board.MIDDLE[1]+2, self.T)
+        ])
+        moves = MoveGenerator(game).generate(
+            [self.S, self.E, self.A, self.T])
+        self.assertIn([(Board.MIDDLE[0], Board.MIDDLE[1]+3, self.S)],
+                      [positions for _, positions in moves])
+        for _, positions in moves:
+            for word in game.find_words(
+                    game.get_orientation(positions), positions):
+                self.assertIn("".join(t.letter for _, _, t in word),
+                              self.WORDS)
+        self.assertScoresMatchGame(game, moves)
+
+    def test_generate_blank(self):
+        game = Game(self.WORDS)
+        moves = MoveGenerator(game).generate(
+            [self.BLANK, self.T])
+        words = {"".join(t.letter for _, _, t in positions)
+                 for _, positions in moves}
+        self.assertEqual(words, {"aT", "Ta"})
+        self.assertTrue(all(score == 2 for score, _ in moves))
+
+    def test_generate_sorted_best_first(self):
+        game = Game(self.WORDS)
+        moves = MoveGenerator(game).generate(
+            [self.C, self.A, self.T, self.S])
+        scores = [score for score, _ in moves]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_generate_no_moves(self):
+        game = Game(self.WORDS)
+        moves = MoveGenerator(game).generate([self.C])
+        self.assertListEqual(moves, [])
+
+    def test_iter_moves(self):
+        game = Game(self.WORDS)
+        game.play_tiles([
+            (Board.MIDDLE[0], Board.MIDDLE[1], self.C),
+            (Board.MIDDLE[0], Board.MIDDLE[1]+1, self.A),
+            (Board.MIDDLE[0], Board.MIDDLE[1]+2, self.T)
+        ])
+        rack = [self.S, self.E, self.A, self.T, self.BLANK]
+        generator = MoveGenerator(game)
+        moves = generator.generate(rack)
+        streamed = list(generator.iter_moves(rack))
+        self.assertEqual(sorted(moves, key=repr), sorted(streamed, key=repr))
+        scores = [score for score, _ in streamed]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertScoresMatchGame(game, streamed[:20])
+
+    def test_iter_moves_top(self):
+        game = Game(self.WORDS)
+        rack = [self.C, self.A, self.T, self.S]
+        moves = MoveGenerator(game).generate(rack)
+        top = list(itertools.islice(game.iter_moves(rack), 3))
+        self.assertEqual([score for score, _ in top],
+                         [score for score, _ in moves[:3]])
+
+    def test_iter_moves_bound(self):
+        # no play from an anchor scores more than its bound
+        game = Game(self.WORDS)
+        game.play_tiles([
+            (Board.MIDDLE[0], Board.MIDDLE[1], self.C),
+            (Board.MIDDLE[0], Board.MIDDLE[1]+1, self.A),
+            (Board.MIDDLE[0], Board.MIDDLE[1]+2, self.T)
+        ])
+        rack = [self.S, self.E, self.A, self.T]
+        moves = []
+        searches = MoveGenerator(game)._searches(rack, moves)
+        for search, anchors, anchor_set in searches:
+            search.prepare_bounds()
+            for anchor in anchors:
+                search.generate(anchor, anchor_set)
+                bound = search.bound(anchor, anchor_set)
+                if bound is None:
+                    self.assertEqual(moves, [])
+                for score, tile_positions in moves:
+                    self.assertLessEqual(score, bound, tile_positions)
+                moves.clear()
+
+    def test_iter_moves_skips_dead_anchors(self):
+        # no C makes a word down through the squares above and below CAT,
+        # so the rows there have nothing to search
+        game = Game(self.WORDS)
+        game.play_tiles([
+            (Board.MIDDLE[0], Board.MIDDLE[1], self.C),
+            (Board.MIDDLE[0], Board.MIDDLE[1]+1, self.A),
+            (Board.MIDDLE[0], Board.MIDDLE[1]+2, self.T)
+        ])
+        rack = [self.C, self.C]
+        moves = []
+        rows = 0
+        for search, anchors, anchor_set in MoveGenerator(game)._searches(
+                rack, moves):
+            search.prepare_bounds()
+            if not search.vertical and search.line != Board.MIDDLE[0]:
+                rows += 1
+                for anchor in anchors:
+                    self.assertIsNone(search.bound(anchor, anchor_set))
+        self.assertEqual(rows, 2)
+        self.assertEqual(list(game.iter_moves(rack)),
+                         MoveGenerator(game).generate(rack))
+
+    def test_iter_moves_no_moves(self):
+        game = Game(self.WORDS)
+        self.assertEqual(list(game.iter_moves([self.C])), [])
+        self.assertEqual(list(game.iter_moves([])), [])
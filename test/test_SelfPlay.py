@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import io
+import json
+import unittest
+
+from scrabb.leaves import LeaveTable
+from scrabb.lexicon import Lexicon
+from scrabb.scrabb import Turn
+from scrabb.selfplay import Latencies, equity, greedy, play_game, run_games
+
+from .helpers import WORD_LIST
+
+
+def passer(game, leaves):
+    return Turn.PASS, None
+
+
+class SelfPlayTest(unittest.TestCase):
+
+    WORDS = Lexicon.from_words(WORD_LIST + ["OE", "RE", "ER", "ES", "IS",
+                                            "SO", "OR", "DO"])
+    LEAVES = LeaveTable.default(2)
+
+    def test_play_game(self):
+        latencies = Latencies()
+        record = play_game([greedy, equity], "7", self.WORDS, self.LEAVES,
+                           latencies)
+        self.assertEqual(record["turns"], record["plays"] +
+                         record["exchanges"] + record["passes"])
+        self.assertGreater(record["plays"], 0)
+        self.assertEqual(latencies.count("choose"), record["turns"])
+        self.assertEqual(latencies.count("place_tiles"), record["plays"])
+        again = play_game([greedy, equity], "7", self.WORDS, self.LEAVES)
+        self.assertEqual(again["scores"], record["scores"])
+
+    def test_scoreless_turns(self):
+        record = play_game([passer, passer], "1", self.WORDS, self.LEAVES)
+        self.assertEqual(record["passes"], 6)
+        # both lose the value of their racks
+        self.assertTrue(all(score < 0 for score in record["scores"]))
+
+    def test_run_games(self):
+        output = io.StringIO()
+        result = run_games(3, ["greedy", passer], self.WORDS, self.LEAVES,
+                           workers=0, seed=5, output=output)
+        self.assertEqual(result.games, 3)
+        self.assertEqual(sum(result.wins) + result.ties, 3)
+        records = [json.loads(line) for line in
+                   output.getvalue().splitlines()]
+        self.assertEqual([record["game"] for record in records], [0, 1, 2])
+        self.assertEqual(records[1]["bots"], ["passer", "greedy"])
+        self.assertEqual(result.moves,
+                         sum(record["turns"] for record in records))
+        self.assertGreater(result.games_per_second, 0)
+        self.assertIn("choose", result.latencies.summary())
+
+    def test_latencies(self):
+        latencies = Latencies()
+        for ms in range(1, 101):
+            latencies.add("phase", ms / 1000)
+        other = Latencies()
+        other.merge(latencies)
+        self.assertEqual(other.count("phase"), 100)
+        self.assertAlmostEqual(other.percentile("phase", 50), 0.05,
+                               delta=0.006)
+        self.assertAlmostEqual(other.percentile("phase", 99), 0.099,
+                               delta=0.011)
+        self.assertIsNone(other.percentile("missing", 50))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import unittest
+
+from scrabb.scrabb import Game
+from scrabb.simulate import simulate, unseen_tiles
+from scrabb.tile import Tile
+
+from .helpers import WORDS
+
+
+class SimulateTest(unittest.TestCase):
+
+    def new_game(self):
+        game = Game(WORDS, seed=11)
+        game.add_player("one")
+        game.add_player("two")
+        game.current_player.rack = [Tile(letter, 1) for letter in "TANSEIR"]
+        return game
+
+    def test_unseen_tiles(self):
+        game = self.new_game()
+        unseen = unseen_tiles(game)
+        self.assertEqual(len(unseen), len(game.tile_bag) + 7)
+        self.assertEqual(len(unseen_tiles(game, game.players[1])),
+                         len(game.tile_bag) + 7)
+
+    def test_simulate(self):
+        game = self.new_game()
+        results = simulate(game, top=3, iterations=20, workers=0)
+        self.assertEqual(len(results), 3)
+        equities = [result.equity for result in results]
+        self.assertListEqual(equities, sorted(equities, reverse=True))
+        for result in results:
+            self.assertEqual(result.iterations, 20)
+            self.assertGreaterEqual(result.equity_error, 0)
+            self.assertTrue(0 <= result.win_rate <= 1)
+        # the position itself is untouched
+        self.assertTrue(game.board.is_empty)
+        self.assertEqual(len(game.current_player.rack), 7)
+
+    def test_simulate_candidates(self):
+        game = self.new_game()
+        rack = game.current_player.rack
+        play = [(7, 7, rack[0]), (7, 8, rack[1])]
+        results = simulate(game, candidates=[play], iterations=5, plies=0,
+                           workers=0)
+        self.assertEqual(results[0].score, 4)
+        self.assertEqual(results[0].equity, 4)
+        self.assertEqual(results[0].equity_error, 0)
+        self.assertEqual(results[0].win_rate, 1)
+
+    def test_simulate_deterministic(self):
+        game = self.new_game()
+        local = simulate(game, top=2, iterations=60, workers=0, seed=3)
+        pooled = simulate(game, top=2, iterations=60, workers=2, seed=3)
+        self.assertListEqual(local, pooled)
+        other = simulate(game, top=2, iterations=60, workers=0, seed=4)
+        self.assertNotEqual([r.equity for r in local],
+                            [r.equity for r in other])
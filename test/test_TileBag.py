@@ -5,7 +5,7 @@
 # Contact: chris@cplyon.ca
 
 import unittest
-from scrabb.tile import Tile
+from scrabb.tile import InvalidTileException, Tile, letter_tile
 from scrabb.tilebag import NotEnoughTilesException, TileBag
 
 
@@ -35,11 +35,18 @@ class TileBagTest(unittest.TestCase):
 
     def test_exchange_tiles_full(self):
         tb = TileBag()
-        to_exchange = [self.FAKE_TILE for _ in range(7)]
+        to_exchange = [Tile('Z', 10) for _ in range(7)]
         drawn_tiles = tb.exchange_tiles(to_exchange)
         self.assertEqual(len(drawn_tiles), 7)
         self.assertEqual(len(tb), 100)
-        self.assertTrue(tb._tiles.issuperset(to_exchange))
+        self.assertEqual(tb.count(Tile('Z', 10)),
+                         8 - drawn_tiles.count(Tile('Z', 10)))
+
+    def test_exchange_tiles_invalid(self):
+        tb = TileBag()
+        with self.assertRaises(InvalidTileException):
+            tb.exchange_tiles([self.FAKE_TILE])
+        self.assertEqual(len(tb), 100)
 
     def test_echange_tiles_not_enough(self):
         tb = TileBag()
@@ -47,3 +54,34 @@ class TileBagTest(unittest.TestCase):
         to_exchange = [self.FAKE_TILE for _ in range(7)]
         with self.assertRaises(NotEnoughTilesException):
             tb.exchange_tiles(to_exchange)
+
+    def test_populate_tiles(self):
+        tb = TileBag()
+        self.assertEqual(tb.count(Tile('E', 1)), 12)
+        self.assertEqual(tb.count(Tile('Q', 10)), 1)
+        self.assertEqual(tb.count(Tile(' ', 0)), 2)
+
+    def test_draw_tiles_all(self):
+        tb = TileBag()
+        tiles = tb.draw_tiles(200)
+        self.assertEqual(len(tiles), 100)
+        self.assertEqual(len(tb), 0)
+        self.assertEqual(tiles.count(Tile('E', 1)), 12)
+
+    def test_draw_tiles_seeded(self):
+        first = TileBag(seed=42)
+        second = TileBag(seed=42)
+        # another bag drawing in between doesn't disturb either
+        TileBag().draw_tiles(50)
+        self.assertListEqual(first.draw_tiles(7), second.draw_tiles(7))
+        self.assertListEqual(first.exchange_tiles(first.draw_tiles(3)),
+                             second.exchange_tiles(second.draw_tiles(3)))
+
+    def test_interned_tiles(self):
+        tb = TileBag()
+        tiles = tb.tiles()
+        self.assertIs(tiles[0], letter_tile('A'))
+        self.assertEqual(tiles.count(letter_tile(' ')), 2)
+        self.assertEqual(letter_tile('e'), Tile('e', 0))
+        self.assertIsNone(letter_tile('*'))
+        self.assertEqual(len(tb.codes()), 100)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import math
+import unittest
+
+from scrabb.scrabb import Game
+from scrabb.tile import BLANK, Tile
+from scrabb.tracker import FULL_BAG, InvalidTileException, TileTracker
+from scrabb.tracker import hypergeometric_tail
+
+from .helpers import tiles
+
+
+class TileTrackerTest(unittest.TestCase):
+
+    def test_full_bag(self):
+        tracker = TileTracker()
+        self.assertEqual(len(tracker), FULL_BAG)
+        self.assertEqual(tracker.count(tiles("E")[0]), 12)
+        self.assertEqual(tracker.count(BLANK), 2)
+        self.assertEqual(len(tracker.tiles()), FULL_BAG)
+
+    def test_see(self):
+        tracker = TileTracker(tiles("QUEENS "))
+        self.assertEqual(len(tracker), FULL_BAG - 7)
+        self.assertEqual(tracker.count(tiles("Q")[0]), 0)
+        self.assertEqual(tracker.count(tiles("E")[0]), 10)
+        # a blank played as a letter is a blank
+        tracker.see([Tile('s', 0)])
+        self.assertEqual(tracker.count(BLANK), 0)
+        self.assertNotIn('Q', tracker.counts())
+        tracker.unsee(tiles("Q"))
+        self.assertEqual(tracker.counts()['Q'], 1)
+
+    def test_see_invalid(self):
+        tracker = TileTracker(tiles("Z"))
+        with self.assertRaises(InvalidTileException):
+            tracker.see(tiles("Z"))
+        with self.assertRaises(InvalidTileException):
+            tracker.see([Tile('*', 1)])
+        with self.assertRaises(InvalidTileException):
+            tracker.unsee(tiles("X"))
+
+    def test_from_game(self):
+        game = Game(seed=5)
+        game.add_player("one")
+        game.add_player("two")
+        game.play_tiles([(7, 7, Tile('A', 1)), (7, 8, Tile('t', 0))])
+        tracker = TileTracker.from_game(game)
+        unseen = game.tile_bag.tiles() + list(game.players[1].rack)
+        self.assertEqual(len(tracker), len(unseen) - 2)
+        self.assertEqual(len(TileTracker.from_game(game, game.players[1])),
+                         len(game.tile_bag) + 7 - 2)
+
+    def test_draw_probability(self):
+        tracker = TileTracker(tiles("AEINRT"))
+        s = tiles("S")[0]
+        total = len(tracker)
+        none = math.comb(total - 4, 3) / math.comb(total, 3)
+        self.assertAlmostEqual(tracker.draw_probability(s, 3), 1 - none)
+        self.assertEqual(tracker.draw_probability(s, 3, 0), 1.0)
+        self.assertEqual(tracker.draw_probability(s, 3, 5), 0.0)
+        # drawing everything that is left
+        self.assertEqual(tracker.draw_probability(s, 200), 1.0)
+
+    def test_holds_probability(self):
+        tracker = TileTracker(tiles("AEINRT"))
+        q = tiles("Q")[0]
+        self.assertAlmostEqual(tracker.holds_probability(q),
+                               7 / len(tracker))
+        tracker.see(tiles("Q"))
+        self.assertEqual(tracker.holds_probability(q), 0.0)
+
+    def test_hypergeometric_tail(self):
+        total = sum(hypergeometric_tail(4, 20, 5, k) -
+                    hypergeometric_tail(4, 20, 5, k + 1) for k in range(5))
+        self.assertAlmostEqual(total, 1.0)
+        with self.assertRaises(ValueError):
+            hypergeometric_tail(4, 3, 2, 1)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import unittest
+
+from scrabb.transposition import TranspositionTable
+
+
+class TranspositionTableTest(unittest.TestCase):
+
+    def test_store_get(self):
+        table = TranspositionTable(16)
+        table.store(12345, "value")
+        self.assertIn(12345, table)
+        self.assertEqual(table.get(12345), "value")
+        self.assertIsNone(table.get(54321))
+        self.assertEqual(table.hits, 1)
+        self.assertEqual(table.misses, 1)
+
+    def test_size_rounded(self):
+        table = TranspositionTable(10)
+        self.assertEqual(table._mask, 15)
+
+    def test_bounded(self):
+        table = TranspositionTable(16)
+        for key in range(1000):
+            table.store(key, key)
+        self.assertLessEqual(len(table), 32)
+
+    def test_min_depth(self):
+        table = TranspositionTable(16)
+        table.store(7, "shallow", depth=2)
+        self.assertEqual(table.get(7, min_depth=2), "shallow")
+        self.assertIsNone(table.get(7, min_depth=3))
+
+    def test_deep_entry_kept(self):
+        table = TranspositionTable(16)
+        table.store(1, "deep", depth=5)
+        # same slot, shallower: goes to the always-replace entry
+        table.store(17, "shallow", depth=1)
+        table.store(33, "newer", depth=1)
+        self.assertEqual(table.get(1), "deep")
+        self.assertEqual(table.get(33), "newer")
+        self.assertIsNone(table.get(17))
+
+    def test_replace_same_key(self):
+        table = TranspositionTable(16)
+        table.store(1, "deep", depth=5)
+        table.store(17, "other", depth=1)
+        table.store(17, "deeper", depth=6)
+        self.assertEqual(table.get(17), "deeper")
+        self.assertIsNone(table.get(1))
+        self.assertEqual(len(table), 1)
+
+    def test_clear(self):
+        table = TranspositionTable(16)
+        table.store(1, "value")
+        table.clear()
+        self.assertEqual(len(table), 0)
+        self.assertIsNone(table.get(1))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+#
+# Scrabble Game Tests
+# Author: Chris Lyon
+# Contact: chris@cplyon.ca
+
+import pickle
+import unittest
+
+from scrabb.board import Board
+from scrabb.scrabb import Game
+from scrabb.tile import Tile
+from scrabb.zobrist import RACK, UNSEEN, tiles_hash
+
+
+class ZobristTest(unittest.TestCase):
+
+    A = Tile('A', 1)
+    B = Tile('B', 3)
+    T = Tile('T', 1)
+
+    def test_board_hash_empty(self):
+        self.assertEqual(Board().hash, 0)
+
+    def test_board_hash_order(self):
+        first = Board()
+        first.place_tiles([(7, 7, self.A), (7, 8, self.T)])
+        first.place_tiles([(8, 7, self.B)])
+        second = Board()
+        second.place_tiles([(8, 7, self.B)])
+        second.place_tiles([(7, 8, self.T), (7, 7, self.A)])
+        self.assertNotEqual(first.hash, 0)
+        self.assertEqual(first.hash, second.hash)
+
+    def test_board_hash_squares_and_tiles(self):
+        first = Board()
+        first.place_tiles([(7, 7, self.A), (7, 8, self.T)])
+        second = Board()
+        second.place_tiles([(7, 7, self.T), (7, 8, self.A)])
+        self.assertNotEqual(first.hash, second.hash)
+
+    def test_board_hash_undo(self):
+        board = Board()
+        board.place_tiles([(7, 7, self.A), (7, 8, self.T)])
+        middle = board.hash
+        board.place_tiles([(8, 7, self.B)])
+        board.undo()
+        self.assertEqual(board.hash, middle)
+        board.undo()
+        self.assertEqual(board.hash, 0)
+
+    def test_board_hash_direct_set(self):
+        board = Board()
+        board[0][0] = self.A
+        board[0][0] = self.B
+        other = Board()
+        other.place_tiles([(0, 0, self.B)])
+        self.assertEqual(board.hash, other.hash)
+
+    def test_board_hash_copy_and_pickle(self):
+        board = Board()
+        board.place_tiles([(7, 7, self.A), (7, 8, self.T)])
+        self.assertEqual(board.copy().hash, board.hash)
+        self.assertEqual(pickle.loads(pickle.dumps(board)).hash, board.hash)
+
+    def test_tiles_hash(self):
+        self.assertEqual(tiles_hash([self.A, self.T, self.A]),
+                         tiles_hash([self.A, self.A, self.T]))
+        self.assertNotEqual(tiles_hash([self.A, self.T]),
+                            tiles_hash([self.A, self.A, self.T]))
+        self.assertNotEqual(tiles_hash([self.A], RACK),
+                            tiles_hash([self.A], UNSEEN))
+        self.assertNotEqual(tiles_hash([self.A], RACK, 0),
+                            tiles_hash([self.A], RACK, 1))
+        self.assertEqual(tiles_hash([]), 0)
+
+    def test_position_hash(self):
+        game = Game(seed=3)
+        game.add_player("one")
+        game.add_player("two")
+        start = game.position_hash()
+        game.pass_turn()
+        self.assertNotEqual(game.position_hash(), start)
+        game.undo()
+        self.assertEqual(game.position_hash(), start)
+        rack = game.current_player.rack
+        game.play([(Board.MIDDLE[0], Board.MIDDLE[1], rack[0]),
+                   (Board.MIDDLE[0], Board.MIDDLE[1]+1, rack[1])])
+        self.assertNotEqual(game.position_hash(), start)
+        game.undo()
+        self.assertEqual(game.position_hash(), start)
+
+    def test_unseen_hash(self):
+        game = Game(seed=3)
+        one = game.add_player("one")
+        two = game.add_player("two")
+        self.assertEqual(game.unseen_hash(one),
+                         tiles_hash(game.tile_bag.tiles() + list(two.rack),
+                                    UNSEEN))
+        self.assertNotEqual(game.unseen_hash(one), game.unseen_hash(two))